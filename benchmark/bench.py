@@ -0,0 +1,770 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+"""
+Benchmarks of the message handling hot path.
+For each case, the number of operations per second, the p50/p99 latency and the memory allocations are reported.
+Results can be saved as JSON and compared with the ones of a previous run, to find regressions between versions.
+
+Usage:
+    python -m benchmark.bench --output results.json
+    python -m benchmark.bench --compare results.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List
+
+import pyrogram
+from pyrogram import filters
+
+from benchmark.simulation import Simulation, SimulationConst
+from telegram_night_vacation_bot._version import __version__
+from telegram_night_vacation_bot.bot_config import BotConfig
+from telegram_night_vacation_bot.telegram_client import TelegramClient
+from telegram_night_vacation_bot.vacation_night import VacationNight, VacationNightConst
+
+
+class BenchmarkConst:
+    """Constants for the benchmarks."""
+
+    # Chat used by the benchmarks
+    CHAT_ID: int = -1000000000000
+    # First ID of the chats not managed by the bot
+    OTHER_CHATS_FIRST_ID: int = 2000000000000
+    # Night time (with the default configuration), so that night topics are closed
+    NIGHT_TIME: datetime = datetime(2026, 12, 22, 23, 0, tzinfo=timezone.utc)
+    # Minimum duration of each case in seconds
+    MIN_DURATION_SEC: float = 1.0
+
+
+class BenchmarkResult:
+    """Result of a benchmark case."""
+
+    name: str
+    ops: int
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+    alloc_bytes_per_op: float
+    peak_alloc_kib: float
+
+    def __init__(
+        self,
+        name: str,
+        latencies_ns: List[int],
+        alloc_bytes_per_op: float,
+        peak_alloc_kib: float
+    ) -> None:
+        """
+        Initialize the result.
+
+        Args:
+            name: The case name.
+            latencies_ns: Latency of each operation in nanoseconds.
+            alloc_bytes_per_op: Memory allocated (and not freed) by each operation, in bytes.
+            peak_alloc_kib: Peak of the memory allocated while running the operations, in KiB.
+        """
+        sorted_latencies = sorted(latencies_ns)
+        self.name = name
+        self.ops = len(sorted_latencies)
+        self.ops_per_sec = self.ops / (sum(sorted_latencies) / 1e9)
+        self.p50_us = sorted_latencies[int(self.ops * 0.50)] / 1e3
+        self.p99_us = sorted_latencies[min(int(self.ops * 0.99), self.ops - 1)] / 1e3
+        self.alloc_bytes_per_op = alloc_bytes_per_op
+        self.peak_alloc_kib = peak_alloc_kib
+
+    def ToDict(self) -> Dict[str, Any]:
+        """
+        Convert the result to a dictionary.
+
+        Returns:
+            The result as dictionary.
+        """
+        return {
+            "ops": self.ops,
+            "ops_per_sec": self.ops_per_sec,
+            "p50_us": self.p50_us,
+            "p99_us": self.p99_us,
+            "alloc_bytes_per_op": self.alloc_bytes_per_op,
+            "peak_alloc_kib": self.peak_alloc_kib,
+        }
+
+
+class BenchmarkRunner:
+    """Runner of the benchmark cases."""
+
+    results: List[BenchmarkResult]
+
+    def __init__(self) -> None:
+        """Initialize the runner."""
+        self.results = []
+
+    async def Run(
+        self,
+        name: str,
+        op: Callable[[int], Awaitable[Any]]
+    ) -> BenchmarkResult:
+        """
+        Run a benchmark case.
+        The operation is run for the minimum duration to measure latencies, then again with memory tracing
+        enabled to measure allocations (tracing slows down the execution, so the two are kept separate).
+
+        Args:
+            name: The case name.
+            op: The operation, it receives the iteration index.
+
+        Returns:
+            The case result.
+        """
+        latencies_ns = []
+        begin_time = time.perf_counter()
+        i = 0
+        while time.perf_counter() - begin_time < BenchmarkConst.MIN_DURATION_SEC:
+            start_ns = time.perf_counter_ns()
+            await op(i)
+            latencies_ns.append(time.perf_counter_ns() - start_ns)
+            i += 1
+
+        alloc_ops = min(len(latencies_ns), 1000)
+        tracemalloc.start()
+        start_bytes, _ = tracemalloc.get_traced_memory()
+        for j in range(alloc_ops):
+            await op(i + j)
+        end_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        result = BenchmarkResult(
+            name,
+            latencies_ns,
+            (end_bytes - start_bytes) / alloc_ops,
+            (peak_bytes - start_bytes) / 1024
+        )
+        self.results.append(result)
+        print(
+            f"{name:<40} {result.ops_per_sec:>14,.0f} ops/s  p50 {result.p50_us:>10.2f}us  p99 {result.p99_us:>10.2f}us  "
+            f"alloc {result.alloc_bytes_per_op:>10.1f}B/op  peak {result.peak_alloc_kib:>10.1f}KiB"
+        )
+        return result
+
+    def ToDict(self) -> Dict[str, Any]:
+        """
+        Convert the results to a dictionary, including information about the environment.
+
+        Returns:
+            The results as dictionary.
+        """
+        return {
+            "version": __version__,
+            "python": platform.python_version(),
+            "date": datetime.now(timezone.utc).isoformat(),
+            "results": {result.name: result.ToDict() for result in self.results},
+        }
+
+    def Compare(
+        self,
+        baseline: Dict[str, Any]
+    ) -> None:
+        """
+        Print the changes with respect to previous results.
+
+        Args:
+            baseline: Previous results, as saved by this runner.
+        """
+        print(f"\nComparison with version {baseline['version']} ({baseline['date']}):")
+        for result in self.results:
+            base_result = baseline["results"].get(result.name)
+            if base_result is None:
+                print(f"{result.name:<40} not present in baseline")
+                continue
+            ops_change = (result.ops_per_sec / base_result["ops_per_sec"] - 1) * 100
+            p99_change = (result.p99_us / base_result["p99_us"] - 1) * 100
+            print(f"{result.name:<40} ops/s {ops_change:>+8.1f}%  p99 {p99_change:>+8.1f}%")
+
+
+class OnMessageBeforePolicy:
+    """
+    Checks done by VacationNight.OnMessage for each message before the compiled policy, used as benchmark baseline:
+    two scheduler lookups, a clock read for each check and a scan of the configuration lists.
+    The clock of the simulation is used in place of the system one, so that the same checks are done at any time.
+    """
+
+    night_vacation: VacationNight
+
+    def __init__(
+        self,
+        night_vacation: VacationNight
+    ) -> None:
+        """
+        Initialize the baseline.
+
+        Args:
+            night_vacation: The vacation/night mode manager.
+        """
+        self.night_vacation = night_vacation
+
+    def OnMessage(
+        self,
+        message: pyrogram.types.Message
+    ) -> bool:
+        """
+        Check if a message shall be deleted.
+
+        Args:
+            message: The message.
+
+        Returns:
+            True if the message shall be deleted, False otherwise.
+        """
+        if not self.__IsRunning():
+            return False
+        if not self.__IsNight() and not self.__IsVacationDay():
+            return False
+        if not self.__IsUserValid(message):
+            return False
+
+        tg_client = self.night_vacation.tg_client
+        if tg_client.GetChatIdFromMessage(message) != BenchmarkConst.CHAT_ID:
+            return False
+        topic_id = tg_client.GetTopicIdFromMessage(message)
+        if self.__IsNight():
+            return topic_id in BotConfig.NIGHT_TOPIC_IDS
+        if self.__IsVacationDay():
+            return topic_id in BotConfig.VACATION_TOPIC_IDS
+        return False
+
+    def __IsRunning(self) -> bool:
+        """
+        Check if the scheduler jobs are running.
+
+        Returns:
+            True if both jobs are running, False otherwise.
+        """
+        scheduler = self.night_vacation.scheduler
+        return (scheduler.get_job(VacationNightConst.TRANSITION_JOB_ID) is not None and
+                scheduler.get_job(VacationNightConst.SAVE_PROCESSED_MSG_IDS_JOB_ID) is not None)
+
+    def __IsUserValid(
+        self,
+        message: pyrogram.types.Message
+    ) -> bool:
+        """
+        Check if the user is subject to night/vacation mode.
+
+        Args:
+            message: The message.
+
+        Returns:
+            True if the user is valid for deletion, False otherwise.
+        """
+        tg_client = self.night_vacation.tg_client
+        if tg_client.IsUserAnonymous(message) or tg_client.IsUserBot(message):
+            return False
+        user = tg_client.GetUserFromMessage(message)
+        return (tg_client.GetUserIdFromUser(user) not in BotConfig.EXCLUDED_USERS and
+                tg_client.GetUsernameFromUser(user) not in BotConfig.EXCLUDED_USERS)
+
+    def __IsNight(self) -> bool:
+        """
+        Check if it's currently night time.
+
+        Returns:
+            True if the current hour is within night hours, False otherwise.
+        """
+        hour = self.night_vacation.clock.Now(timezone.utc).hour
+        return hour >= BotConfig.NIGHT_BEGIN_HOUR or hour < BotConfig.NIGHT_END_HOUR
+
+    def __IsVacationDay(self) -> bool:
+        """
+        Check if today is a vacation day.
+
+        Returns:
+            True if today is a vacation day, False otherwise.
+        """
+        today = self.night_vacation.clock.Now(timezone.utc)
+        if today.weekday() in BotConfig.VACATION_WEEK_DAYS:
+            return True
+        if today.month in BotConfig.VACATION_DATES:
+            return today.day in BotConfig.VACATION_DATES[today.month]
+        return False
+
+
+async def BenchOnMessage(
+    runner: BenchmarkRunner
+) -> None:
+    """
+    Benchmark VacationNight.OnMessage for messages that are deleted and messages that are kept.
+
+    Args:
+        runner: The benchmark runner.
+    """
+    simulation = Simulation(BenchmarkConst.NIGHT_TIME, {"NIGHT_TOPIC_IDS": [0], "EXCLUDED_USERS": []})
+    await simulation.Init()
+    night_vacation = simulation.night_vacation
+
+    deleted_msgs = [
+        Simulation.CreateMessage(i, (BenchmarkConst.CHAT_ID, 0), SimulationConst.FIRST_USER_ID + i, BenchmarkConst.NIGHT_TIME, "Hi")
+        for i in range(1000)
+    ]
+    kept_msgs = [
+        Simulation.CreateMessage(i, (BenchmarkConst.CHAT_ID, 1), SimulationConst.FIRST_USER_ID + i, BenchmarkConst.NIGHT_TIME, "Hi")
+        for i in range(1000)
+    ]
+    other_chat_msgs = [
+        Simulation.CreateMessage(i, (1, 0), SimulationConst.FIRST_USER_ID + i, BenchmarkConst.NIGHT_TIME, "Hi")
+        for i in range(1000)
+    ]
+
+    async def on_deleted_message(i: int) -> None:
+        await night_vacation.OnMessage(deleted_msgs[i % len(deleted_msgs)])
+
+    async def on_kept_message(i: int) -> None:
+        await night_vacation.OnMessage(kept_msgs[i % len(kept_msgs)])
+
+    async def dispatch_other_chat_message(i: int) -> None:
+        await simulation.tg_client.Dispatch(other_chat_msgs[i % len(other_chat_msgs)])
+
+    await runner.Run("on_message_deleted", on_deleted_message)
+    await runner.Run("on_message_kept", on_kept_message)
+    await runner.Run("dispatch_other_chat_message", dispatch_other_chat_message)
+    await night_vacation.deletion_queue.FlushAll()
+
+
+async def BenchOnMessagePolicy(
+    runner: BenchmarkRunner
+) -> None:
+    """
+    Benchmark VacationNight.OnMessage with the compiled policy, compared to the checks done for each message
+    before it (two scheduler lookups, a clock read per check and a scan of the configuration lists).
+
+    Args:
+        runner: The benchmark runner.
+    """
+    excluded_users: List[Any] = list(range(1000)) + [f"user{i}" for i in range(1000)]
+    simulation = Simulation(BenchmarkConst.NIGHT_TIME, {"NIGHT_TOPIC_IDS": [0], "EXCLUDED_USERS": excluded_users})
+    await simulation.Init()
+    night_vacation = simulation.night_vacation
+
+    # Messages in an open topic at night, so that all the checks are done and no message is deleted
+    msgs = [
+        Simulation.CreateMessage(i, (BenchmarkConst.CHAT_ID, 1), SimulationConst.FIRST_USER_ID + i, BenchmarkConst.NIGHT_TIME, "Hi")
+        for i in range(1000)
+    ]
+
+    before_policy = OnMessageBeforePolicy(night_vacation)
+
+    async def on_message_before_policy_op(i: int) -> None:
+        before_policy.OnMessage(msgs[i % len(msgs)])
+
+    async def on_message_policy_op(i: int) -> None:
+        await night_vacation.OnMessage(msgs[i % len(msgs)])
+
+    await runner.Run("on_message_before_policy_2k_excluded", on_message_before_policy_op)
+    await runner.Run("on_message_policy_2k_excluded", on_message_policy_op)
+
+
+async def BenchIsUserValid(
+    runner: BenchmarkRunner
+) -> None:
+    """
+    Benchmark the check of excluded users with a large list.
+
+    Args:
+        runner: The benchmark runner.
+    """
+    excluded_users: List[Any] = list(range(5000)) + [f"user{i}" for i in range(5000)]
+    simulation = Simulation(BenchmarkConst.NIGHT_TIME, {"EXCLUDED_USERS": excluded_users})
+    night_vacation = simulation.night_vacation
+    policy = night_vacation.policies[BenchmarkConst.CHAT_ID]
+    is_user_valid = night_vacation._VacationNight__IsUserValid  # type: ignore
+    msgs = [
+        Simulation.CreateMessage(i, (BenchmarkConst.CHAT_ID, 0), 2500 + i, BenchmarkConst.NIGHT_TIME, "Hi")
+        for i in range(5000)
+    ]
+
+    async def is_user_valid_op(i: int) -> None:
+        is_user_valid(msgs[i % len(msgs)], policy)
+
+    await runner.Run("is_user_valid_10k_excluded", is_user_valid_op)
+
+
+async def BenchManySenders(
+    runner: BenchmarkRunner
+) -> None:
+    """
+    Benchmark VacationNight.OnMessage and the authorization check with tens of thousands of distinct senders,
+    whose activity follows a Zipf distribution (few users send most messages), and print the hit rate of the
+    authorization cache.
+
+    Args:
+        runner: The benchmark runner.
+    """
+    senders_num = 50000
+    simulation = Simulation(BenchmarkConst.NIGHT_TIME, {"NIGHT_TOPIC_IDS": [0], "EXCLUDED_USERS": list(range(5000))})
+    await simulation.Init()
+    BotConfig.AUTHORIZED_USERS = list(range(1000)) + [f"user{i}" for i in range(1000, 2000)]
+    commands = simulation.commands
+    night_vacation = simulation.night_vacation
+    is_user_authorized = commands._CommandsNightVacation__IsUserAuthorized  # type: ignore
+    rnd = random.Random(0)
+    user_ids = rnd.choices(
+        range(senders_num),
+        weights=[1 / rank for rank in range(1, senders_num + 1)],
+        k=100000
+    )
+    msgs = [
+        Simulation.CreateMessage(i, (BenchmarkConst.CHAT_ID, 0), user_id, BenchmarkConst.NIGHT_TIME, "Hi")
+        for i, user_id in enumerate(user_ids)
+    ]
+
+    async def on_message_op(i: int) -> None:
+        await night_vacation.OnMessage(msgs[i % len(msgs)])
+
+    async def is_user_authorized_op(i: int) -> None:
+        await is_user_authorized(msgs[i % len(msgs)])
+        # Replies to unauthorized users are recorded by the fake client
+        simulation.tg_client.sent_msgs.clear()
+
+    await runner.Run("on_message_50k_senders", on_message_op)
+    await runner.Run("is_user_authorized_50k_senders", is_user_authorized_op)
+    await night_vacation.deletion_queue.FlushAll()
+    print(f"{'':<40} authorization cache hit rate: {commands.authorized_cache.HitRate() * 100:.1f}%")
+
+
+async def BenchSplitMessageText(
+    runner: BenchmarkRunner
+) -> None:
+    """
+    Benchmark the splitting of long message texts.
+
+    Args:
+        runner: The benchmark runner.
+    """
+    split_message_text = TelegramClient._TelegramClient__SplitMessageText  # type: ignore
+    line = "This is a line of a long message, used to benchmark the message splitting\n"
+    texts = {
+        "split_message_text_64k": line * (64 * 1024 // len(line)),
+        "split_message_text_1m": line * (1024 * 1024 // len(line)),
+        "split_message_text_1m_no_newlines": "x" * (1024 * 1024),
+        "split_message_text_4m_markdown": (
+            "Some **bold** and __italic__ words " + "**" + "long bold text " * 500 + "**\n"
+        ) * (4 * 1024 * 1024 // 7550),
+    }
+    for name, text in texts.items():
+        async def split_op(i: int, text: str = text) -> None:
+            list(split_message_text(text))
+
+        await runner.Run(name, split_op)
+
+
+async def BenchNotify(
+    runner: BenchmarkRunner
+) -> None:
+    """
+    Benchmark the notification fan-out against the fake client.
+
+    Args:
+        runner: The benchmark runner.
+    """
+    topic_ids = list(range(50))
+    simulation = Simulation(BenchmarkConst.NIGHT_TIME, {"NIGHT_TOPIC_IDS": topic_ids})
+    await simulation.Init()
+    night_vacation = simulation.night_vacation
+    policy = night_vacation.policies[BenchmarkConst.CHAT_ID]
+    notify_night = night_vacation._VacationNight__NotifyNight  # type: ignore
+
+    async def notify_op(i: int) -> None:
+        # Move the virtual clock forward, as time would pass between notifications
+        simulation.clock.Advance(timedelta(hours=12).total_seconds())
+        simulation.tg_client.sent_msgs.clear()
+        await notify_night(policy, simulation.clock.Now(timezone.utc))
+
+    await runner.Run("notify_fan_out_50_topics", notify_op)
+
+
+async def BenchVacationCalendar(
+    runner: BenchmarkRunner
+) -> None:
+    """
+    Benchmark the vacation day check and the search of the next vacation boundary, with a calendar of rules.
+
+    Args:
+        runner: The benchmark runner.
+    """
+    rules = [{"begin": "12-24", "end": "01-06"}, {"easter": -2, "days": 4}, {"begin": "2027-01-03", "exclude": True}]
+    rules += [{"begin": f"{month:02d}-{day:02d}"} for month in range(1, 13) for day in (10, 20)]
+    simulation = Simulation(BenchmarkConst.NIGHT_TIME, {"VACATION_RULES": rules})
+    policy = simulation.night_vacation.policies[BenchmarkConst.CHAT_ID]
+    rnd = random.Random(0)
+    dates = [BenchmarkConst.NIGHT_TIME + timedelta(hours=rnd.randrange(2 * 365 * 24)) for _ in range(10000)]
+
+    async def is_vacation_date_op(i: int) -> None:
+        policy.IsVacationDate(dates[i % len(dates)])
+
+    async def next_vacation_boundary_op(i: int) -> None:
+        policy.NextVacationBoundary(dates[i % len(dates)])
+
+    await runner.Run("is_vacation_date_rules", is_vacation_date_op)
+    await runner.Run("next_vacation_boundary_rules", next_vacation_boundary_op)
+
+
+async def BenchTopicNightWindows(
+    runner: BenchmarkRunner
+) -> None:
+    """
+    Benchmark VacationNight.OnMessage and the mode refresh with many topics having their own night windows.
+
+    Args:
+        runner: The benchmark runner.
+    """
+    topic_windows = {
+        topic_id: [{"begin": f"{(18 + topic_id % 6):02d}:{topic_id % 60:02d}", "end": "08:00", "week_days": [topic_id % 7]}]
+        for topic_id in range(500)
+    }
+    simulation = Simulation(BenchmarkConst.NIGHT_TIME, {"TOPIC_NIGHT_WINDOWS": topic_windows, "EXCLUDED_USERS": []})
+    await simulation.Init()
+    night_vacation = simulation.night_vacation
+    policy = night_vacation.policies[BenchmarkConst.CHAT_ID]
+
+    msgs = [
+        Simulation.CreateMessage(i, (BenchmarkConst.CHAT_ID, i % 500), SimulationConst.FIRST_USER_ID + i, BenchmarkConst.NIGHT_TIME, "Hi")
+        for i in range(1000)
+    ]
+
+    async def on_message_op(i: int) -> None:
+        await night_vacation.OnMessage(msgs[i % len(msgs)])
+
+    async def refresh_op(i: int) -> None:
+        policy.Refresh(BenchmarkConst.NIGHT_TIME + timedelta(minutes=i % 10080))
+
+    await runner.Run("on_message_500_topic_windows", on_message_op)
+    await runner.Run("refresh_500_topic_windows", refresh_op)
+    await night_vacation.deletion_queue.FlushAll()
+
+
+async def BenchMessageDate(
+    runner: BenchmarkRunner
+) -> None:
+    """
+    Benchmark VacationNight.OnMessage for a backlog of messages handled after they were sent, and the check of
+    messages replayed over many days (rebuilding the transition timeline when needed).
+
+    Args:
+        runner: The benchmark runner.
+    """
+    topic_windows = {topic_id: [{"begin": "20:00", "end": "08:00", "week_days": [topic_id % 7]}] for topic_id in range(2, 50)}
+    simulation = Simulation(
+        BenchmarkConst.NIGHT_TIME,
+        {"TOPIC_NIGHT_WINDOWS": topic_windows, "VACATION_RULES": [{"easter": 0, "days": 2}], "EXCLUDED_USERS": []}
+    )
+    await simulation.Init()
+    night_vacation = simulation.night_vacation
+    policy = night_vacation.policies[BenchmarkConst.CHAT_ID]
+    rnd = random.Random(0)
+
+    backlog_msgs = [
+        Simulation.CreateMessage(
+            i,
+            (BenchmarkConst.CHAT_ID, i % 50),
+            SimulationConst.FIRST_USER_ID + i,
+            BenchmarkConst.NIGHT_TIME - timedelta(seconds=rnd.randrange(4 * 3600)),
+            "Hi"
+        )
+        for i in range(1000)
+    ]
+    replay_dates = sorted(BenchmarkConst.NIGHT_TIME + timedelta(seconds=rnd.randrange(30 * 86400)) for _ in range(10000))
+
+    async def on_backlog_message_op(i: int) -> None:
+        await night_vacation.OnMessage(backlog_msgs[i % len(backlog_msgs)])
+
+    async def replay_op(i: int) -> None:
+        policy.ShallMessageBeDeleted(i % 50, replay_dates[i % len(replay_dates)])
+
+    await runner.Run("on_message_backlog_4h", on_backlog_message_op)
+    await runner.Run("replay_30_days", replay_op)
+    await night_vacation.deletion_queue.FlushAll()
+
+
+async def BenchMessageFilter(
+    runner: BenchmarkRunner
+) -> None:
+    """
+    Benchmark the per-update overhead of the message filter for a bot in many busy groups, compared to the group
+    filter followed by VacationNight.OnMessage.
+
+    Args:
+        runner: The benchmark runner.
+    """
+    simulation = Simulation(BenchmarkConst.NIGHT_TIME, {"NIGHT_TOPIC_IDS": [0], "EXCLUDED_USERS": []})
+    await simulation.Init()
+    night_vacation = simulation.night_vacation
+    message_filter = night_vacation.message_filter
+    client = simulation.tg_client.client
+
+    other_chats_msgs = [
+        Simulation.CreateMessage(
+            i, (-(BenchmarkConst.OTHER_CHATS_FIRST_ID + i), i % 10), SimulationConst.FIRST_USER_ID + i, BenchmarkConst.NIGHT_TIME, "Hi"
+        )
+        for i in range(1000)
+    ]
+    open_topic_msgs = [
+        Simulation.CreateMessage(i, (BenchmarkConst.CHAT_ID, 1), SimulationConst.FIRST_USER_ID + i, BenchmarkConst.NIGHT_TIME, "Hi")
+        for i in range(1000)
+    ]
+
+    async def group_filter_other_chats_op(i: int) -> None:
+        msg = other_chats_msgs[i % len(other_chats_msgs)]
+        if await filters.group(client, msg):
+            await night_vacation.OnMessage(msg)
+
+    async def message_filter_other_chats_op(i: int) -> None:
+        await message_filter(client, other_chats_msgs[i % len(other_chats_msgs)])
+
+    async def message_filter_open_topic_op(i: int) -> None:
+        await message_filter(client, open_topic_msgs[i % len(open_topic_msgs)])
+
+    await runner.Run("group_filter_on_message_1000_groups", group_filter_other_chats_op)
+    await runner.Run("message_filter_1000_groups", message_filter_other_chats_op)
+    await runner.Run("message_filter_open_topic", message_filter_open_topic_op)
+    await simulation.SendCommand(BenchmarkConst.CHAT_ID, "/nvbot_stop")
+    await runner.Run("message_filter_drop_all", message_filter_open_topic_op)
+
+
+async def BenchCommandRouter(
+    runner: BenchmarkRunner
+) -> None:
+    """
+    Benchmark the per-update filter cost of the command router, compared to one command filter per command
+    evaluated in turn (as with a handler per command), for plain messages and for commands.
+
+    Args:
+        runner: The benchmark runner.
+    """
+    simulation = Simulation(BenchmarkConst.NIGHT_TIME)
+    await simulation.Init()
+    command_router = simulation.commands.command_router
+    command_filters = [filters.command([name]) for name in command_router.commands]
+    client = simulation.tg_client.client
+
+    text_msg = Simulation.CreateMessage(1, (BenchmarkConst.CHAT_ID, 1), SimulationConst.FIRST_USER_ID, BenchmarkConst.NIGHT_TIME, "Hi")
+    command_msg = Simulation.CreateMessage(
+        2, (BenchmarkConst.CHAT_ID, 1), SimulationConst.ADMIN_USER_ID, BenchmarkConst.NIGHT_TIME, "/nvbot_include @user1"
+    )
+
+    def command_filters_op(msg: pyrogram.types.Message) -> Callable[[int], Awaitable[None]]:
+        async def op(i: int) -> None:
+            for command_filter in command_filters:
+                if await command_filter(client, msg):
+                    break
+        return op
+
+    def command_router_op(msg: pyrogram.types.Message) -> Callable[[int], Awaitable[None]]:
+        async def op(i: int) -> None:
+            await command_router(client, msg)
+        return op
+
+    await runner.Run("command_filters_text_message", command_filters_op(text_msg))
+    await runner.Run("command_router_text_message", command_router_op(text_msg))
+    await runner.Run("command_filters_last_command", command_filters_op(command_msg))
+    await runner.Run("command_router_last_command", command_router_op(command_msg))
+
+
+async def BenchCommandLimiter(
+    runner: BenchmarkRunner
+) -> None:
+    """
+    Benchmark the command limiter with many users (evicting the least recently used ones), and the dispatch
+    of commands from a user spamming them and from an unauthorized user.
+
+    Args:
+        runner: The benchmark runner.
+    """
+    simulation = Simulation(BenchmarkConst.NIGHT_TIME)
+    await simulation.Init()
+    command_router = simulation.commands.command_router
+    rnd = random.Random(0)
+    user_ids = [rnd.randrange(50000) for _ in range(10000)]
+
+    spam_msg = Simulation.CreateMessage(
+        1, (BenchmarkConst.CHAT_ID, 1), SimulationConst.ADMIN_USER_ID, BenchmarkConst.NIGHT_TIME, "/nvbot_status"
+    )
+    unauthorized_msg = Simulation.CreateMessage(
+        2, (BenchmarkConst.CHAT_ID, 1), SimulationConst.FIRST_USER_ID, BenchmarkConst.NIGHT_TIME, "/help"
+    )
+
+    async def limiter_op(i: int) -> None:
+        command_router.limiter.Allow((-BenchmarkConst.OTHER_CHATS_FIRST_ID, user_ids[i % len(user_ids)]))
+
+    async def spam_op(i: int) -> None:
+        await simulation.tg_client.Dispatch(spam_msg)
+
+    async def unauthorized_op(i: int) -> None:
+        await simulation.tg_client.Dispatch(unauthorized_msg)
+
+    await runner.Run("command_limiter_50k_users", limiter_op)
+    sent_msgs_num = len(simulation.tg_client.sent_msgs)
+    await runner.Run("dispatch_spammed_command", spam_op)
+    print(f"{'':<40} replies to spammed commands: {len(simulation.tg_client.sent_msgs) - sent_msgs_num}")
+    sent_msgs_num = len(simulation.tg_client.sent_msgs)
+    await runner.Run("dispatch_unauthorized_command", unauthorized_op)
+    print(f"{'':<40} replies to unauthorized commands: {len(simulation.tg_client.sent_msgs) - sent_msgs_num}")
+
+
+async def main() -> None:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description="Benchmark the bot hot path")
+    parser.add_argument("--output", help="save results to the JSON file")
+    parser.add_argument("--compare", help="compare results with the ones in the JSON file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    runner = BenchmarkRunner()
+    await BenchOnMessage(runner)
+    await BenchOnMessagePolicy(runner)
+    await BenchIsUserValid(runner)
+    await BenchManySenders(runner)
+    await BenchSplitMessageText(runner)
+    await BenchNotify(runner)
+    await BenchVacationCalendar(runner)
+    await BenchTopicNightWindows(runner)
+    await BenchMessageDate(runner)
+    await BenchMessageFilter(runner)
+    await BenchCommandRouter(runner)
+    await BenchCommandLimiter(runner)
+
+    if args.output is not None:
+        with open(args.output, "w") as fout:
+            json.dump(runner.ToDict(), fout, indent=2)
+    if args.compare is not None:
+        with open(args.compare) as fin:
+            runner.Compare(json.load(fin))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
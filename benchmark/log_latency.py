@@ -0,0 +1,186 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+Benchmark of the event loop latency while logging a flood of group messages, with synchronous and asynchronous
+(queue-based) logging. A slow disk is simulated by adding a delay to each write of the log file.
+
+Usage:
+    python -m benchmark.log_latency --messages 5000 --disk-latency-ms 1
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import IO, Any, List
+
+from benchmark.simulation import Simulation, SimulationConst
+from telegram_night_vacation_bot.bot_config import BotConfig
+from telegram_night_vacation_bot.bot_type import BotTypes
+from telegram_night_vacation_bot.logger import Logger
+
+
+class LogLatencyConst:
+    """Constants for the log latency benchmark."""
+
+    # Interval between two event loop probes in seconds
+    PROBE_INTERVAL_SEC: float = 0.001
+    # Night time (with the default configuration), so that messages are deleted and logged
+    NIGHT_TIME: datetime = datetime(2026, 12, 22, 23, 0, tzinfo=timezone.utc)
+
+
+class SlowStream:
+    """File stream wrapper that delays each write, like a slow disk."""
+
+    latency_sec: float
+    stream: IO[Any]
+
+    def __init__(
+        self,
+        stream: IO[Any],
+        latency_sec: float
+    ) -> None:
+        """
+        Initialize the stream.
+
+        Args:
+            stream: The wrapped stream.
+            latency_sec: Delay of each write in seconds.
+        """
+        self.latency_sec = latency_sec
+        self.stream = stream
+
+    def write(  # noqa: N802
+        self,
+        text: str
+    ) -> int:
+        """
+        Write text to the stream after the delay.
+
+        Args:
+            text: The text.
+
+        Returns:
+            Number of written characters.
+        """
+        time.sleep(self.latency_sec)
+        return self.stream.write(text)
+
+    def flush(self) -> None:  # noqa: N802
+        """Flush the stream."""
+        self.stream.flush()
+
+    def close(self) -> None:  # noqa: N802
+        """Close the stream."""
+        self.stream.close()
+
+
+async def ProbeEventLoop(
+    lags: List[float],
+    stop_event: asyncio.Event
+) -> None:
+    """
+    Measure how late the event loop wakes up a task sleeping for a fixed interval.
+
+    Args:
+        lags: List where the lags in seconds are appended.
+        stop_event: Event set when the measurement shall stop.
+    """
+    while not stop_event.is_set():
+        begin_time = time.perf_counter()
+        await asyncio.sleep(LogLatencyConst.PROBE_INTERVAL_SEC)
+        lags.append(time.perf_counter() - begin_time - LogLatencyConst.PROBE_INTERVAL_SEC)
+
+
+async def RunFlood(
+    log_async: bool,
+    messages_num: int,
+    disk_latency_sec: float
+) -> None:
+    """
+    Run a flood of group messages in test mode (so each message is logged) and print the event loop lag.
+
+    Args:
+        log_async: True for asynchronous logging, False for synchronous logging.
+        messages_num: Number of messages.
+        disk_latency_sec: Delay of each write to the log file in seconds.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        BotConfig.LOG_ASYNC = log_async
+        BotConfig.LOG_USE_FILE = True
+        BotConfig.LOG_FILE_NAME = os.path.join(tmp_dir, "log.txt")
+        BotConfig.LOG_FILE_MAX_BYTES = 0
+        BotConfig.LOG_LEVEL = logging.INFO
+        Logger.Init()
+        handler = Logger.handlers[-1]
+        assert isinstance(handler, logging.StreamHandler)
+        handler.setStream(SlowStream(handler.stream, disk_latency_sec))
+
+        simulation = Simulation(
+            LogLatencyConst.NIGHT_TIME, {"NIGHT_TOPIC_IDS": [0], "EXCLUDED_USERS": []}, BotTypes.TEST
+        )
+        await simulation.Init()
+        chat_id = next(iter(BotConfig.CHATS))
+
+        lags: List[float] = []
+        stop_event = asyncio.Event()
+        probe_task = asyncio.ensure_future(ProbeEventLoop(lags, stop_event))
+
+        begin_time = time.perf_counter()
+        for msg_id in range(1, messages_num + 1):
+            await simulation.tg_client.Dispatch(
+                Simulation.CreateMessage(
+                    msg_id, (chat_id, 0), SimulationConst.FIRST_USER_ID, LogLatencyConst.NIGHT_TIME, "Hello"
+                )
+            )
+            # Let other tasks run between updates, like the pyrogram dispatcher
+            await asyncio.sleep(0)
+        elapsed_time = time.perf_counter() - begin_time
+
+        stop_event.set()
+        await probe_task
+        await simulation.night_vacation.deletion_queue.FlushAll()
+        Logger.Stop()
+
+    lags.sort()
+    print(
+        f"{'async' if log_async else 'sync':<6} logging: {messages_num / elapsed_time:>10,.0f} messages/s, "
+        f"loop lag p50 {lags[len(lags) // 2] * 1e3:8.3f}ms  p99 {lags[int(len(lags) * 0.99)] * 1e3:8.3f}ms  "
+        f"max {lags[-1] * 1e3:8.3f}ms  ({len(lags)} probes)"
+    )
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the event loop latency with sync/async logging")
+    parser.add_argument("--messages", type=int, default=5000, help="number of messages of the flood")
+    parser.add_argument("--disk-latency-ms", type=float, default=1.0, help="delay of each log file write in ms")
+    args = parser.parse_args()
+
+    for log_async in (False, True):
+        await RunFlood(log_async, args.messages, args.disk_latency_ms / 1e3)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
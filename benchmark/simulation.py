@@ -0,0 +1,560 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+"""
+Deterministic simulation of the bot.
+Synthetic messages are dispatched to the bot handlers (as pyrogram would do) using a virtual clock and a fake
+Telegram client, so days of traffic can be simulated in seconds without a network connection.
+
+Usage:
+    python -m benchmark.simulation --days 7 --msgs-per-hour 500
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import pyrogram
+from pyrogram.enums import ChatType
+from pyrogram.handlers import MessageHandler
+from pyrogram.handlers.handler import Handler
+
+from telegram_night_vacation_bot.bot_config import BotConfig
+from telegram_night_vacation_bot.bot_type import BotTypes
+from telegram_night_vacation_bot.clock import VirtualClock
+from telegram_night_vacation_bot.commands_night_vacation import CommandsNightVacation
+from telegram_night_vacation_bot.enforcement_mode import EnforcementModes
+from telegram_night_vacation_bot.telegram_client import TelegramClient
+from telegram_night_vacation_bot.utils import Utils
+from telegram_night_vacation_bot.vacation_night import VacationNight, VacationNightConst
+
+
+class SimulationConst:
+    """Constants for the simulation."""
+
+    ADMIN_USER_ID: int = 1
+    BOT_USER_ID: int = 2
+    FIRST_USER_ID: int = 1000
+    FIRST_SENT_MSG_ID: int = 1000000000
+
+
+class FakeTelegramClient(TelegramClient):
+    """Telegram client that records the API calls instead of performing them."""
+
+    chat_permissions: Dict[int, pyrogram.types.ChatPermissions]
+    closed_topic_ids: Dict[int, Set[int]]
+    delete_calls: int
+    deleted_msg_ids: Dict[int, Set[int]]
+    handlers: List[Handler]
+    history: Dict[int, Dict[int, pyrogram.types.Message]]
+    next_msg_id: int
+    sent_msgs: List[pyrogram.types.Message]
+    topic_close_calls: int
+
+    def __init__(self) -> None:
+        """Initialize the fake client."""
+        super().__init__("simulation", "0:A", "0", "0")
+        self.client.me = pyrogram.types.User(id=SimulationConst.BOT_USER_ID, is_bot=True, username="nv_bot")
+        self.chat_permissions = {}
+        self.closed_topic_ids = {}
+        self.delete_calls = 0
+        self.deleted_msg_ids = {}
+        self.handlers = []
+        self.history = {}
+        self.next_msg_id = SimulationConst.FIRST_SENT_MSG_ID
+        self.sent_msgs = []
+        self.topic_close_calls = 0
+
+    def AddHandler(
+        self,
+        handler: Any
+    ) -> None:
+        """
+        Add a message handler.
+
+        Args:
+            handler: The handler to add.
+        """
+        self.handlers.append(handler)
+
+    async def Dispatch(
+        self,
+        message: pyrogram.types.Message
+    ) -> None:
+        """
+        Dispatch a message to the first message handler whose filters match, like the pyrogram dispatcher.
+        The message is also added to the chat history.
+
+        Args:
+            message: The message.
+        """
+        self.history.setdefault(message.chat.id, {})[message.id] = message
+        for handler in self.handlers:
+            if isinstance(handler, MessageHandler) and await handler.check(self.client, message):
+                await handler.callback(self.client, message)
+                break
+
+    async def SendMessage(
+        self,
+        chat_id: int,
+        topic_id: Optional[int],
+        message_text: str,
+    ) -> List[pyrogram.types.Message]:
+        """
+        Record a sent message.
+
+        Args:
+            chat_id: The chat ID.
+            topic_id: The topic ID (optional).
+            message_text: The message text.
+
+        Returns:
+            List of sent message objects.
+        """
+        msg = pyrogram.types.Message(
+            id=self.next_msg_id,
+            chat=pyrogram.types.Chat(id=chat_id, type=ChatType.SUPERGROUP),
+            from_user=self.client.me,
+            message_thread_id=topic_id,
+            text=message_text
+        )
+        self.next_msg_id += 1
+        self.sent_msgs.append(msg)
+        return [msg]
+
+    async def SendReplyMessage(
+        self,
+        original_message: pyrogram.types.Message,
+        message_text: str
+    ) -> List[pyrogram.types.Message]:
+        """
+        Record a sent reply.
+
+        Args:
+            original_message: The message to reply to.
+            message_text: The message text.
+
+        Returns:
+            List of sent message objects.
+        """
+        return await self.SendMessage(original_message.chat.id, None, message_text)
+
+    async def DeleteMessages(
+        self,
+        chat_id: int,
+        message_ids: List[int]
+    ) -> None:
+        """
+        Record deleted messages.
+
+        Args:
+            chat_id: The chat ID.
+            message_ids: List of message IDs.
+        """
+        self.delete_calls += 1
+        self.deleted_msg_ids.setdefault(chat_id, set()).update(message_ids)
+
+    async def GetMessages(
+        self,
+        chat_id: int,
+        message_ids: List[int]
+    ) -> List[pyrogram.types.Message]:
+        """
+        Get messages from the chat history.
+
+        Args:
+            chat_id: The chat ID.
+            message_ids: List of message IDs.
+
+        Returns:
+            List of message objects (empty if not in the history).
+        """
+        history = self.history.get(chat_id, {})
+        return [
+            history.get(msg_id, pyrogram.types.Message(id=msg_id, empty=True))
+            for msg_id in message_ids
+        ]
+
+    async def CloseTopic(
+        self,
+        chat_id: int,
+        topic_id: int
+    ) -> None:
+        """
+        Record a closed topic.
+
+        Args:
+            chat_id: The chat ID.
+            topic_id: The topic ID.
+        """
+        self.topic_close_calls += 1
+        self.closed_topic_ids.setdefault(chat_id, set()).add(topic_id)
+
+    async def ReopenTopic(
+        self,
+        chat_id: int,
+        topic_id: int
+    ) -> None:
+        """
+        Record a reopened topic.
+
+        Args:
+            chat_id: The chat ID.
+            topic_id: The topic ID.
+        """
+        self.topic_close_calls += 1
+        self.closed_topic_ids.setdefault(chat_id, set()).discard(topic_id)
+
+    async def GetChatPermissions(
+        self,
+        chat_id: int
+    ) -> pyrogram.types.ChatPermissions:
+        """
+        Get the recorded chat permissions (all allowed by default).
+
+        Args:
+            chat_id: The chat ID.
+
+        Returns:
+            The chat permissions.
+        """
+        return self.chat_permissions.get(
+            chat_id,
+            pyrogram.types.ChatPermissions(can_send_messages=True, can_send_polls=True, can_invite_users=True)
+        )
+
+    async def SetChatPermissions(
+        self,
+        chat_id: int,
+        permissions: pyrogram.types.ChatPermissions
+    ) -> None:
+        """
+        Record the chat permissions.
+
+        Args:
+            chat_id: The chat ID.
+            permissions: The chat permissions.
+        """
+        self.chat_permissions[chat_id] = permissions
+
+    async def Me(self) -> pyrogram.types.User:
+        """
+        Get the bot's user information.
+
+        Returns:
+            The bot's user object.
+        """
+        return self.client.me
+
+
+class Simulation:
+    """Simulation of the bot with a virtual clock and a fake Telegram client."""
+
+    clock: VirtualClock
+    commands: CommandsNightVacation
+    night_vacation: VacationNight
+    tg_client: FakeTelegramClient
+
+    def __init__(
+        self,
+        start_time: datetime,
+        config: Optional[Dict[str, Any]] = None,
+        bot_type: BotTypes = BotTypes.PRODUCTION
+    ) -> None:
+        """
+        Initialize the simulation.
+
+        Args:
+            start_time: The initial date and time (time zone aware).
+            config: Bot configuration parameters to be overridden.
+            bot_type: The bot type.
+        """
+        BotConfig.STATE_FILE_NAME = ":memory:"
+        BotConfig.AUTHORIZED_USERS = [SimulationConst.ADMIN_USER_ID]
+        for name, value in (config or {}).items():
+            setattr(BotConfig, name, value)
+
+        self.clock = VirtualClock(start_time)
+        self.tg_client = FakeTelegramClient()
+        self.commands = CommandsNightVacation(bot_type, self.tg_client, self.clock)
+        self.night_vacation = self.commands.night_vacation
+
+    async def Init(self) -> None:
+        """Initialize the bot and start it."""
+        await self.commands.Init()
+        # Jobs are run by the simulation according to the virtual clock
+        self.night_vacation.scheduler.pause()
+        await self.SendCommand(next(iter(BotConfig.CHATS)), "/nvbot_start")
+
+    async def SendCommand(
+        self,
+        chat_id: int,
+        command: str
+    ) -> None:
+        """
+        Send a command from an authorized user.
+
+        Args:
+            chat_id: The chat ID.
+            command: The command text.
+        """
+        await self.tg_client.Dispatch(
+            self.CreateMessage(0, (chat_id, 0), SimulationConst.ADMIN_USER_ID, self.clock.Now(timezone.utc), command)
+        )
+
+    async def AdvanceTo(
+        self,
+        now: datetime
+    ) -> None:
+        """
+        Move the virtual clock forward, running the scheduled jobs in between.
+
+        Args:
+            now: The new date and time (time zone aware).
+        """
+        scheduler = self.night_vacation.scheduler
+        while True:
+            job = scheduler.get_job(VacationNightConst.TRANSITION_JOB_ID)
+            if job is None or job.next_run_time > now:
+                break
+            self.clock.SetNow(job.next_run_time)
+            scheduler.remove_job(job.id)
+            await job.func(*job.args)
+        self.clock.SetNow(now)
+
+    async def Feed(
+        self,
+        messages: Iterator[pyrogram.types.Message]
+    ) -> int:
+        """
+        Dispatch messages to the bot, moving the virtual clock to the date of each message.
+
+        Args:
+            messages: The messages, sorted by date.
+
+        Returns:
+            Number of dispatched messages.
+        """
+        count = 0
+        for message in messages:
+            await self.AdvanceTo(message.date)
+            await self.tg_client.Dispatch(message)
+            count += 1
+        await self.night_vacation.deletion_queue.FlushAll()
+        return count
+
+    @staticmethod
+    def CreateMessage(
+        msg_id: int,
+        topic: Tuple[int, int],
+        user_id: int,
+        date: datetime,
+        text: str
+    ) -> pyrogram.types.Message:
+        """
+        Create a group message.
+
+        Args:
+            msg_id: The message ID.
+            topic: The (chat ID, topic ID) the message is sent to.
+            user_id: The user ID.
+            date: The message date.
+            text: The message text.
+
+        Returns:
+            The message.
+        """
+        chat_id, topic_id = topic
+        return pyrogram.types.Message(
+            id=msg_id,
+            chat=pyrogram.types.Chat(id=chat_id, type=ChatType.SUPERGROUP),
+            from_user=pyrogram.types.User(id=user_id, is_bot=False, username=f"user{user_id}"),
+            message_thread_id=topic_id if topic_id != 0 else None,
+            date=date,
+            text=text
+        )
+
+    @classmethod
+    def GenerateMessages(
+        cls,
+        start_time: datetime,
+        duration: timedelta,
+        msgs_per_hour: int,
+        topics: List[Tuple[int, int]],
+        users_num: int,
+        *,
+        seed: int = 0
+    ) -> Iterator[pyrogram.types.Message]:
+        """
+        Generate random messages with uniformly distributed dates.
+
+        Args:
+            start_time: Date of the first message (time zone aware).
+            duration: Time span of the messages.
+            msgs_per_hour: Average number of messages per hour.
+            topics: List of (chat ID, topic ID) the messages are sent to.
+            users_num: Number of distinct senders.
+            seed: Seed of the random generator.
+
+        Returns:
+            Iterator over the messages, sorted by date.
+        """
+        rnd = random.Random(seed)
+        msgs_num = int(duration.total_seconds() / 3600 * msgs_per_hour)
+        offsets = sorted(rnd.uniform(0, duration.total_seconds()) for _ in range(msgs_num))
+        for msg_id, offset in enumerate(offsets, start=1):
+            yield cls.CreateMessage(
+                msg_id,
+                rnd.choice(topics),
+                SimulationConst.FIRST_USER_ID + rnd.randrange(users_num),
+                start_time + timedelta(seconds=offset),
+                "Hello"
+            )
+
+    @staticmethod
+    def IsInNightWindow(
+        date: datetime,
+        window: Dict[str, Any]
+    ) -> bool:
+        """
+        Reference implementation of a topic night window.
+
+        Args:
+            date: The date and time, in the chat time zone.
+            window: The window (see BotConfig.TOPIC_NIGHT_WINDOWS).
+
+        Returns:
+            True if the date is within the window, False otherwise.
+        """
+        minute = date.hour * 60 + date.minute
+        begin_hour, begin_minute = map(int, window["begin"].split(":"))
+        end_hour, end_minute = map(int, window["end"].split(":"))
+        begin, end = begin_hour * 60 + begin_minute, end_hour * 60 + end_minute
+        week_days = window.get("week_days", range(7))
+        if begin <= end:
+            return date.weekday() in week_days and begin <= minute < end
+        return ((date.weekday() in week_days and minute >= begin) or
+                ((date.weekday() - 1) % 7 in week_days and minute < end))
+
+    @staticmethod
+    def ShallBeDeleted(
+        message: pyrogram.types.Message
+    ) -> bool:
+        """
+        Reference implementation of the deletion rules, evaluated directly on the configuration.
+
+        Args:
+            message: The message.
+
+        Returns:
+            True if the message is expected to be deleted, False otherwise.
+        """
+        chat_id = message.chat.id
+        if chat_id not in BotConfig.CHATS:
+            return False
+        params = dict(vars(BotConfig))
+        params.update(BotConfig.CHATS[chat_id])
+
+        user = message.from_user
+        if user is None or user.is_bot:
+            return False
+        if user.id in params["EXCLUDED_USERS"] or user.username in params["EXCLUDED_USERS"]:
+            return False
+
+        date = message.date.astimezone(Utils.TimeZone(params["TIMEZONE"]))
+        minute = date.hour * 60 + date.minute
+        begin = params["NIGHT_BEGIN_HOUR"] * 60 + params["NIGHT_BEGIN_MINUTE"]
+        end = params["NIGHT_END_HOUR"] * 60 + params["NIGHT_END_MINUTE"]
+        is_night = (begin <= minute < end) if begin <= end else (minute >= begin or minute < end)
+        is_vacation = (date.weekday() in params["VACATION_WEEK_DAYS"] or
+                       date.day in params["VACATION_DATES"].get(date.month, []))
+        topic_windows = params["TOPIC_NIGHT_WINDOWS"]
+        night_topic_ids = {
+            topic_id for topic_id in params["NIGHT_TOPIC_IDS"] if is_night and topic_id not in topic_windows
+        } | {
+            topic_id
+            for topic_id, windows in topic_windows.items()
+            if any(Simulation.IsInNightWindow(date, window) for window in windows)
+        }
+
+        topic_id = message.message_thread_id or 0
+        if len(night_topic_ids) > 0:
+            return topic_id in night_topic_ids
+        if is_vacation:
+            return topic_id in params["VACATION_TOPIC_IDS"]
+        return False
+
+
+async def main() -> None:
+    """Simulate the configured days of traffic and check the deleted messages."""
+    parser = argparse.ArgumentParser(description="Simulate the bot with synthetic traffic")
+    parser.add_argument("--days", type=int, default=7, help="simulated days")
+    parser.add_argument("--msgs-per-hour", type=int, default=500, help="average messages per hour")
+    parser.add_argument("--users", type=int, default=1000, help="number of distinct senders")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random generator")
+    parser.add_argument(
+        "--enforcement-mode",
+        choices=[mode.value for mode in EnforcementModes],
+        default=EnforcementModes.DELETE.value,
+        help="how closed topics are enforced"
+    )
+    parser.add_argument("--verbose", action="store_true", help="show the bot logs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    start_time = datetime(2026, 12, 21, tzinfo=timezone.utc)
+    duration = timedelta(days=args.days)
+    chat_ids = list(BotConfig.CHATS)
+    topics = [(chat_id, topic_id) for chat_id in chat_ids for topic_id in range(3)]
+
+    simulation = Simulation(start_time, {"ENFORCEMENT_MODE": args.enforcement_mode})
+    await simulation.Init()
+
+    messages = list(Simulation.GenerateMessages(start_time, duration, args.msgs_per_hour, topics, args.users, seed=args.seed))
+    begin_time = time.perf_counter()
+    await simulation.Feed(iter(messages))
+    await simulation.AdvanceTo(start_time + duration)
+    elapsed_time = time.perf_counter() - begin_time
+
+    tg_client = simulation.tg_client
+    expected = {(msg.chat.id, msg.id) for msg in messages if Simulation.ShallBeDeleted(msg)}
+    deleted = {
+        (chat_id, msg_id)
+        for chat_id, msg_ids in tg_client.deleted_msg_ids.items()
+        for msg_id in msg_ids
+        if msg_id < SimulationConst.FIRST_SENT_MSG_ID
+    }
+
+    print(f"Simulated days: {args.days} ({elapsed_time:.2f}s, {args.days * 86400 / elapsed_time:,.0f}x real time)")
+    print(f"Messages: {len(messages)} ({len(messages) / elapsed_time:,.0f} messages/s)")
+    print(f"Deleted messages: {len(deleted)} (expected: {len(expected)}, delete calls: {tg_client.delete_calls})")
+    print(f"Notifications sent: {len(tg_client.sent_msgs) - 1}")
+    print(f"Topic close/reopen calls: {tg_client.topic_close_calls}, restricted chats: {len(tg_client.chat_permissions)}")
+    print(f"Missed deletions: {len(expected - deleted)}, unexpected deletions: {len(deleted - expected)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -23,7 +23,9 @@ import logging
 from telegram_night_vacation_bot.bot_config import BotConfig
 from telegram_night_vacation_bot.bot_type import BotTypes
 from telegram_night_vacation_bot.commands_night_vacation import CommandsNightVacation
+from telegram_night_vacation_bot.config_file import ConfigFile, ConfigWatcher
 from telegram_night_vacation_bot.logger import Logger
+from telegram_night_vacation_bot.metrics import BotMetrics, MetricsServer
 from telegram_night_vacation_bot.telegram_client import TelegramClient
 
 
@@ -31,6 +33,9 @@ class Bot:
     """Main bot class that manages the Telegram bot and its commands."""
 
     commands_nv: CommandsNightVacation
+    config_file: ConfigFile
+    config_watcher: ConfigWatcher
+    metrics_server: MetricsServer
     tg_client: TelegramClient
 
     def __init__(
@@ -42,7 +47,14 @@ class Bot:
 
         Args:
             bot_type: The type of bot (TEST or NORMAL).
+
+        Raises:
+            ConfigFileError: If the configuration file is not valid.
         """
+        self.config_file = ConfigFile(BotConfig.CONFIG_FILE_NAME)
+        if self.config_file.Exists():
+            ConfigFile.Apply(self.config_file.Load())
+
         tg_client = TelegramClient(
             BotConfig.SESSION_NAME,
             BotConfig.BOT_TOKEN,
@@ -51,38 +63,58 @@ class Bot:
         )
         Logger.Init()
 
-        self.commands_nv = CommandsNightVacation(bot_type, tg_client)
+        self.commands_nv = CommandsNightVacation(bot_type, tg_client, config_file=self.config_file)
+        self.config_watcher = ConfigWatcher(
+            self.config_file,
+            BotConfig.CONFIG_RELOAD_PERIOD_SEC,
+            self.commands_nv.ReloadConfig
+        )
+        self.metrics_server = MetricsServer(BotConfig.METRICS_HOST, BotConfig.METRICS_PORT, BotMetrics.REGISTRY)
         self.tg_client = tg_client
-        self.__LogConfig(bot_type)
+        self.__LogConfig(bot_type, self.config_file)
 
     async def Run(self) -> None:
         """Start running the bot."""
         logging.info("Bot running")
-        await self.tg_client.Run()
+        await self.tg_client.Run(self.commands_nv.Shutdown)
 
     async def Init(self) -> None:
-        """Initialize bot commands."""
+        """Initialize bot commands, metrics endpoint and configuration file watcher."""
         await self.commands_nv.Init()
+        self.config_watcher.Start()
+        if BotConfig.METRICS_ENABLED:
+            await self.metrics_server.Start()
 
     @staticmethod
     def __LogConfig(
-        bot_type: BotTypes
+        bot_type: BotTypes,
+        config_file: ConfigFile
     ) -> None:
         """
         Log the bot configuration.
 
         Args:
             bot_type: The type of bot being configured.
+            config_file: The configuration file.
         """
         logging.info("***** CONFIGURATION *****")
         logging.info(f"Bot type: {bot_type.name}")
+        logging.info(f"Config file: {config_file.file_name} ({'loaded' if config_file.Exists() else 'not found'})")
         logging.info(f"Bot token: {BotConfig.BOT_TOKEN}")
         logging.info(f"Session name: {BotConfig.SESSION_NAME}")
-        logging.info(f"Night begin hour: {BotConfig.NIGHT_BEGIN_HOUR}")
-        logging.info(f"Night end hour: {BotConfig.NIGHT_END_HOUR}")
+        logging.info(f"State file name: {BotConfig.STATE_FILE_NAME}")
+        logging.info(f"Log asynchronous: {BotConfig.LOG_ASYNC}")
+        logging.info(f"Log message sample rate: {BotConfig.LOG_MSG_SAMPLE_RATE}")
+        logging.info(f"Metrics enabled: {BotConfig.METRICS_ENABLED}")
+        if BotConfig.METRICS_ENABLED:
+            logging.info(f"Metrics endpoint: {BotConfig.METRICS_HOST}:{BotConfig.METRICS_PORT}")
+        logging.info(f"Time zone: {BotConfig.TIMEZONE}")
+        logging.info(f"Night begin: {BotConfig.NIGHT_BEGIN_HOUR:02d}:{BotConfig.NIGHT_BEGIN_MINUTE:02d}")
+        logging.info(f"Night end: {BotConfig.NIGHT_END_HOUR:02d}:{BotConfig.NIGHT_END_MINUTE:02d}")
         logging.info(f"Vacation week days: {BotConfig.VACATION_WEEK_DAYS}")
         logging.info(f"Vacation dates: {BotConfig.VACATION_DATES}")
         logging.info(f"Night topic IDs: {BotConfig.NIGHT_TOPIC_IDS}")
         logging.info(f"Vacation topic IDs: {BotConfig.VACATION_TOPIC_IDS}")
+        logging.info(f"Chats: {BotConfig.CHATS}")
         logging.info(f"Authorized users: {BotConfig.AUTHORIZED_USERS}")
         logging.info(f"Excluded users: {BotConfig.EXCLUDED_USERS}")
@@ -19,7 +19,7 @@
 # THE SOFTWARE.
 
 import logging
-from typing import Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 
 
 class BotConfig:
@@ -32,6 +32,15 @@ class BotConfig:
     BOT_TOKEN: str = "0000000000:AAAAAAAAAAAA-0000000000000000000000"
     # Name of session file
     SESSION_NAME: str = "data/session/tg_bot_nv_session"
+    # Name of the JSON file whose parameters override the ones of this class (ignored if not existent)
+    # The file is reloaded when modified, see README for the parameters that are applied without restarting
+    CONFIG_FILE_NAME: str = "data/config/tg_bot_nv_config.json"
+    # How often the configuration file is checked for modifications, in seconds
+    CONFIG_RELOAD_PERIOD_SEC: float = 5.0
+    # Name of the file used to store the bot state (e.g. notification messages to be deleted after a restart)
+    STATE_FILE_NAME: str = "data/state/tg_bot_nv_state.db"
+    # Directory where the expanded events of iCalendar files (see VACATION_RULES) are cached
+    ICS_CACHE_DIR: str = "data/cache"
 
     # Log level
     LOG_LEVEL: int = logging.INFO
@@ -40,11 +49,34 @@ class BotConfig:
     LOG_USE_FILE: bool = False
     # Only used if LOG_USE_FILE is True
     LOG_FILE_NAME: str = "data/logs/tg_bot_nv_log.txt"
+    # Log file is rotated when it reaches the specified size in bytes (0 to disable)
+    LOG_FILE_MAX_BYTES: int = 0
+    # If not None, the log file is rotated at the specified interval instead (e.g. "midnight", same of TimedRotatingFileHandler)
+    LOG_FILE_ROTATE_WHEN: Optional[str] = None
+    # Number of rotated log files kept
+    LOG_FILE_BACKUP_COUNT: int = 5
+    # If True, logs are written by a background thread, so that the bot is not slowed down by slow consoles/disks
+    LOG_ASYNC: bool = True
+    # Only one message every LOG_MSG_SAMPLE_RATE is logged in test mode (1 to log all messages)
+    LOG_MSG_SAMPLE_RATE: int = 1
 
+    # If True, metrics are exposed in Prometheus text format at http://METRICS_HOST:METRICS_PORT/metrics
+    METRICS_ENABLED: bool = False
+    # Only used if METRICS_ENABLED is True
+    METRICS_HOST: str = "127.0.0.1"
+    METRICS_PORT: int = 9464
+
+    # IANA time zone used to evaluate night hours and vacation days (e.g. "Europe/Rome")
+    # If None, the system time zone is used
+    TIMEZONE: Optional[str] = None
     # Night begin hour (e.g. 22 -> 22:00)
     NIGHT_BEGIN_HOUR: int = 22
+    # Night begin minute (e.g. 30 -> 22:30, if NIGHT_BEGIN_HOUR is 22)
+    NIGHT_BEGIN_MINUTE: int = 0
     # Night end hour (e.g. 8 -> 8:00)
     NIGHT_END_HOUR: int = 8
+    # Night end minute (e.g. 30 -> 8:30, if NIGHT_END_HOUR is 8)
+    NIGHT_END_MINUTE: int = 0
     # List of days of the week considered "vacation" (0: Monday, 1: Tuesday, 2: Wednesday, ..., 6: Sunday)
     # For example:
     #   Vacation days = [1, 6] -> The topics will be closed every Monday and Sunday
@@ -67,15 +99,68 @@ class BotConfig:
         12: [8, 25, 26],
     }
 
-    # ID of the group
-    # Use test mode to get the topic IDs (every message is logged)
-    CHAT_ID: int = -1000000000000
+    #
+    # Vacation rules, for ranges, one-off dates, movable holidays, exceptions and iCalendar files
+    # Format:
+    #   {"begin": "[YYYY-]MM-DD", "end": "[YYYY-]MM-DD"}    -> Range of days (one-off if the year is specified)
+    #   {"easter": offset, "days": days_num}                -> Days relative to Easter Sunday
+    #   {"ics": "file_name.ics"}                            -> Events of an iCalendar file
+    # Add "exclude": True to a rule to remove its days (e.g. a Sunday that is not a vacation day)
+    #
+    # For example:
+    #   {"begin": "12-24", "end": "01-06"}                  -> From December 24th to January 6th, every year
+    #   {"easter": 1}                                       -> Easter Monday
+    #   {"begin": "2026-12-20", "exclude": True}            -> December 20th 2026 is not a vacation day
+    #
+    VACATION_RULES: List[Dict[str, Any]] = []
+
     # List of topics that are closed during the night
     # Use test mode to get the topic IDs (every message is logged)
     NIGHT_TOPIC_IDS: List[int] = [0, 1]
+
+    #
+    # Topics with their own night windows, instead of the night hours above (they don't need to be in NIGHT_TOPIC_IDS)
+    # Format:
+    #   topic_id: [{"begin": "HH:MM", "end": "HH:MM", "week_days": [day_1, day_2, ...]}, ...]
+    # A window ending before its begin ends on the next day, week_days are the days it begins on (all if not specified)
+    #
+    # For example:
+    #   2: [{"begin": "00:00", "end": "08:00"}]       -> Topic 2 is closed from midnight to 8:00
+    #   3: [{"begin": "20:00", "end": "08:00", "week_days": [0, 1, 2, 3, 4]}] -> Topic 3 is closed from Monday
+    #                                                     to Friday, from 20:00 to 8:00 of the next day
+    #
+    TOPIC_NIGHT_WINDOWS: Dict[int, List[Dict[str, Any]]] = {}
     # List of topics that are closed during vacation
     # Use test mode to get the topic IDs (every message is logged)
     VACATION_TOPIC_IDS: List[int] = [1]
+    #
+    # How closed topics are enforced:
+    #   "delete"        -> Messages sent to closed topics are deleted
+    #   "close_topics"  -> Closed topics are also closed in Telegram, so that only administrators can write in them
+    #   "restrict_chat" -> Members cannot send messages while any topic is closed (for groups without topics)
+    # The bot shall be an administrator with the right to manage topics or to restrict members, messages sent anyway
+    # are always deleted
+    #
+    ENFORCEMENT_MODE: str = "delete"
+
+    #
+    # Groups managed by the bot
+    # Format:
+    #   chat_id: {parameter_name: value, ...}
+    #
+    # Each group can override the following parameters, otherwise the global ones are used:
+    #   TIMEZONE, NIGHT_BEGIN_HOUR, NIGHT_BEGIN_MINUTE, NIGHT_END_HOUR, NIGHT_END_MINUTE,
+    #   VACATION_WEEK_DAYS, VACATION_DATES, VACATION_RULES, NIGHT_TOPIC_IDS, TOPIC_NIGHT_WINDOWS, VACATION_TOPIC_IDS,
+    #   ENFORCEMENT_MODE, EXCLUDED_USERS
+    #
+    # For example:
+    #   -1000000000000: {}                              -> Group using the global parameters
+    #   -1000000000001: {"NIGHT_BEGIN_HOUR": 23}        -> Group whose night begins at 23:00
+    #
+    # Use test mode to get the chat IDs (every message is logged)
+    CHATS: Dict[int, Dict[str, Any]] = {
+        -1000000000000: {},
+    }
 
     # List of users that are authorized to use the bot
     # The list can contain both user IDs and usernames (without the '@')
@@ -37,6 +37,11 @@ Commands for **night/vacation** control:
 **/nvbot_vacation_status**: __show if vacation mode is active or not__
 **/nvbot_test_night**: __test the night mode notification in topics__
 **/nvbot_test_vacation**: __test the vacation mode notification in topics__
+**/nvbot_set_night** __begin end__: __set the night hours of the group (e.g. 22 8, or 22:30 7:45)__
+**/nvbot_add_vacation** __date__: __add a vacation date to the group, every year (e.g. 12-24) or only once (e.g. 2026-12-24)__
+**/nvbot_remove_vacation** __date__: __remove a vacation date from the group__
+**/nvbot_exclude** __user__: __exclude a user (@username or ID) from night/vacation mode in the group__
+**/nvbot_include** __user__: __remove a user (@username or ID) from the excluded ones in the group__
 **/nvbot_version**: __show the bot version__"""
 
     VERSION: str = """🤖 Hello! 🤖
@@ -51,10 +56,28 @@ Bot version: __{version}__"""
     BOT_STATUS_RUNNING: str = "🟢 Bot running"
     BOT_STATUS_STOPPED: str = "🔴 Bot stopped"
 
+    CHAT_NOT_MANAGED: str = "❌ This group is not managed by the bot"
+    CONFIG_NOT_SAVED: str = "⚠️ Configuration applied but not saved, it will be lost after restarting the bot"
+    SET_NIGHT_USAGE: str = "❌ Usage: /nvbot_set_night __begin end__ (e.g. 22 8, or 22:30 7:45)"
+    NIGHT_SET: str = "✅ Night set from __{begin}__ to __{end}__"
+    NIGHT_SET_TOPIC_WINDOWS_KEPT: str = "⚠️ Topics with their own night windows are not changed: __{topic_ids}__"
+    VACATION_DATE_USAGE: str = "❌ Usage: /{command} __date__ (e.g. 2026-12-24 or 12-24)"
+    VACATION_DATE_ADDED: str = "✅ Vacation date __{date}__ added (every year)"
+    VACATION_ONE_OFF_DATE_ADDED: str = "✅ Vacation date __{date}__ added (only once)"
+    VACATION_DATE_ALREADY_PRESENT: str = "❌ Vacation date __{date}__ already present"
+    VACATION_DATE_REMOVED: str = "✅ Vacation date __{date}__ removed"
+    VACATION_DATE_NOT_PRESENT: str = "❌ Vacation date __{date}__ not present"
+    USER_USAGE: str = "❌ Usage: /{command} __user__ (e.g. @username or 123456789)"
+    USER_EXCLUDED: str = "✅ User __{user}__ excluded"
+    USER_ALREADY_EXCLUDED: str = "❌ User __{user}__ already excluded"
+    USER_INCLUDED: str = "✅ User __{user}__ no more excluded"
+    USER_NOT_EXCLUDED: str = "❌ User __{user}__ not excluded"
+
     NIGHT_MODE_ACTIVE: str = "🟢 Night mode active"
     NIGHT_MODE_NOT_ACTIVE: str = "🔴 Night mode inactive"
     VACATION_MODE_ACTIVE: str = "🟢 Vacation mode active"
     VACATION_MODE_NOT_ACTIVE: str = "🔴 Vacation mode inactive"
+    CHAT_STATUS: str = "Chat __{chat_id}__: {status}"
 
     NIGHT_BEGIN: str = """🌒 **NIGHT MODE**
 
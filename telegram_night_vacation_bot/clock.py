@@ -0,0 +1,209 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import asyncio
+import time
+from datetime import datetime, timedelta, tzinfo
+from typing import Optional
+
+from telegram_night_vacation_bot.utils import Utils
+
+
+class Clock:
+    """Clock returning the system time."""
+
+    def Now(
+        self,
+        tz: Optional[tzinfo] = None
+    ) -> datetime:
+        """
+        Get the current date and time.
+
+        Args:
+            tz: The time zone (if None, the local time is returned as a naive datetime).
+
+        Returns:
+            datetime: The current datetime object.
+        """
+        return Utils.Today(tz)
+
+    def Time(self) -> float:
+        """
+        Get the current Unix timestamp.
+
+        Returns:
+            float: The current time in seconds since the epoch.
+        """
+        return Utils.CurrentTime()
+
+    def Monotonic(self) -> float:
+        """
+        Get the value of a monotonic clock, to measure elapsed time.
+
+        Returns:
+            float: The clock value in seconds.
+        """
+        return time.monotonic()
+
+    async def Sleep(
+        self,
+        seconds: float
+    ) -> None:
+        """
+        Sleep for the specified time.
+
+        Args:
+            seconds: Number of seconds.
+        """
+        await asyncio.sleep(seconds)
+
+    async def WaitEvent(
+        self,
+        event: asyncio.Event,
+        timeout: float
+    ) -> bool:
+        """
+        Wait for an event to be set, for the specified maximum time.
+
+        Args:
+            event: The event.
+            timeout: Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the event was set, False if the time expired.
+        """
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+class VirtualClock(Clock):
+    """Clock whose time only changes when it's explicitly moved (e.g. for simulations)."""
+
+    now: datetime
+
+    def __init__(
+        self,
+        now: datetime
+    ) -> None:
+        """
+        Initialize the clock.
+
+        Args:
+            now: The initial date and time (time zone aware).
+        """
+        self.now = now
+
+    def Now(
+        self,
+        tz: Optional[tzinfo] = None
+    ) -> datetime:
+        """
+        Get the current date and time.
+
+        Args:
+            tz: The time zone (if None, the local time is returned as a naive datetime).
+
+        Returns:
+            datetime: The current datetime object.
+        """
+        if tz is None:
+            return self.now.astimezone().replace(tzinfo=None)
+        return self.now.astimezone(tz)
+
+    def Time(self) -> float:
+        """
+        Get the current Unix timestamp.
+
+        Returns:
+            float: The current time in seconds since the epoch.
+        """
+        return self.now.timestamp()
+
+    def Monotonic(self) -> float:
+        """
+        Get the value of a monotonic clock, to measure elapsed time.
+
+        Returns:
+            float: The clock value in seconds.
+        """
+        return self.Time()
+
+    async def Sleep(
+        self,
+        seconds: float
+    ) -> None:
+        """
+        Sleep for the specified time, i.e. move the clock forward and let the other tasks run.
+
+        Args:
+            seconds: Number of seconds.
+        """
+        self.Advance(seconds)
+        await asyncio.sleep(0)
+
+    async def WaitEvent(
+        self,
+        event: asyncio.Event,
+        timeout: float
+    ) -> bool:
+        """
+        Wait for an event to be set, i.e. let the other tasks run and, if the event is still not set,
+        move the clock forward by the maximum time.
+
+        Args:
+            event: The event.
+            timeout: Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the event was set, False if the time expired.
+        """
+        await asyncio.sleep(0)
+        if event.is_set():
+            return True
+        self.Advance(timeout)
+        return False
+
+    def Advance(
+        self,
+        seconds: float
+    ) -> None:
+        """
+        Move the clock forward.
+
+        Args:
+            seconds: Number of seconds.
+        """
+        self.now += timedelta(seconds=seconds)
+
+    def SetNow(
+        self,
+        now: datetime
+    ) -> None:
+        """
+        Set the current date and time.
+
+        Args:
+            now: The date and time (time zone aware).
+        """
+        self.now = now
@@ -0,0 +1,211 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+
+import logging
+import re
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import pyrogram
+from pyrogram.filters import Filter
+from pyrogram.handlers import MessageHandler
+
+from telegram_night_vacation_bot.metrics import BotMetrics, Histogram
+from telegram_night_vacation_bot.sliding_window_limiter import SlidingWindowLimiter
+from telegram_night_vacation_bot.telegram_client import TelegramClient
+
+
+# Command function, called with the command message
+CommandFct = Callable[[pyrogram.types.Message], Awaitable[None]]
+# Authorization function, called with the command message before the command function
+AuthorizeFct = Callable[[pyrogram.types.Message], Awaitable[bool]]
+
+
+class CommandRouterConst:
+    """Constants for the command router."""
+
+    PREFIX: str = "/"
+    # Same argument parsing of pyrogram command filters (quoted or whitespace-separated arguments)
+    ARGS_REGEX: re.Pattern = re.compile(r"([\"'])(.*?)(?<!\\)\1|(\S+)")
+    ESCAPED_QUOTE_REGEX: re.Pattern = re.compile(r"\\([\"'])")
+
+
+class Command:
+    """Command registered in the router."""
+
+    fct: CommandFct
+    latency: Histogram
+    name: str
+    private_only: bool
+
+    def __init__(
+        self,
+        name: str,
+        fct: CommandFct,
+        private_only: bool
+    ) -> None:
+        """
+        Initialize the command.
+
+        Args:
+            name: The command name.
+            fct: The command function.
+            private_only: True if the command is only accepted in private chats.
+        """
+        self.fct = fct
+        self.latency = BotMetrics.COMMAND_DURATION.Labels(name)
+        self.name = name
+        self.private_only = private_only
+
+
+class CommandRouter(Filter):
+    """
+    Router of the bot commands, registered as a single handler instead of one handler per command.
+    It's also the handler filter: the command is parsed once per update (non-command messages are rejected
+    by checking the first character), stored in message.command like pyrogram command filters, and dispatched
+    through a dictionary after the shared rate limiting and authorization.
+    """
+
+    authorize_fct: AuthorizeFct
+    commands: Dict[str, Command]
+    limiter: SlidingWindowLimiter[Tuple[int, int]]
+
+    def __init__(
+        self,
+        authorize_fct: AuthorizeFct,
+        limiter: SlidingWindowLimiter[Tuple[int, int]]
+    ) -> None:
+        """
+        Initialize the router.
+
+        Args:
+            authorize_fct: Function checking if the user is authorized to use the commands.
+            limiter: Limiter of the commands of each user in each chat (commands over the limit are dropped).
+        """
+        self.authorize_fct = authorize_fct
+        self.commands = {}
+        self.limiter = limiter
+
+    def Register(
+        self,
+        name: str,
+        fct: CommandFct,
+        *,
+        private_only: bool = False
+    ) -> None:
+        """
+        Register a command.
+
+        Args:
+            name: The command name (without prefix, case insensitive).
+            fct: The command function.
+            private_only: True if the command is only accepted in private chats.
+
+        Raises:
+            ValueError: If the command is already registered.
+        """
+        name = name.lower()
+        if name in self.commands:
+            raise ValueError(f"Command {name} already registered")
+        self.commands[name] = Command(name, fct, private_only)
+
+    def Handler(
+        self,
+        pre_filter: Optional[Filter] = None
+    ) -> MessageHandler:
+        """
+        Get the handler to be added to the client.
+
+        Args:
+            pre_filter: Filter checked before the router one for each message (e.g. to track messages).
+
+        Returns:
+            The message handler.
+        """
+        return MessageHandler(self.__Dispatch, self if pre_filter is None else pre_filter & self)
+
+    async def __call__(
+        self,
+        client: pyrogram.Client,
+        message: pyrogram.types.Message
+    ) -> bool:
+        """
+        Check if a message is a registered command, parsing its arguments if so.
+
+        Args:
+            client: The Pyrogram client instance.
+            message: The message.
+
+        Returns:
+            True if the message is a registered command, False otherwise.
+        """
+        text = message.text or message.caption
+        if not text or not text.startswith(CommandRouterConst.PREFIX):
+            return False
+
+        parts = text[len(CommandRouterConst.PREFIX):].split(maxsplit=1)
+        if len(parts) == 0:
+            return False
+        name, _, username = parts[0].partition("@")
+        command = self.commands.get(name.lower())
+        if command is None:
+            return False
+        # Commands addressed to other bots
+        if username and username.lower() != ((client.me and client.me.username) or "").lower():
+            return False
+        if command.private_only and not TelegramClient.IsPrivateChat(message):
+            return False
+
+        message.command = [command.name] + [
+            CommandRouterConst.ESCAPED_QUOTE_REGEX.sub(r"\1", match.group(2) or match.group(3) or "")
+            for match in CommandRouterConst.ARGS_REGEX.finditer(parts[1] if len(parts) > 1 else "")
+        ]
+        return True
+
+    async def __Dispatch(
+        self,
+        client: pyrogram.Client,
+        message: pyrogram.types.Message
+    ) -> None:
+        """
+        Dispatch a command to its function, if the user is within the rate limit and authorized.
+
+        Args:
+            client: The Pyrogram client instance.
+            message: The command message.
+        """
+        command = self.commands[message.command[0]]
+        chat_id = TelegramClient.GetChatIdFromMessage(message)
+        user_id = TelegramClient.GetUserIdFromMessage(message)
+        if not self.limiter.Allow((chat_id, user_id)):
+            BotMetrics.COMMANDS_DROPPED_RATE_LIMITED.Inc()
+            logging.info("Command %s from user %d dropped (chat ID: %d), rate limited", command.name, user_id, chat_id)
+            return
+        if not await self.authorize_fct(message):
+            return
+
+        logging.info("Command: %s", command.name)
+        start_time = time.perf_counter()
+        try:
+            await command.fct(message)
+        finally:
+            command.latency.Observe(time.perf_counter() - start_time)
@@ -18,31 +18,64 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import asyncio
+import calendar
 import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import pyrogram
-from pyrogram import filters
-from pyrogram.handlers import MessageHandler
+from pyrogram.handlers import DisconnectHandler, MessageHandler
 
 from telegram_night_vacation_bot._version import __version__
 from telegram_night_vacation_bot.bot_config import BotConfig
 from telegram_night_vacation_bot.bot_msg import BotMessages
 from telegram_night_vacation_bot.bot_type import BotTypes
+from telegram_night_vacation_bot.clock import Clock
+from telegram_night_vacation_bot.command_router import CommandRouter
+from telegram_night_vacation_bot.config_file import ConfigFile, ConfigFileError
+from telegram_night_vacation_bot.lru_cache import LruCache
+from telegram_night_vacation_bot.metrics import BotMetrics
+from telegram_night_vacation_bot.sliding_window_limiter import SlidingWindowLimiter
 from telegram_night_vacation_bot.telegram_client import TelegramClient
 from telegram_night_vacation_bot.vacation_night import VacationNight
 
 
+class CommandsNightVacationConst:
+    """Constants for night/vacation bot commands."""
+
+    # Maximum number of users whose authorization is cached
+    AUTHORIZED_CACHE_MAX_SIZE: int = 1000
+    # Maximum number of commands of a user in a chat in the time window (the other ones are dropped)
+    COMMANDS_MAX_NUM: int = 10
+    COMMANDS_WINDOW_SEC: float = 60.0
+    # Time (in seconds) after replying to an unauthorized user, during which the user's commands are dropped
+    UNAUTHORIZED_REPLY_COOLDOWN_SEC: float = 300.0
+    # Maximum number of users tracked by the limiters (idle users are evicted)
+    LIMITER_MAX_USERS: int = 10000
+    # Format of times (e.g. 22 or 22:30) and dates (e.g. 2026-12-24 or 12-24) in command arguments
+    TIME_REGEX: re.Pattern = re.compile(r"^(\d{1,2})(?::(\d{2}))?$")
+    DATE_REGEX: re.Pattern = re.compile(r"^(?:(\d{4})-)?(\d{1,2})-(\d{1,2})$")
+
+
 class CommandsNightVacation:
     """Handler for night/vacation bot commands."""
 
+    authorized_cache: LruCache[Tuple[int, Optional[str]], bool]
     bot_type: BotTypes
+    command_router: CommandRouter
+    config_file: Optional[ConfigFile]
+    received_msgs_num: int
     tg_client: TelegramClient
     night_vacation: VacationNight
+    unauthorized_reply_limiter: SlidingWindowLimiter[Tuple[int, int]]
 
     def __init__(
         self,
         bot_type: BotTypes,
-        tg_client: TelegramClient
+        tg_client: TelegramClient,
+        clock: Optional[Clock] = None,
+        config_file: Optional[ConfigFile] = None
     ) -> None:
         """
         Initialize the commands handler.
@@ -50,222 +83,411 @@ class CommandsNightVacation:
         Args:
             bot_type: The type of bot (TEST or NORMAL).
             tg_client: The Telegram client instance.
+            clock: The clock used to get the current time (if None, the system time is used).
+            config_file: The configuration file where changes made by commands are saved (if None, they are not saved).
         """
+        self.authorized_cache = LruCache("authorized_users", CommandsNightVacationConst.AUTHORIZED_CACHE_MAX_SIZE)
         self.bot_type = bot_type
+        self.config_file = config_file
+        self.received_msgs_num = 0
         self.tg_client = tg_client
-        self.night_vacation = VacationNight(bot_type, tg_client)
+        self.night_vacation = VacationNight(bot_type, tg_client, clock)
+        self.command_router = CommandRouter(
+            self.__IsUserAuthorized,
+            SlidingWindowLimiter(
+                CommandsNightVacationConst.COMMANDS_MAX_NUM,
+                CommandsNightVacationConst.COMMANDS_WINDOW_SEC,
+                CommandsNightVacationConst.LIMITER_MAX_USERS,
+                self.night_vacation.clock
+            )
+        )
+        self.unauthorized_reply_limiter = SlidingWindowLimiter(
+            1,
+            CommandsNightVacationConst.UNAUTHORIZED_REPLY_COOLDOWN_SEC,
+            CommandsNightVacationConst.LIMITER_MAX_USERS,
+            self.night_vacation.clock
+        )
 
     async def Init(self) -> None:
-        """Initialize and register all command handlers."""
+        """Initialize and register all commands and handlers (other commands can be registered to command_router)."""
         await self.night_vacation.Init()
+        self.command_router.Register("start", self.__CommandHelp, private_only=True)
+        self.command_router.Register("help", self.__CommandHelp)
+        self.command_router.Register("alive", self.__CommandAlive)
+        self.command_router.Register("nvbot_start", self.__CommandStart)
+        self.command_router.Register("nvbot_stop", self.__CommandStop)
+        self.command_router.Register("nvbot_status", self.__CommandStatus)
+        self.command_router.Register("nvbot_vacation_status", self.__CommandVacationStatus)
+        self.command_router.Register("nvbot_night_status", self.__CommandNightStatus)
+        self.command_router.Register("nvbot_test_vacation", self.__CommandTestVacation)
+        self.command_router.Register("nvbot_test_night", self.__CommandTestNight)
+        self.command_router.Register("nvbot_version", self.__CommandVersion)
+        self.command_router.Register("nvbot_set_night", self.__CommandSetNight)
+        self.command_router.Register("nvbot_add_vacation", self.__CommandAddVacation)
+        self.command_router.Register("nvbot_remove_vacation", self.__CommandRemoveVacation)
+        self.command_router.Register("nvbot_exclude", self.__CommandExclude)
+        self.command_router.Register("nvbot_include", self.__CommandInclude)
+        # Commands are checked first, the other group messages are handled only if not commands.
+        # All messages are tracked before, so that commands are tracked too.
+        self.tg_client.AddHandler(self.command_router.Handler(self.night_vacation.message_filter.Tracker()))
         self.tg_client.AddHandler(
-            MessageHandler(self.__CommandHelp, filters.command(["start"]) & filters.private)
-        )
-        self.tg_client.AddHandler(
-            MessageHandler(self.__CommandHelp, filters.command(["help"]))
-        )
-        self.tg_client.AddHandler(
-            MessageHandler(self.__CommandAlive, filters.command(["alive"]))
-        )
-        self.tg_client.AddHandler(
-            MessageHandler(self.__CommandStart, filters.command(["nvbot_start"]))
-        )
-        self.tg_client.AddHandler(
-            MessageHandler(self.__CommandStop, filters.command(["nvbot_stop"]))
-        )
-        self.tg_client.AddHandler(
-            MessageHandler(self.__CommandStatus, filters.command(["nvbot_status"]))
+            MessageHandler(self.__OnMessage, self.night_vacation.message_filter)
         )
         self.tg_client.AddHandler(
-            MessageHandler(self.__CommandVacationStatus, filters.command(["nvbot_vacation_status"]))
-        )
-        self.tg_client.AddHandler(
-            MessageHandler(self.__CommandNightStatus, filters.command(["nvbot_night_status"]))
-        )
-        self.tg_client.AddHandler(
-            MessageHandler(self.__CommandTestVacation, filters.command(["nvbot_test_vacation"]))
-        )
-        self.tg_client.AddHandler(
-            MessageHandler(self.__CommandTestNight, filters.command(["nvbot_test_night"]))
-        )
-        self.tg_client.AddHandler(
-            MessageHandler(self.__CommandVersion, filters.command(["nvbot_version"]))
-        )
-        self.tg_client.AddHandler(
-            MessageHandler(self.__OnMessage, filters.group)
+            DisconnectHandler(self.__OnDisconnect)
         )
         logging.info("Commands initialized")
 
+    async def Shutdown(self) -> None:
+        """Complete the pending operations before the bot is stopped."""
+        await self.night_vacation.Shutdown()
+
+    async def ReloadConfig(self) -> None:
+        """Apply the reloaded bot configuration."""
+        self.authorized_cache.Clear()
+        await self.night_vacation.ReloadConfig()
+
     async def __CommandHelp(
         self,
-        client: pyrogram.Client,
         message: pyrogram.types.Message
     ) -> None:
         """
         Handle the help command to show available commands.
 
         Args:
-            client: The Pyrogram client instance.
             message: The message that triggered the command.
         """
-        if not await self.__IsUserAuthorized(message):
-            return
-        logging.info("Command: help")
         await self.tg_client.SendMessageQuick(message, BotMessages.HELP)
 
     async def __CommandAlive(
         self,
-        client: pyrogram.Client,
         message: pyrogram.types.Message
     ) -> None:
         """
         Handle the alive command to check if bot is responsive.
 
         Args:
-            client: The Pyrogram client instance.
             message: The message that triggered the command.
         """
-        if not await self.__IsUserAuthorized(message):
-            return
-        logging.info("Command: alive")
         await self.tg_client.SendReplyMessage(message, BotMessages.ALIVE)
 
     async def __CommandVersion(
         self,
-        client: pyrogram.Client,
         message: pyrogram.types.Message
     ) -> None:
         """
         Handle the version command to show bot version.
 
         Args:
-            client: The Pyrogram client instance.
             message: The message that triggered the command.
         """
-        if not await self.__IsUserAuthorized(message):
-            return
-        logging.info("Command: version")
         await self.tg_client.SendMessageQuick(message, BotMessages.VERSION.format(version=__version__))
 
     async def __CommandStart(
         self,
-        client: pyrogram.Client,
         message: pyrogram.types.Message
     ) -> None:
         """
         Handle the start command to activate the bot.
 
         Args:
-            client: The Pyrogram client instance.
             message: The message that triggered the command.
         """
-        if not await self.__IsUserAuthorized(message):
-            return
-        logging.info("Command: start")
         await self.night_vacation.Start(message)
 
     async def __CommandStop(
         self,
-        client: pyrogram.Client,
         message: pyrogram.types.Message
     ) -> None:
         """
         Handle the stop command to deactivate the bot.
 
         Args:
-            client: The Pyrogram client instance.
             message: The message that triggered the command.
         """
-        if not await self.__IsUserAuthorized(message):
-            return
-        logging.info("Command: stop")
         await self.night_vacation.Stop(message)
 
     async def __CommandStatus(
         self,
-        client: pyrogram.Client,
         message: pyrogram.types.Message
     ) -> None:
         """
         Handle the status command to show bot running status.
 
         Args:
-            client: The Pyrogram client instance.
             message: The message that triggered the command.
         """
-        if not await self.__IsUserAuthorized(message):
-            return
-        logging.info("Command: status")
         await self.night_vacation.Status(message)
 
     async def __CommandVacationStatus(
         self,
-        client: pyrogram.Client,
         message: pyrogram.types.Message
     ) -> None:
         """
         Handle the vacation status command to check if vacation mode is active.
 
         Args:
-            client: The Pyrogram client instance.
             message: The message that triggered the command.
         """
-        if not await self.__IsUserAuthorized(message):
-            return
-        logging.info("Command: vacation status")
         await self.night_vacation.VacationStatus(message)
 
     async def __CommandNightStatus(
         self,
-        client: pyrogram.Client,
         message: pyrogram.types.Message
     ) -> None:
         """
         Handle the night status command to check if night mode is active.
 
         Args:
-            client: The Pyrogram client instance.
             message: The message that triggered the command.
         """
-        if not await self.__IsUserAuthorized(message):
-            return
-        logging.info("Command: night status")
         await self.night_vacation.NightStatus(message)
 
     async def __CommandTestVacation(
         self,
-        client: pyrogram.Client,
         message: pyrogram.types.Message
     ) -> None:
         """
         Handle the test vacation command to test vacation notifications.
 
         Args:
-            client: The Pyrogram client instance.
             message: The message that triggered the command.
         """
-        if not await self.__IsUserAuthorized(message):
-            return
-        logging.info("Command: night vacation")
         await self.night_vacation.TestVacation(message)
 
     async def __CommandTestNight(
         self,
-        client: pyrogram.Client,
         message: pyrogram.types.Message
     ) -> None:
         """
         Handle the test night command to test night notifications.
 
         Args:
-            client: The Pyrogram client instance.
             message: The message that triggered the command.
         """
-        if not await self.__IsUserAuthorized(message):
-            return
-        logging.info("Command: night test")
         await self.night_vacation.TestNight(message)
 
+    async def __CommandSetNight(
+        self,
+        message: pyrogram.types.Message
+    ) -> None:
+        """
+        Handle the set night command to change the night hours of the group.
+        Topics with their own night windows keep them, the reply lists them.
+
+        Args:
+            message: The message that triggered the command.
+        """
+        chat_id = await self.__ManagedChatId(message)
+        if chat_id is None:
+            return
+
+        args = self.__CommandArgs(message)
+        begin = self.__ParseTime(args[0]) if len(args) == 2 else None
+        end = self.__ParseTime(args[1]) if len(args) == 2 else None
+        if begin is None or end is None:
+            await self.tg_client.SendReplyMessage(message, BotMessages.SET_NIGHT_USAGE)
+            return
+
+        reply_text = BotMessages.NIGHT_SET.format(begin=f"{begin[0]:02d}:{begin[1]:02d}", end=f"{end[0]:02d}:{end[1]:02d}")
+        window_topic_ids = sorted(self.__ChatParam(chat_id, "TOPIC_NIGHT_WINDOWS"))
+        if len(window_topic_ids) > 0:
+            topic_ids = ", ".join(str(topic_id) for topic_id in window_topic_ids)
+            reply_text += f"\n{BotMessages.NIGHT_SET_TOPIC_WINDOWS_KEPT.format(topic_ids=topic_ids)}"
+        await self.__SetChatParams(
+            message,
+            chat_id,
+            {
+                "NIGHT_BEGIN_HOUR": begin[0],
+                "NIGHT_BEGIN_MINUTE": begin[1],
+                "NIGHT_END_HOUR": end[0],
+                "NIGHT_END_MINUTE": end[1],
+            },
+            reply_text
+        )
+
+    async def __CommandAddVacation(
+        self,
+        message: pyrogram.types.Message
+    ) -> None:
+        """
+        Handle the add vacation command to add a vacation date to the group, repeated every year if the year
+        is not specified, only once otherwise.
+
+        Args:
+            message: The message that triggered the command.
+        """
+        chat_id = await self.__ManagedChatId(message)
+        if chat_id is None:
+            return
+        date = await self.__ParseDateArg(message, "nvbot_add_vacation")
+        if date is None:
+            return
+
+        year, month, day = date
+        if year is not None:
+            await self.__AddOneOffVacationDate(message, chat_id, f"{year:04d}-{month:02d}-{day:02d}")
+            return
+
+        vacation_dates = self.__ChatVacationDates(chat_id)
+        date_str = f"{month:02d}-{day:02d}"
+        if day in vacation_dates.get(month, []):
+            await self.tg_client.SendReplyMessage(message, BotMessages.VACATION_DATE_ALREADY_PRESENT.format(date=date_str))
+            return
+
+        vacation_dates[month] = sorted(vacation_dates.get(month, []) + [day])
+        await self.__SetChatParams(
+            message,
+            chat_id,
+            {"VACATION_DATES": vacation_dates},
+            BotMessages.VACATION_DATE_ADDED.format(date=date_str)
+        )
+
+    async def __CommandRemoveVacation(
+        self,
+        message: pyrogram.types.Message
+    ) -> None:
+        """
+        Handle the remove vacation command to remove a vacation date from the group, repeated every year if the
+        year is not specified, only once otherwise.
+
+        Args:
+            message: The message that triggered the command.
+        """
+        chat_id = await self.__ManagedChatId(message)
+        if chat_id is None:
+            return
+        date = await self.__ParseDateArg(message, "nvbot_remove_vacation")
+        if date is None:
+            return
+
+        year, month, day = date
+        if year is not None:
+            await self.__RemoveOneOffVacationDate(message, chat_id, f"{year:04d}-{month:02d}-{day:02d}")
+            return
+
+        vacation_dates = self.__ChatVacationDates(chat_id)
+        date_str = f"{month:02d}-{day:02d}"
+        if day not in vacation_dates.get(month, []):
+            await self.tg_client.SendReplyMessage(message, BotMessages.VACATION_DATE_NOT_PRESENT.format(date=date_str))
+            return
+
+        vacation_dates[month] = [vacation_day for vacation_day in vacation_dates[month] if vacation_day != day]
+        if len(vacation_dates[month]) == 0:
+            del vacation_dates[month]
+        await self.__SetChatParams(
+            message,
+            chat_id,
+            {"VACATION_DATES": vacation_dates},
+            BotMessages.VACATION_DATE_REMOVED.format(date=date_str)
+        )
+
+    async def __AddOneOffVacationDate(
+        self,
+        message: pyrogram.types.Message,
+        chat_id: int,
+        date_str: str
+    ) -> None:
+        """
+        Add a one-off vacation date to a group, as a vacation rule.
+
+        Args:
+            message: The message that triggered the command.
+            chat_id: The chat ID.
+            date_str: The date (YYYY-MM-DD).
+        """
+        vacation_rules = self.__ChatParam(chat_id, "VACATION_RULES")
+        if any(self.__IsOneOffVacationRule(rule, date_str) for rule in vacation_rules):
+            await self.tg_client.SendReplyMessage(message, BotMessages.VACATION_DATE_ALREADY_PRESENT.format(date=date_str))
+            return
+        await self.__SetChatParams(
+            message,
+            chat_id,
+            {"VACATION_RULES": vacation_rules + [{"begin": date_str}]},
+            BotMessages.VACATION_ONE_OFF_DATE_ADDED.format(date=date_str)
+        )
+
+    async def __RemoveOneOffVacationDate(
+        self,
+        message: pyrogram.types.Message,
+        chat_id: int,
+        date_str: str
+    ) -> None:
+        """
+        Remove a one-off vacation date from a group, i.e. the vacation rules of that day only.
+
+        Args:
+            message: The message that triggered the command.
+            chat_id: The chat ID.
+            date_str: The date (YYYY-MM-DD).
+        """
+        vacation_rules = self.__ChatParam(chat_id, "VACATION_RULES")
+        if not any(self.__IsOneOffVacationRule(rule, date_str) for rule in vacation_rules):
+            await self.tg_client.SendReplyMessage(message, BotMessages.VACATION_DATE_NOT_PRESENT.format(date=date_str))
+            return
+        await self.__SetChatParams(
+            message,
+            chat_id,
+            {"VACATION_RULES": [rule for rule in vacation_rules if not self.__IsOneOffVacationRule(rule, date_str)]},
+            BotMessages.VACATION_DATE_REMOVED.format(date=date_str)
+        )
+
+    async def __CommandExclude(
+        self,
+        message: pyrogram.types.Message
+    ) -> None:
+        """
+        Handle the exclude command to exclude a user from night/vacation mode in the group.
+
+        Args:
+            message: The message that triggered the command.
+        """
+        chat_id = await self.__ManagedChatId(message)
+        if chat_id is None:
+            return
+        user = await self.__ParseUserArg(message, "nvbot_exclude")
+        if user is None:
+            return
+
+        excluded_users = self.__ChatParam(chat_id, "EXCLUDED_USERS")
+        if user in excluded_users:
+            await self.tg_client.SendReplyMessage(message, BotMessages.USER_ALREADY_EXCLUDED.format(user=user))
+            return
+        await self.__SetChatParams(
+            message,
+            chat_id,
+            {"EXCLUDED_USERS": excluded_users + [user]},
+            BotMessages.USER_EXCLUDED.format(user=user)
+        )
+
+    async def __CommandInclude(
+        self,
+        message: pyrogram.types.Message
+    ) -> None:
+        """
+        Handle the include command to remove a user from the excluded ones in the group.
+
+        Args:
+            message: The message that triggered the command.
+        """
+        chat_id = await self.__ManagedChatId(message)
+        if chat_id is None:
+            return
+        user = await self.__ParseUserArg(message, "nvbot_include")
+        if user is None:
+            return
+
+        excluded_users = self.__ChatParam(chat_id, "EXCLUDED_USERS")
+        if user not in excluded_users:
+            await self.tg_client.SendReplyMessage(message, BotMessages.USER_NOT_EXCLUDED.format(user=user))
+            return
+        await self.__SetChatParams(
+            message,
+            chat_id,
+            {"EXCLUDED_USERS": [excluded_user for excluded_user in excluded_users if excluded_user != user]},
+            BotMessages.USER_INCLUDED.format(user=user)
+        )
+
     async def __OnMessage(
         self,
         client: pyrogram.Client,
@@ -281,12 +503,26 @@ class CommandsNightVacation:
         self.__LogMessage(message)
         await self.night_vacation.OnMessage(message)
 
+    async def __OnDisconnect(
+        self,
+        client: pyrogram.Client
+    ) -> None:
+        """
+        Handle disconnections.
+
+        Args:
+            client: The Pyrogram client instance.
+        """
+        self.night_vacation.OnDisconnect()
+
     async def __IsUserAuthorized(
         self,
         message: pyrogram.types.Message
     ) -> bool:
         """
         Check if the user is authorized to use the bot.
+        The result is cached for each user ID and username (so it's computed again if the username changes).
+        Unauthorized users get a reply at most once per cooldown in each chat, their other commands are dropped.
 
         Args:
             message: The message to check authorization for.
@@ -295,26 +531,231 @@ class CommandsNightVacation:
             True if user is authorized, False otherwise.
         """
         user = self.tg_client.GetUserFromMessage(message)
-        user_id = self.tg_client.GetUserIdFromUser(user)
-        username = self.tg_client.GetUsernameFromUser(user)
-        if user_id in BotConfig.AUTHORIZED_USERS or username in BotConfig.AUTHORIZED_USERS:
+        cache_key = (self.tg_client.GetUserIdFromUser(user), self.tg_client.GetUsernameFromUser(user))
+        is_authorized = self.authorized_cache.Get(cache_key)
+        if is_authorized is None:
+            is_authorized = cache_key[0] in BotConfig.AUTHORIZED_USERS or cache_key[1] in BotConfig.AUTHORIZED_USERS
+            self.authorized_cache.Set(cache_key, is_authorized)
+        if is_authorized:
             return True
 
-        await self.tg_client.SendMessageQuick(message, BotMessages.USER_NOT_AUTHORIZED)
+        # Reply once, then drop the user's commands silently for the cooldown
+        chat_id = self.tg_client.GetChatIdFromMessage(message)
+        if self.unauthorized_reply_limiter.Allow((chat_id, cache_key[0])):
+            await self.tg_client.SendMessageQuick(message, BotMessages.USER_NOT_AUTHORIZED)
+        else:
+            BotMetrics.COMMANDS_DROPPED_UNAUTHORIZED.Inc()
+            logging.info("Command from unauthorized user %d dropped (chat ID: %d)", cache_key[0], chat_id)
         return False
 
+    async def __ManagedChatId(
+        self,
+        message: pyrogram.types.Message
+    ) -> Optional[int]:
+        """
+        Get the ID of the message chat, replying with an error if not managed by the bot.
+
+        Args:
+            message: The message.
+
+        Returns:
+            The chat ID, None if not managed.
+        """
+        chat_id = self.tg_client.GetChatIdFromMessage(message)
+        if chat_id not in BotConfig.CHATS:
+            await self.tg_client.SendReplyMessage(message, BotMessages.CHAT_NOT_MANAGED)
+            return None
+        return chat_id
+
+    async def __SetChatParams(
+        self,
+        message: pyrogram.types.Message,
+        chat_id: int,
+        params: Dict[str, Any],
+        reply_text: str
+    ) -> None:
+        """
+        Set parameters of a chat, apply them and save them to the configuration file.
+
+        Args:
+            message: The message that triggered the command.
+            chat_id: The chat ID.
+            params: The chat parameters.
+            reply_text: The text to reply with if successful.
+        """
+        chats = dict(BotConfig.CHATS)
+        chats[chat_id] = {**chats[chat_id], **params}
+        old_values = ConfigFile.Apply({"CHATS": chats})
+        try:
+            await self.ReloadConfig()
+        except Exception:
+            ConfigFile.Apply(old_values)
+            raise
+
+        if self.config_file is not None:
+            try:
+                await asyncio.get_event_loop().run_in_executor(None, self.config_file.Save, {"CHATS": chats})
+            except ConfigFileError as ex:
+                logging.error(str(ex))
+                reply_text += f"\n{BotMessages.CONFIG_NOT_SAVED}"
+        await self.tg_client.SendReplyMessage(message, reply_text)
+
+    @staticmethod
+    def __ChatParam(
+        chat_id: int,
+        name: str
+    ) -> Any:
+        """
+        Get a parameter of a chat, i.e. the chat one if present or the global one.
+
+        Args:
+            chat_id: The chat ID.
+            name: The parameter name.
+
+        Returns:
+            The parameter value.
+        """
+        return BotConfig.CHATS[chat_id].get(name, getattr(BotConfig, name))
+
+    @classmethod
+    def __ChatVacationDates(
+        cls,
+        chat_id: int
+    ) -> Dict[int, List[int]]:
+        """
+        Get a copy of the vacation dates of a chat.
+
+        Args:
+            chat_id: The chat ID.
+
+        Returns:
+            The vacation dates.
+        """
+        return {month: list(days) for month, days in cls.__ChatParam(chat_id, "VACATION_DATES").items()}
+
+    @staticmethod
+    def __IsOneOffVacationRule(
+        rule: Dict[str, Any],
+        date_str: str
+    ) -> bool:
+        """
+        Check if a vacation rule adds only the specified day.
+
+        Args:
+            rule: The vacation rule.
+            date_str: The date (YYYY-MM-DD).
+
+        Returns:
+            True if the rule adds only the day, False otherwise.
+        """
+        return (not rule.get("exclude", False)
+                and rule.get("begin") == date_str
+                and rule.get("end", date_str) == date_str)
+
+    @staticmethod
+    def __CommandArgs(
+        message: pyrogram.types.Message
+    ) -> List[str]:
+        """
+        Get the arguments of a command.
+
+        Args:
+            message: The command message.
+
+        Returns:
+            The arguments.
+        """
+        return message.command[1:] if message.command is not None else []
+
+    @staticmethod
+    def __ParseTime(
+        time_str: str
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Parse a time (e.g. 22 or 22:30).
+
+        Args:
+            time_str: The time string.
+
+        Returns:
+            The hour and minute, None if not valid.
+        """
+        match = CommandsNightVacationConst.TIME_REGEX.match(time_str)
+        if match is None:
+            return None
+        hour, minute = int(match.group(1)), int(match.group(2) or 0)
+        return (hour, minute) if hour < 24 and minute < 60 else None
+
+    async def __ParseDateArg(
+        self,
+        message: pyrogram.types.Message,
+        command: str
+    ) -> Optional[Tuple[Optional[int], int, int]]:
+        """
+        Parse the date argument of a command (e.g. 2026-12-24 or 12-24), replying with the usage if not valid.
+
+        Args:
+            message: The command message.
+            command: The command name.
+
+        Returns:
+            The year (None if not specified), month and day, None if not valid.
+        """
+        args = self.__CommandArgs(message)
+        match = CommandsNightVacationConst.DATE_REGEX.match(args[0]) if len(args) == 1 else None
+        if match is not None:
+            year = int(match.group(1)) if match.group(1) is not None else None
+            month, day = int(match.group(2)), int(match.group(3))
+            # Leap year if not specified, so that February 29th is valid
+            if year != 0 and 1 <= month <= 12 and 1 <= day <= calendar.monthrange(year or 2000, month)[1]:
+                return year, month, day
+
+        await self.tg_client.SendReplyMessage(message, BotMessages.VACATION_DATE_USAGE.format(command=command))
+        return None
+
+    async def __ParseUserArg(
+        self,
+        message: pyrogram.types.Message,
+        command: str
+    ) -> Optional[Union[int, str]]:
+        """
+        Parse the user argument of a command (e.g. @username or 123456789), replying with the usage if not valid.
+        User IDs shall be positive.
+
+        Args:
+            message: The command message.
+            command: The command name.
+
+        Returns:
+            The user ID or username (without the '@'), None if not valid.
+        """
+        args = self.__CommandArgs(message)
+        if len(args) == 1:
+            if re.match(r"^-?\d+$", args[0]):
+                user_id = int(args[0])
+                if user_id > 0:
+                    return user_id
+            elif re.match(r"^@?\w+$", args[0]):
+                return args[0].lstrip("@")
+
+        await self.tg_client.SendReplyMessage(message, BotMessages.USER_USAGE.format(command=command))
+        return None
+
     def __LogMessage(
         self,
         message: pyrogram.types.Message
     ) -> None:
         """
-        Log message details in test mode.
+        Log message details in test mode (one message every LOG_MSG_SAMPLE_RATE).
 
         Args:
             message: The message to log.
         """
         if self.bot_type.IsProduction():
             return
+        self.received_msgs_num += 1
+        if (self.received_msgs_num - 1) % BotConfig.LOG_MSG_SAMPLE_RATE != 0:
+            return
 
         chat_id = self.tg_client.GetChatIdFromMessage(message)
         topic_id = self.tg_client.GetTopicIdFromMessage(message)
@@ -324,5 +765,6 @@ class CommandsNightVacation:
         username = self.tg_client.GetUsernameFromUser(user)
 
         logging.info(
-            f"Got message from user: {user_full_name} (@{username}), user ID: {user_id}, chat ID: {chat_id}, topic ID: {topic_id}"
+            "Got message from user: %s (@%s), user ID: %d, chat ID: %d, topic ID: %d",
+            user_full_name, username, user_id, chat_id, topic_id
         )
@@ -0,0 +1,697 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import asyncio
+import copy
+import json
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from telegram_night_vacation_bot.bot_config import BotConfig
+from telegram_night_vacation_bot.enforcement_mode import EnforcementModes
+from telegram_night_vacation_bot.night_schedule import NightSchedule
+from telegram_night_vacation_bot.utils import Utils
+from telegram_night_vacation_bot.vacation_calendar import VacationRule
+
+
+class ConfigFileConst:
+    """Constants for configuration file."""
+
+    # Parameters that can be specified in the file
+    STR_PARAMS: Tuple[str, ...] = (
+        "API_ID", "API_HASH", "BOT_TOKEN", "SESSION_NAME", "STATE_FILE_NAME", "ICS_CACHE_DIR", "LOG_FILE_NAME",
+        "METRICS_HOST",
+    )
+    OPTIONAL_STR_PARAMS: Tuple[str, ...] = ("LOG_FILE_ROTATE_WHEN", "TIMEZONE")
+    BOOL_PARAMS: Tuple[str, ...] = ("LOG_USE_FILE", "LOG_ASYNC", "METRICS_ENABLED")
+    INT_PARAMS: Dict[str, Tuple[int, int]] = {
+        "LOG_FILE_MAX_BYTES": (0, 2**63 - 1),
+        "LOG_FILE_BACKUP_COUNT": (0, 1000),
+        "LOG_MSG_SAMPLE_RATE": (1, 2**31 - 1),
+        "METRICS_PORT": (1, 65535),
+        "NIGHT_BEGIN_HOUR": (0, 23),
+        "NIGHT_BEGIN_MINUTE": (0, 59),
+        "NIGHT_END_HOUR": (0, 23),
+        "NIGHT_END_MINUTE": (0, 59),
+    }
+    INT_LIST_PARAMS: Dict[str, Tuple[int, int]] = {
+        "VACATION_WEEK_DAYS": (0, 6),
+        "NIGHT_TOPIC_IDS": (0, 2**31 - 1),
+        "VACATION_TOPIC_IDS": (0, 2**31 - 1),
+    }
+    USER_LIST_PARAMS: Tuple[str, ...] = ("AUTHORIZED_USERS", "EXCLUDED_USERS")
+    # Parameters that can be overridden by each chat
+    CHAT_PARAMS: Tuple[str, ...] = (
+        "TIMEZONE", "NIGHT_BEGIN_HOUR", "NIGHT_BEGIN_MINUTE", "NIGHT_END_HOUR", "NIGHT_END_MINUTE",
+        "VACATION_WEEK_DAYS", "VACATION_DATES", "VACATION_RULES", "NIGHT_TOPIC_IDS", "TOPIC_NIGHT_WINDOWS",
+        "VACATION_TOPIC_IDS", "ENFORCEMENT_MODE", "EXCLUDED_USERS",
+    )
+    # Parameters applied when the file is reloaded, the other ones require a restart
+    RELOADABLE_PARAMS: Tuple[str, ...] = CHAT_PARAMS + ("CHATS", "AUTHORIZED_USERS", "LOG_MSG_SAMPLE_RATE")
+
+
+class ConfigFileError(Exception):
+    """Exception raised if the configuration file is not valid."""
+
+
+class ConfigFile:
+    """
+    Configuration file in JSON format, whose parameters override the ones of BotConfig.
+    The file is a JSON object with the same parameter names of BotConfig, e.g.:
+        {"NIGHT_BEGIN_HOUR": 23, "CHATS": {"-1000000000000": {"NIGHT_TOPIC_IDS": [0]}}}
+    """
+
+    default_params: Dict[str, Any]
+    file_name: str
+    file_signature: Optional[Tuple[int, int]]
+
+    def __init__(
+        self,
+        file_name: str
+    ) -> None:
+        """
+        Initialize the configuration file.
+        The current values of the reloadable parameters are saved as defaults, so it shall be initialized
+        before applying the file.
+
+        Args:
+            file_name: The file name.
+        """
+        self.default_params = copy.deepcopy(
+            {name: getattr(BotConfig, name) for name in ConfigFileConst.RELOADABLE_PARAMS}
+        )
+        self.file_name = file_name
+        self.file_signature = None
+
+    def Exists(self) -> bool:
+        """
+        Get if the file exists.
+
+        Returns:
+            True if the file exists, False otherwise.
+        """
+        return os.path.isfile(self.file_name)
+
+    def IsModified(self) -> bool:
+        """
+        Get if the file was modified since the last load (by checking its modification time and size).
+
+        Returns:
+            True if the file was modified, False otherwise.
+        """
+        signature = self.__Signature()
+        return signature is not None and signature != self.file_signature
+
+    def Load(self) -> Dict[str, Any]:
+        """
+        Load and validate the parameters of the file.
+
+        Returns:
+            The parameters, converted to the types used by BotConfig.
+
+        Raises:
+            ConfigFileError: If the file cannot be read or is not valid.
+        """
+        # Signature is updated even if the file is not valid, so it's loaded again only when modified
+        self.file_signature = self.__Signature()
+        try:
+            with open(self.file_name, encoding="utf-8") as fin:
+                raw_params = json.load(fin)
+        except (OSError, ValueError) as ex:
+            raise ConfigFileError(f"Unable to read configuration file {self.file_name}: {ex}") from ex
+        if not isinstance(raw_params, dict):
+            raise ConfigFileError("Configuration file shall contain a JSON object")
+
+        return {name: self.__ValidateParam(name, value) for name, value in raw_params.items()}
+
+    def Save(
+        self,
+        params: Dict[str, Any]
+    ) -> None:
+        """
+        Save parameters to the file, keeping the other ones.
+        The file is written atomically (i.e. to a temporary file which then replaces it) and not reloaded.
+
+        Args:
+            params: The parameters.
+
+        Raises:
+            ConfigFileError: If the file cannot be written.
+        """
+        try:
+            raw_params = {}
+            if self.Exists():
+                with open(self.file_name, encoding="utf-8") as fin:
+                    raw_params = json.load(fin)
+            raw_params.update(params)
+
+            tmp_file_name = f"{self.file_name}.tmp"
+            with open(tmp_file_name, "w", encoding="utf-8") as fout:
+                json.dump(raw_params, fout, indent=2)
+            os.replace(tmp_file_name, self.file_name)
+        except (OSError, ValueError) as ex:
+            raise ConfigFileError(f"Unable to write configuration file {self.file_name}: {ex}") from ex
+        self.file_signature = self.__Signature()
+
+    def ReloadableParams(
+        self,
+        params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Get the reloadable parameters from the loaded ones, with the default values for the missing ones
+        (so that parameters removed from the file are restored to their defaults).
+
+        Args:
+            params: The loaded parameters.
+
+        Returns:
+            The reloadable parameters.
+        """
+        reloadable_params = copy.deepcopy(self.default_params)
+        reloadable_params.update(
+            (name, value) for name, value in params.items() if name in ConfigFileConst.RELOADABLE_PARAMS
+        )
+        return reloadable_params
+
+    @staticmethod
+    def Apply(
+        params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Set the parameters in BotConfig.
+        No coroutine can run in between, so they are always seen either all old or all new.
+
+        Args:
+            params: The parameters.
+
+        Returns:
+            The previous values of the changed parameters (they can be passed to Apply to restore them).
+        """
+        old_values = {}
+        for name, value in params.items():
+            if getattr(BotConfig, name) != value:
+                old_values[name] = getattr(BotConfig, name)
+                setattr(BotConfig, name, value)
+        return old_values
+
+    def __Signature(self) -> Optional[Tuple[int, int]]:
+        """
+        Get the modification time and size of the file.
+
+        Returns:
+            Modification time (in nanoseconds) and size, None if the file doesn't exist.
+        """
+        try:
+            stat = os.stat(self.file_name)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @classmethod
+    def __ValidateParam(
+        cls,
+        name: str,
+        value: Any
+    ) -> Any:
+        """
+        Validate a parameter and convert it to the type used by BotConfig.
+
+        Args:
+            name: The parameter name.
+            value: The parameter value.
+
+        Returns:
+            The converted value.
+
+        Raises:
+            ConfigFileError: If the parameter is not valid.
+        """
+        if name in ConfigFileConst.STR_PARAMS:
+            return cls.__ValidateStr(name, value)
+        if name in ConfigFileConst.OPTIONAL_STR_PARAMS:
+            return cls.__ValidateOptionalStr(name, value)
+        if name in ConfigFileConst.BOOL_PARAMS:
+            return cls.__ValidateBool(name, value)
+        if name in ConfigFileConst.INT_PARAMS:
+            return cls.__ValidateInt(name, value, ConfigFileConst.INT_PARAMS[name])
+        if name in ConfigFileConst.INT_LIST_PARAMS:
+            return [
+                cls.__ValidateInt(name, elem, ConfigFileConst.INT_LIST_PARAMS[name])
+                for elem in cls.__ValidateList(name, value)
+            ]
+        if name in ConfigFileConst.USER_LIST_PARAMS:
+            return [cls.__ValidateUser(name, user) for user in cls.__ValidateList(name, value)]
+
+        other_validators: Dict[str, Callable[[str, Any], Any]] = {
+            "LOG_LEVEL": cls.__ValidateLogLevel,
+            "VACATION_DATES": cls.__ValidateVacationDates,
+            "VACATION_RULES": cls.__ValidateVacationRules,
+            "TOPIC_NIGHT_WINDOWS": cls.__ValidateTopicNightWindows,
+            "ENFORCEMENT_MODE": cls.__ValidateEnforcementMode,
+            "CHATS": cls.__ValidateChats,
+        }
+        if name in other_validators:
+            return other_validators[name](name, value)
+        raise ConfigFileError(f"Unknown parameter {name}")
+
+    @staticmethod
+    def __ValidateStr(
+        name: str,
+        value: Any
+    ) -> str:
+        """
+        Validate a string.
+
+        Args:
+            name: The parameter name.
+            value: The value.
+
+        Returns:
+            The value.
+
+        Raises:
+            ConfigFileError: If the value is not valid.
+        """
+        if not isinstance(value, str):
+            raise ConfigFileError(f"{name}: string expected")
+        return value
+
+    @classmethod
+    def __ValidateOptionalStr(
+        cls,
+        name: str,
+        value: Any
+    ) -> Optional[str]:
+        """
+        Validate an optional string (time zones are also checked to exist).
+
+        Args:
+            name: The parameter name.
+            value: The value.
+
+        Returns:
+            The value.
+
+        Raises:
+            ConfigFileError: If the value is not valid.
+        """
+        if value is None:
+            return None
+        value = cls.__ValidateStr(name, value)
+        if name == "TIMEZONE":
+            try:
+                Utils.TimeZone(value)
+            except Exception as ex:
+                raise ConfigFileError(f"{name}: invalid time zone {value}") from ex
+        return value
+
+    @staticmethod
+    def __ValidateBool(
+        name: str,
+        value: Any
+    ) -> bool:
+        """
+        Validate a boolean.
+
+        Args:
+            name: The parameter name.
+            value: The value.
+
+        Returns:
+            The value.
+
+        Raises:
+            ConfigFileError: If the value is not valid.
+        """
+        if not isinstance(value, bool):
+            raise ConfigFileError(f"{name}: boolean expected")
+        return value
+
+    @staticmethod
+    def __ValidateInt(
+        name: str,
+        value: Any,
+        value_range: Tuple[int, int]
+    ) -> int:
+        """
+        Validate an integer in a range.
+
+        Args:
+            name: The parameter name.
+            value: The value.
+            value_range: Minimum and maximum value (included).
+
+        Returns:
+            The value.
+
+        Raises:
+            ConfigFileError: If the value is not valid.
+        """
+        # bool is a subclass of int
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ConfigFileError(f"{name}: integer expected")
+        if not value_range[0] <= value <= value_range[1]:
+            raise ConfigFileError(f"{name}: {value} not in range [{value_range[0]}, {value_range[1]}]")
+        return value
+
+    @staticmethod
+    def __ValidateList(
+        name: str,
+        value: Any
+    ) -> List[Any]:
+        """
+        Validate a list.
+
+        Args:
+            name: The parameter name.
+            value: The value.
+
+        Returns:
+            The value.
+
+        Raises:
+            ConfigFileError: If the value is not valid.
+        """
+        if not isinstance(value, list):
+            raise ConfigFileError(f"{name}: list expected")
+        return value
+
+    @classmethod
+    def __ValidateUser(
+        cls,
+        name: str,
+        value: Any
+    ) -> Any:
+        """
+        Validate a user, i.e. a user ID or a username.
+
+        Args:
+            name: The parameter name.
+            value: The value.
+
+        Returns:
+            The user ID or the username (without the '@').
+
+        Raises:
+            ConfigFileError: If the value is not valid.
+        """
+        if isinstance(value, str):
+            return value.lstrip("@")
+        return cls.__ValidateInt(name, value, (-2**63, 2**63 - 1))
+
+    @staticmethod
+    def __ValidateLogLevel(
+        name: str,
+        value: Any
+    ) -> int:
+        """
+        Validate a log level, either as a number or as a name (e.g. "INFO").
+
+        Args:
+            name: The parameter name.
+            value: The value.
+
+        Returns:
+            The log level.
+
+        Raises:
+            ConfigFileError: If the value is not valid.
+        """
+        if isinstance(value, str):
+            value = logging.getLevelName(value.upper())
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ConfigFileError(f"{name}: invalid log level")
+        return value
+
+    @classmethod
+    def __ValidateEnforcementMode(
+        cls,
+        name: str,
+        value: Any
+    ) -> str:
+        """
+        Validate an enforcement mode.
+
+        Args:
+            name: The parameter name.
+            value: The value.
+
+        Returns:
+            The enforcement mode.
+
+        Raises:
+            ConfigFileError: If the value is not valid.
+        """
+        value = cls.__ValidateStr(name, value)
+        if value not in {mode.value for mode in EnforcementModes}:
+            raise ConfigFileError(
+                f"{name}: invalid mode {value} (valid ones: {', '.join(mode.value for mode in EnforcementModes)})"
+            )
+        return value
+
+    @classmethod
+    def __ValidateVacationDates(
+        cls,
+        name: str,
+        value: Any
+    ) -> Dict[int, List[int]]:
+        """
+        Validate vacation dates, i.e. a dictionary from months to lists of days.
+
+        Args:
+            name: The parameter name.
+            value: The value.
+
+        Returns:
+            The vacation dates.
+
+        Raises:
+            ConfigFileError: If the value is not valid.
+        """
+        if not isinstance(value, dict):
+            raise ConfigFileError(f"{name}: object expected")
+        return {
+            cls.__ValidateInt(name, cls.__ValidateIntKey(name, month), (1, 12)): [
+                cls.__ValidateInt(name, day, (1, 31)) for day in cls.__ValidateList(name, days)
+            ]
+            for month, days in value.items()
+        }
+
+    @classmethod
+    def __ValidateVacationRules(
+        cls,
+        name: str,
+        value: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate vacation rules, i.e. a list of rule objects (see VacationRule).
+        Only the rules are validated, iCalendar files are read when the policies are built.
+
+        Args:
+            name: The parameter name.
+            value: The value.
+
+        Returns:
+            The vacation rules.
+
+        Raises:
+            ConfigFileError: If the value is not valid.
+        """
+        rules = cls.__ValidateList(name, value)
+        for rule in rules:
+            try:
+                VacationRule.Validate(rule)
+            except ValueError as ex:
+                raise ConfigFileError(f"{name}: {ex}") from ex
+        return rules
+
+    @classmethod
+    def __ValidateTopicNightWindows(
+        cls,
+        name: str,
+        value: Any
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Validate topic night windows, i.e. a dictionary from topic IDs to lists of windows (see NightSchedule).
+
+        Args:
+            name: The parameter name.
+            value: The value.
+
+        Returns:
+            The topic night windows.
+
+        Raises:
+            ConfigFileError: If the value is not valid.
+        """
+        if not isinstance(value, dict):
+            raise ConfigFileError(f"{name}: object expected")
+
+        topic_windows = {}
+        for topic_id, windows in value.items():
+            try:
+                NightSchedule.FromWindows(windows)
+            except ValueError as ex:
+                raise ConfigFileError(f"{name}: topic {topic_id}: {ex}") from ex
+            topic_windows[cls.__ValidateInt(name, cls.__ValidateIntKey(name, topic_id), (0, 2**31 - 1))] = windows
+        return topic_windows
+
+    @classmethod
+    def __ValidateChats(
+        cls,
+        name: str,
+        value: Any
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Validate chats, i.e. a dictionary from chat IDs to chat parameters.
+
+        Args:
+            name: The parameter name.
+            value: The value.
+
+        Returns:
+            The chats.
+
+        Raises:
+            ConfigFileError: If the value is not valid.
+        """
+        if not isinstance(value, dict):
+            raise ConfigFileError(f"{name}: object expected")
+
+        chats = {}
+        for chat_id, chat_params in value.items():
+            if not isinstance(chat_params, dict):
+                raise ConfigFileError(f"{name}: object expected for chat {chat_id}")
+            for param_name in chat_params:
+                if param_name not in ConfigFileConst.CHAT_PARAMS:
+                    raise ConfigFileError(f"{name}: parameter {param_name} cannot be set for chat {chat_id}")
+            chats[cls.__ValidateIntKey(name, chat_id)] = {
+                param_name: cls.__ValidateParam(param_name, param_value)
+                for param_name, param_value in chat_params.items()
+            }
+        return chats
+
+    @staticmethod
+    def __ValidateIntKey(
+        name: str,
+        key: str
+    ) -> int:
+        """
+        Validate an integer key of a JSON object (keys are always strings in JSON).
+
+        Args:
+            name: The parameter name.
+            key: The key.
+
+        Returns:
+            The key as integer.
+
+        Raises:
+            ConfigFileError: If the key is not valid.
+        """
+        try:
+            return int(key)
+        except ValueError as ex:
+            raise ConfigFileError(f"{name}: integer key expected, got {key}") from ex
+
+
+class ConfigWatcher:
+    """Watcher that reloads the configuration file when modified, by polling its modification time."""
+
+    config_file: ConfigFile
+    on_reload_fct: Callable[[], Awaitable[None]]
+    period_sec: float
+    task: Optional["asyncio.Task[None]"]
+
+    def __init__(
+        self,
+        config_file: ConfigFile,
+        period_sec: float,
+        on_reload_fct: Callable[[], Awaitable[None]]
+    ) -> None:
+        """
+        Initialize the watcher.
+
+        Args:
+            config_file: The configuration file.
+            period_sec: Polling period in seconds.
+            on_reload_fct: Function called after the reloaded parameters are set in BotConfig.
+        """
+        self.config_file = config_file
+        self.on_reload_fct = on_reload_fct
+        self.period_sec = period_sec
+        self.task = None
+
+    def Start(self) -> None:
+        """Start watching the file."""
+        self.task = asyncio.ensure_future(self.__Watch())
+
+    async def Stop(self) -> None:
+        """Stop watching the file."""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def Reload(self) -> bool:
+        """
+        Reload the configuration file.
+        The file is read in a worker thread, so that the event loop is never blocked.
+        If the file is not valid or the new configuration cannot be applied, the current one is kept.
+
+        Returns:
+            True if reloaded, False otherwise.
+        """
+        try:
+            params = await asyncio.get_event_loop().run_in_executor(None, self.config_file.Load)
+        except ConfigFileError as ex:
+            logging.error(f"{ex}, current configuration kept")
+            return False
+
+        for name, value in params.items():
+            if name not in ConfigFileConst.RELOADABLE_PARAMS and getattr(BotConfig, name) != value:
+                logging.warning(f"Parameter {name} changed, it will be applied after restarting the bot")
+
+        old_values = ConfigFile.Apply(self.config_file.ReloadableParams(params))
+        if len(old_values) == 0:
+            logging.info("Configuration file reloaded, no changes")
+            return True
+
+        try:
+            await self.on_reload_fct()
+        except Exception:
+            logging.exception("Unable to apply the new configuration, current one kept")
+            ConfigFile.Apply(old_values)
+            return False
+
+        logging.info(f"Configuration file reloaded, changed parameters: {', '.join(old_values)}")
+        return True
+
+    async def __Watch(self) -> None:
+        """Poll the file and reload it when modified."""
+        while True:
+            await asyncio.sleep(self.period_sec)
+            if self.config_file.IsModified():
+                await self.Reload()
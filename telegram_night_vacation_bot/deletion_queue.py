@@ -0,0 +1,193 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import asyncio
+import logging
+from typing import Dict, List
+
+from pyrogram.errors import FloodWait
+
+from telegram_night_vacation_bot.clock import Clock
+from telegram_night_vacation_bot.metrics import BotMetrics
+from telegram_night_vacation_bot.telegram_client import TelegramClient
+
+
+class DeletionQueueConst:
+    """Constants for the deletion queue."""
+
+    # Maximum number of messages that can be deleted with a single API call
+    MAX_BATCH_SIZE: int = 100
+    # Time window (in seconds) used to collect messages before deleting them
+    FLUSH_DELAY_SEC: float = 1.0
+
+
+class DeletionQueue:
+    """Queue that collects messages to be deleted and deletes them in batches for each chat."""
+
+    clock: Clock
+    flush_events: Dict[int, asyncio.Event]
+    flush_tasks: Dict[int, "asyncio.Task[None]"]
+    last_flush_latency: float
+    pending_msg_ids: Dict[int, List[int]]
+    pending_since: Dict[int, float]
+    tg_client: TelegramClient
+
+    def __init__(
+        self,
+        tg_client: TelegramClient,
+        clock: Clock
+    ) -> None:
+        """
+        Initialize the deletion queue.
+
+        Args:
+            tg_client: The Telegram client instance.
+            clock: The clock used to measure the time window.
+        """
+        self.clock = clock
+        self.tg_client = tg_client
+        self.flush_events = {}
+        self.flush_tasks = {}
+        self.last_flush_latency = 0.0
+        self.pending_msg_ids = {}
+        self.pending_since = {}
+        BotMetrics.DELETION_QUEUE_DEPTH.SetFunction(self.QueueDepth)
+
+    def Add(
+        self,
+        chat_id: int,
+        message_id: int
+    ) -> None:
+        """
+        Add a message to the queue.
+        The message is deleted when the time window expires or the batch is full, whichever comes first.
+
+        Args:
+            chat_id: The chat ID.
+            message_id: The message ID.
+        """
+        msg_ids = self.pending_msg_ids.setdefault(chat_id, [])
+        if len(msg_ids) == 0:
+            self.pending_since[chat_id] = self.clock.Monotonic()
+        msg_ids.append(message_id)
+
+        if chat_id not in self.flush_tasks:
+            self.__StartWorker(chat_id)
+        if len(msg_ids) >= DeletionQueueConst.MAX_BATCH_SIZE:
+            self.flush_events[chat_id].set()
+
+    async def FlushAll(self) -> None:
+        """Delete all the pending messages immediately."""
+        # Workers restarted after an error are flushed too
+        while len(self.flush_tasks) > 0:
+            for event in self.flush_events.values():
+                event.set()
+            await asyncio.gather(*self.flush_tasks.values())
+
+    def QueueDepth(self) -> int:
+        """
+        Get the number of messages waiting to be deleted.
+
+        Returns:
+            int: The number of pending messages in all chats.
+        """
+        return sum(len(msg_ids) for msg_ids in self.pending_msg_ids.values())
+
+    def LastFlushLatency(self) -> float:
+        """
+        Get the latency of the last flush, i.e. the time between the oldest message was queued and its deletion.
+
+        Returns:
+            float: The latency in seconds.
+        """
+        return self.last_flush_latency
+
+    def __StartWorker(
+        self,
+        chat_id: int,
+        delay: float = DeletionQueueConst.FLUSH_DELAY_SEC
+    ) -> None:
+        """
+        Start the worker deleting the pending messages of a chat.
+
+        Args:
+            chat_id: The chat ID.
+            delay: Time (in seconds) to wait before deleting, unless flushed or the batch is full.
+        """
+        self.flush_events[chat_id] = asyncio.Event()
+        self.flush_tasks[chat_id] = asyncio.ensure_future(self.__FlushWorker(chat_id, delay))
+
+    async def __FlushWorker(
+        self,
+        chat_id: int,
+        delay: float
+    ) -> None:
+        """
+        Wait for the time window to expire (or the batch to be full) and delete the pending messages of a chat.
+        If a batch cannot be deleted because of flood waits, it's queued again and deleted by a new worker after
+        the flood wait. If it cannot be deleted because of other errors, it's dropped.
+        If the worker stops before deleting all the pending messages (e.g. because of an error or cancellation),
+        a new worker is started for them.
+
+        Args:
+            chat_id: The chat ID.
+            delay: Time (in seconds) to wait before deleting, unless flushed or the batch is full.
+        """
+        restart_delay = DeletionQueueConst.FLUSH_DELAY_SEC
+        try:
+            await self.clock.WaitEvent(self.flush_events[chat_id], delay)
+
+            msg_ids = self.pending_msg_ids[chat_id]
+            while len(msg_ids) > 0:
+                batch_msg_ids = msg_ids[:DeletionQueueConst.MAX_BATCH_SIZE]
+                del msg_ids[:DeletionQueueConst.MAX_BATCH_SIZE]
+                pending_since = self.pending_since[chat_id]
+
+                try:
+                    await self.tg_client.DeleteMessages(chat_id, batch_msg_ids)
+                except FloodWait as ex:
+                    msg_ids[:0] = batch_msg_ids
+                    restart_delay = float(ex.value)
+                    logging.warning(
+                        "Flood wait of %.0fs deleting %d message(s) in chat %d, rescheduled",
+                        restart_delay, len(batch_msg_ids), chat_id
+                    )
+                    return
+
+                self.last_flush_latency = self.clock.Monotonic() - pending_since
+                BotMetrics.DELETION_QUEUE_FLUSH_LATENCY.Observe(self.last_flush_latency)
+                logging.info(
+                    "Deleted %d message(s) in chat %d (latency: %.3fs, queue depth: %d)",
+                    len(batch_msg_ids), chat_id, self.last_flush_latency, self.QueueDepth()
+                )
+        # Before Python 3.8, CancelledError is an Exception
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            logging.error("Unable to delete messages in chat %d: %s", chat_id, ex)
+        finally:
+            del self.flush_events[chat_id]
+            del self.flush_tasks[chat_id]
+            if len(self.pending_msg_ids[chat_id]) > 0:
+                self.__StartWorker(chat_id, restart_delay)
+            else:
+                del self.pending_msg_ids[chat_id]
+                del self.pending_since[chat_id]
@@ -0,0 +1,229 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+
+import asyncio
+import logging
+from typing import Dict, FrozenSet, Iterable, Set
+
+import pyrogram
+
+from telegram_night_vacation_bot.enforcement_mode import EnforcementModes
+from telegram_night_vacation_bot.night_vacation_policy import NightVacationPolicy
+from telegram_night_vacation_bot.state_store import StateStore
+from telegram_night_vacation_bot.telegram_client import TelegramClient
+
+
+class EnforcerConst:
+    """Constants for the enforcer."""
+
+    # Maximum number of topics closed or reopened at the same time
+    MAX_CONCURRENCY: int = 10
+    # Permissions removed when a chat is restricted
+    SEND_PERMISSIONS: FrozenSet[str] = frozenset({
+        "can_send_messages", "can_send_media_messages", "can_send_audios", "can_send_documents", "can_send_photos",
+        "can_send_videos", "can_send_video_notes", "can_send_voice_notes", "can_send_polls", "can_send_other_messages",
+        "can_add_web_page_previews",
+    })
+
+
+class Enforcer:
+    """
+    Enforces night/vacation mode in Telegram, by closing topics or restricting chat permissions, so that messages
+    are rejected by Telegram instead of being received and deleted by the bot.
+    Closed topics and saved permissions are kept in the state store, so that they are restored after a restart.
+    Message deletion still applies to anything that is sent anyway (e.g. if closing a topic fails).
+    """
+
+    closed_topic_ids: Dict[int, Set[int]]
+    state_store: StateStore
+    tg_client: TelegramClient
+
+    def __init__(
+        self,
+        tg_client: TelegramClient,
+        state_store: StateStore
+    ) -> None:
+        """
+        Initialize the enforcer.
+
+        Args:
+            tg_client: The Telegram client instance.
+            state_store: The state store (it shall be opened before calling the other methods).
+        """
+        self.tg_client = tg_client
+        self.state_store = state_store
+        self.closed_topic_ids = {}
+
+    async def Enforce(
+        self,
+        policy: NightVacationPolicy,
+        *,
+        close: bool = True,
+        reopen: bool = True
+    ) -> None:
+        """
+        Close the topics (or restrict the chat) according to the current mode of a policy, and reopen the ones
+        that are not closed anymore. Only the changes with respect to the last call result in API calls.
+
+        Args:
+            policy: The policy of the chat.
+            close: True to close topics or restrict the chat, if needed.
+            reopen: True to reopen topics or unrestrict the chat, if needed.
+        """
+        chat_id = policy.chat_id
+        closed_topic_ids = self.__ClosedTopicIds(chat_id)
+        topic_ids_to_close = (policy.closed_topic_ids if policy.enforcement_mode == EnforcementModes.CLOSE_TOPICS
+                              else frozenset())
+        restrict = policy.enforcement_mode == EnforcementModes.RESTRICT_CHAT and len(policy.closed_topic_ids) > 0
+
+        if reopen:
+            await self.__SetTopicsClosed(chat_id, closed_topic_ids - topic_ids_to_close, False)
+            if not restrict:
+                await self.__Unrestrict(chat_id)
+        if close:
+            await self.__SetTopicsClosed(chat_id, topic_ids_to_close - closed_topic_ids, True)
+            if restrict:
+                await self.__Restrict(chat_id)
+
+    async def Release(
+        self,
+        chat_ids: Iterable[int]
+    ) -> None:
+        """
+        Reopen all the topics closed by the enforcer and unrestrict all the chats restricted by it.
+
+        Args:
+            chat_ids: The chat IDs.
+        """
+        for chat_id in chat_ids:
+            await self.__SetTopicsClosed(chat_id, set(self.__ClosedTopicIds(chat_id)), False)
+            await self.__Unrestrict(chat_id)
+
+    def __ClosedTopicIds(
+        self,
+        chat_id: int
+    ) -> Set[int]:
+        """
+        Get the topics closed by the enforcer in a chat, loading them from the state store the first time.
+
+        Args:
+            chat_id: The chat ID.
+
+        Returns:
+            The topic IDs.
+        """
+        if chat_id not in self.closed_topic_ids:
+            self.closed_topic_ids[chat_id] = self.state_store.GetClosedTopicIds(chat_id)
+        return self.closed_topic_ids[chat_id]
+
+    async def __SetTopicsClosed(
+        self,
+        chat_id: int,
+        topic_ids: Iterable[int],
+        closed: bool
+    ) -> None:
+        """
+        Close or reopen topics, concurrently.
+
+        Args:
+            chat_id: The chat ID.
+            topic_ids: The topic IDs.
+            closed: True to close the topics, False to reopen them.
+        """
+        sorted_topic_ids = sorted(topic_ids)
+        if len(sorted_topic_ids) == 0:
+            return
+
+        semaphore = asyncio.Semaphore(EnforcerConst.MAX_CONCURRENCY)
+
+        async def set_topic_closed(topic_id: int) -> None:
+            async with semaphore:
+                if closed:
+                    await self.tg_client.CloseTopic(chat_id, topic_id)
+                else:
+                    await self.tg_client.ReopenTopic(chat_id, topic_id)
+
+        results = await asyncio.gather(*[set_topic_closed(topic_id) for topic_id in sorted_topic_ids], return_exceptions=True)
+
+        closed_topic_ids = self.__ClosedTopicIds(chat_id)
+        for topic_id, result in zip(sorted_topic_ids, results):
+            if isinstance(result, BaseException):
+                logging.error(
+                    f"Unable to {'close' if closed else 'reopen'} topic {topic_id} (chat ID: {chat_id}): {result}"
+                )
+            elif closed:
+                closed_topic_ids.add(topic_id)
+            else:
+                closed_topic_ids.discard(topic_id)
+        self.state_store.SetClosedTopicIds(chat_id, closed_topic_ids)
+        logging.info(f"Closed topics in chat {chat_id}: {sorted(closed_topic_ids)}")
+
+    async def __Restrict(
+        self,
+        chat_id: int
+    ) -> None:
+        """
+        Restrict a chat so that members cannot send messages, saving the current permissions.
+
+        Args:
+            chat_id: The chat ID.
+        """
+        if self.state_store.GetSavedChatPermissions(chat_id) is not None:
+            return
+        try:
+            permissions = await self.tg_client.GetChatPermissions(chat_id)
+            saved_permissions = {
+                name: value for name, value in vars(permissions).items() if name.startswith("can_")
+            }
+            await self.tg_client.SetChatPermissions(
+                chat_id,
+                pyrogram.types.ChatPermissions(**{
+                    name: False if name in EnforcerConst.SEND_PERMISSIONS else value
+                    for name, value in saved_permissions.items()
+                })
+            )
+        except Exception as ex:
+            logging.error(f"Unable to restrict chat {chat_id}: {ex}")
+            return
+        self.state_store.SetSavedChatPermissions(chat_id, saved_permissions)
+        logging.info(f"Restricted chat {chat_id}")
+
+    async def __Unrestrict(
+        self,
+        chat_id: int
+    ) -> None:
+        """
+        Restore the permissions of a chat restricted by the enforcer.
+
+        Args:
+            chat_id: The chat ID.
+        """
+        saved_permissions = self.state_store.GetSavedChatPermissions(chat_id)
+        if saved_permissions is None:
+            return
+        try:
+            await self.tg_client.SetChatPermissions(chat_id, pyrogram.types.ChatPermissions(**saved_permissions))
+        except Exception as ex:
+            logging.error(f"Unable to unrestrict chat {chat_id}: {ex}")
+            return
+        self.state_store.SetSavedChatPermissions(chat_id, None)
+        logging.info(f"Unrestricted chat {chat_id}")
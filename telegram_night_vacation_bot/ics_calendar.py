@@ -0,0 +1,689 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+
+import calendar
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class IcsCalendarConst:
+    """Constants for iCalendar files."""
+
+    # Version of the cache files, to be increased if the expansion changes
+    CACHE_VERSION: int = 2
+    # Format of dates (e.g. 20261224 or 20261224T100000Z)
+    DATE_REGEX: re.Pattern = re.compile(r"^(\d{4})(\d{2})(\d{2})(?:T(\d{6})Z?)?$")
+    # Format of durations in days or weeks (e.g. P3D or P1W)
+    DURATION_REGEX: re.Pattern = re.compile(r"^\+?P(?:(\d+)W)?(?:(\d+)D)?(?:T.*)?$")
+    # Format of week days in recurrence rules, with optional ordinal (e.g. MO, 1MO or -1SU)
+    BY_DAY_REGEX: re.Pattern = re.compile(r"^([+-]?\d{1,2})?(MO|TU|WE|TH|FR|SA|SU)$")
+    WEEK_DAYS: Tuple[str, ...] = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+    # Supported recurrence frequencies
+    FREQS: Tuple[str, ...] = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+    # Recurrence rule parts that don't change the days of the occurrences
+    IGNORED_RRULE_PARTS: Tuple[str, ...] = ("WKST", "BYHOUR", "BYMINUTE", "BYSECOND")
+    # Maximum number of recurrence periods expanded for an event in a year
+    MAX_PERIODS: int = 100000
+
+
+class IcsEvent:
+    """
+    Event of an iCalendar file, with its recurrence rule (if any).
+    Recurrences with FREQ=DAILY/WEEKLY/MONTHLY/YEARLY and the INTERVAL, COUNT, UNTIL, BYMONTH, BYMONTHDAY and BYDAY
+    parts are supported, together with RDATE and EXDATE. Only dates are considered, times are ignored.
+    """
+
+    begin: date
+    by_day: List[Tuple[Optional[int], int]]
+    by_month: List[int]
+    by_month_day: List[int]
+    count: Optional[int]
+    days_num: int
+    exdates: Set[date]
+    freq: Optional[str]
+    interval: int
+    rdates: List[date]
+    until: Optional[date]
+
+    def __init__(
+        self,
+        props: Dict[str, List[Tuple[str, str]]]
+    ) -> None:
+        """
+        Build the event from its properties.
+
+        Args:
+            props: The event properties, as list of parameters and value for each name.
+
+        Raises:
+            ValueError: If the event is not valid.
+        """
+        if "DTSTART" not in props:
+            raise ValueError("event without DTSTART")
+
+        self.begin, _ = self.__ParseDate(props["DTSTART"][0][1])
+        self.days_num = self.__ParseDaysNum(props)
+        self.exdates = {day for _, value in props.get("EXDATE", []) for day in self.__ParseDates(value)}
+        self.rdates = [day for _, value in props.get("RDATE", []) for day in self.__ParseDates(value)]
+        self.freq = None
+        self.interval = 1
+        self.count = None
+        self.until = None
+        self.by_month = []
+        self.by_month_day = []
+        self.by_day = []
+        if "RRULE" in props:
+            self.__ParseRecurrence(props["RRULE"][0][1])
+
+    def Occurrences(
+        self,
+        year: int
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        Get the occurrences of the event that include days of a year.
+
+        Args:
+            year: The year.
+
+        Returns:
+            Iterator over the occurrences, as ordinals of the first day and of the day after the last one.
+        """
+        first_day = date(year, 1, 1) - timedelta(days=self.days_num - 1)
+        last_day = date(year, 12, 31)
+
+        begins = set(self.__RecurrenceBegins(first_day, last_day))
+        begins.update(day for day in [self.begin] + self.rdates if first_day <= day <= last_day)
+        for begin in sorted(begins - self.exdates):
+            yield begin.toordinal(), begin.toordinal() + self.days_num
+
+    def __RecurrenceBegins(
+        self,
+        first_day: date,
+        last_day: date
+    ) -> Iterator[date]:
+        """
+        Get the first days of the occurrences generated by the recurrence rule in a range.
+
+        Args:
+            first_day: The first day of the range.
+            last_day: The last day of the range.
+
+        Returns:
+            Iterator over the first days of the occurrences.
+        """
+        if self.freq is None:
+            return
+
+        period, occurrences_num = self.__FirstPeriod(first_day)
+        for _ in range(IcsCalendarConst.MAX_PERIODS):
+            days = self.__PeriodDays(period)
+            if days is None:
+                return
+            for day in days:
+                if day < self.begin:
+                    continue
+                if day > last_day or (self.until is not None and day > self.until):
+                    return
+                occurrences_num += 1
+                if self.count is not None and occurrences_num > self.count:
+                    return
+                if day >= first_day:
+                    yield day
+            period += self.interval
+
+    def __FirstPeriod(
+        self,
+        first_day: date
+    ) -> Tuple[int, int]:
+        """
+        Get the first period to be expanded for a range and the number of occurrences before it.
+
+        Args:
+            first_day: The first day of the range.
+
+        Returns:
+            The period index and the number of occurrences before it.
+        """
+        if self.count is None:
+            # Periods before the range can be skipped, since they don't need to be counted
+            return max(0, self.__PeriodsUntil(first_day) // self.interval - 1) * self.interval, 0
+        # The event begin is always the first occurrence, even if not generated by the rule (RFC 5545)
+        return 0, 0 if self.begin in (self.__PeriodDays(0) or []) else 1
+
+    def __PeriodsUntil(
+        self,
+        day: date
+    ) -> int:
+        """
+        Get the number of periods between the event begin and a day.
+
+        Args:
+            day: The day.
+
+        Returns:
+            The number of periods.
+        """
+        if self.freq == "YEARLY":
+            return day.year - self.begin.year
+        if self.freq == "MONTHLY":
+            return (day.year - self.begin.year) * 12 + day.month - self.begin.month
+        if self.freq == "WEEKLY":
+            return (day.toordinal() - day.weekday() - self.begin.toordinal() + self.begin.weekday()) // 7
+        return day.toordinal() - self.begin.toordinal()
+
+    def __PeriodDays(
+        self,
+        period: int
+    ) -> Optional[List[date]]:
+        """
+        Get the days generated by the recurrence rule in a period.
+
+        Args:
+            period: The period index (0 for the period of the event begin).
+
+        Returns:
+            The sorted days, None if the period is out of the supported dates.
+        """
+        try:
+            if self.freq == "DAILY":
+                day = self.begin + timedelta(days=period)
+                return [day] if self.__MatchesDay(day) else []
+            if self.freq == "WEEKLY":
+                week_begin = self.begin + timedelta(days=7 * period - self.begin.weekday())
+                week_days = {week_day for _, week_day in self.by_day} or {self.begin.weekday()}
+                days = [week_begin + timedelta(days=week_day) for week_day in sorted(week_days)]
+                return [day for day in days if len(self.by_month) == 0 or day.month in self.by_month]
+            if self.freq == "MONTHLY":
+                year, month = divmod(self.begin.year * 12 + self.begin.month - 1 + period, 12)
+                if len(self.by_month) > 0 and month + 1 not in self.by_month:
+                    return []
+                return self.__MonthDays(year, month + 1)
+
+            year = self.begin.year + period
+            if len(self.by_day) > 0 and len(self.by_month) == 0 and len(self.by_month_day) == 0:
+                # Week day ordinals are relative to the year
+                return self.__WeekDays(date(year, 1, 1), date(year + 1, 1, 1))
+            if len(self.by_month) > 0:
+                months: Iterable[int] = sorted(self.by_month)
+            elif len(self.by_month_day) > 0 or len(self.by_day) > 0:
+                months = range(1, 13)
+            else:
+                months = [self.begin.month]
+            return [day for month in months for day in self.__MonthDays(year, month)]
+        except (OverflowError, ValueError):
+            return None
+
+    def __MonthDays(
+        self,
+        year: int,
+        month: int
+    ) -> List[date]:
+        """
+        Get the days generated by the recurrence rule in a month.
+
+        Args:
+            year: The year.
+            month: The month.
+
+        Returns:
+            The sorted days.
+        """
+        month_len = calendar.monthrange(year, month)[1]
+        if len(self.by_day) > 0:
+            # Week day ordinals are relative to the month
+            days = self.__WeekDays(date(year, month, 1), date(year, month, month_len) + timedelta(days=1))
+            return [day for day in days if self.__MatchesMonthDay(day, month_len)]
+        month_days = self.by_month_day if len(self.by_month_day) > 0 else [self.begin.day]
+        return sorted({
+            date(year, month, month_day if month_day > 0 else month_len + 1 + month_day)
+            for month_day in month_days
+            if 1 <= (month_day if month_day > 0 else month_len + 1 + month_day) <= month_len
+        })
+
+    def __WeekDays(
+        self,
+        first_day: date,
+        end_day: date
+    ) -> List[date]:
+        """
+        Get the days of a range matching the BYDAY part.
+
+        Args:
+            first_day: The first day of the range.
+            end_day: The day after the last one of the range.
+
+        Returns:
+            The sorted days.
+        """
+        days = set()
+        for ordinal, week_day in self.by_day:
+            week_days = [
+                date.fromordinal(day)
+                for day in range(first_day.toordinal() + (week_day - first_day.weekday()) % 7, end_day.toordinal(), 7)
+            ]
+            if ordinal is None:
+                days.update(week_days)
+            elif -len(week_days) <= ordinal <= len(week_days) and ordinal != 0:
+                days.add(week_days[ordinal - 1 if ordinal > 0 else ordinal])
+        return sorted(days)
+
+    def __MatchesDay(
+        self,
+        day: date
+    ) -> bool:
+        """
+        Check if a day matches the BYMONTH, BYMONTHDAY and BYDAY parts.
+
+        Args:
+            day: The day.
+
+        Returns:
+            True if the day matches, False otherwise.
+        """
+        return ((len(self.by_month) == 0 or day.month in self.by_month) and
+                self.__MatchesMonthDay(day, calendar.monthrange(day.year, day.month)[1]) and
+                (len(self.by_day) == 0 or any(week_day == day.weekday() for _, week_day in self.by_day)))
+
+    def __MatchesMonthDay(
+        self,
+        day: date,
+        month_len: int
+    ) -> bool:
+        """
+        Check if a day matches the BYMONTHDAY part.
+
+        Args:
+            day: The day.
+            month_len: The number of days of the month.
+
+        Returns:
+            True if the day matches, False otherwise.
+        """
+        return len(self.by_month_day) == 0 or any(
+            day.day == (month_day if month_day > 0 else month_len + 1 + month_day)
+            for month_day in self.by_month_day
+        )
+
+    def __ParseRecurrence(
+        self,
+        value: str
+    ) -> None:
+        """
+        Parse a recurrence rule.
+
+        Args:
+            value: The rule (e.g. FREQ=YEARLY;BYMONTH=11;BYDAY=4TH).
+
+        Raises:
+            ValueError: If the rule is not valid or not supported.
+        """
+        parts = dict(part.partition("=")[::2] for part in value.upper().split(";") if part != "")
+        self.freq = parts.pop("FREQ", None)
+        if self.freq not in IcsCalendarConst.FREQS:
+            raise ValueError(f"unsupported recurrence frequency {self.freq}")
+        self.interval = self.__ParseInt(parts.pop("INTERVAL", "1"), 1, 1000)
+        if "COUNT" in parts:
+            self.count = self.__ParseInt(parts.pop("COUNT"), 1, 2**31 - 1)
+        if "UNTIL" in parts:
+            self.until, _ = self.__ParseDate(parts.pop("UNTIL"))
+        self.by_month = [self.__ParseInt(month, 1, 12) for month in parts.pop("BYMONTH", "").split(",") if month != ""]
+        self.by_month_day = [
+            self.__ParseInt(month_day, -31, 31, exclude_zero=True)
+            for month_day in parts.pop("BYMONTHDAY", "").split(",") if month_day != ""
+        ]
+        self.by_day = [self.__ParseWeekDay(week_day) for week_day in parts.pop("BYDAY", "").split(",") if week_day != ""]
+
+        unsupported_parts = set(parts) - set(IcsCalendarConst.IGNORED_RRULE_PARTS)
+        if len(unsupported_parts) > 0:
+            raise ValueError(f"unsupported recurrence rule parts {sorted(unsupported_parts)}")
+
+    def __ParseDaysNum(
+        self,
+        props: Dict[str, List[Tuple[str, str]]]
+    ) -> int:
+        """
+        Parse the number of days of the event, from its end or duration (one day if not specified).
+
+        Args:
+            props: The event properties.
+
+        Returns:
+            The number of days.
+
+        Raises:
+            ValueError: If the end or duration is not valid.
+        """
+        if "DTEND" in props:
+            # The end is exclusive, so an event ending at midnight doesn't include that day
+            end, has_time = self.__ParseDate(props["DTEND"][0][1])
+            return max((end - self.begin).days + (1 if has_time else 0), 1)
+        if "DURATION" in props:
+            match = IcsCalendarConst.DURATION_REGEX.match(props["DURATION"][0][1])
+            if match is None:
+                raise ValueError(f"invalid duration {props['DURATION'][0][1]}")
+            return max(int(match.group(1) or 0) * 7 + int(match.group(2) or 0), 1)
+        return 1
+
+    @staticmethod
+    def __ParseDate(
+        value: str
+    ) -> Tuple[date, bool]:
+        """
+        Parse a date or date-time (the time is only used to know if the day is included).
+
+        Args:
+            value: The value.
+
+        Returns:
+            The date and True if the time is not midnight.
+
+        Raises:
+            ValueError: If the value is not valid.
+        """
+        match = IcsCalendarConst.DATE_REGEX.match(value.strip())
+        if match is None:
+            raise ValueError(f"invalid date {value}")
+        return (date(int(match.group(1)), int(match.group(2)), int(match.group(3))),
+                match.group(4) is not None and match.group(4) != "000000")
+
+    @classmethod
+    def __ParseDates(
+        cls,
+        value: str
+    ) -> List[date]:
+        """
+        Parse a comma-separated list of dates.
+
+        Args:
+            value: The value.
+
+        Returns:
+            The dates.
+
+        Raises:
+            ValueError: If a date is not valid.
+        """
+        return [cls.__ParseDate(elem)[0] for elem in value.split(",") if elem != ""]
+
+    @staticmethod
+    def __ParseInt(
+        value: str,
+        min_val: int,
+        max_val: int,
+        exclude_zero: bool = False
+    ) -> int:
+        """
+        Parse an integer in a range.
+
+        Args:
+            value: The value.
+            min_val: The minimum value.
+            max_val: The maximum value.
+            exclude_zero: True if zero is not valid.
+
+        Returns:
+            The integer.
+
+        Raises:
+            ValueError: If the value is not valid.
+        """
+        int_val = int(value)
+        if not min_val <= int_val <= max_val or (exclude_zero and int_val == 0):
+            raise ValueError(f"invalid recurrence rule value {value}")
+        return int_val
+
+    @classmethod
+    def __ParseWeekDay(
+        cls,
+        value: str
+    ) -> Tuple[Optional[int], int]:
+        """
+        Parse a week day of the BYDAY part.
+
+        Args:
+            value: The value (e.g. MO, 1MO or -1SU).
+
+        Returns:
+            The ordinal (None if not specified) and the week day (0: Monday, ..., 6: Sunday).
+
+        Raises:
+            ValueError: If the value is not valid.
+        """
+        match = IcsCalendarConst.BY_DAY_REGEX.match(value)
+        if match is None:
+            raise ValueError(f"invalid recurrence week day {value}")
+        ordinal = cls.__ParseInt(match.group(1), -53, 53, exclude_zero=True) if match.group(1) is not None else None
+        return ordinal, IcsCalendarConst.WEEK_DAYS.index(match.group(2))
+
+
+class IcsCalendar:
+    """
+    Events of an iCalendar (.ics) file, expanded year by year.
+    Expanded years are saved to a cache file named after the hash of the file content, so that unchanged files
+    are parsed only the first time, also across restarts. Calendars are shared (e.g. between chats) until their
+    file changes.
+    """
+
+    cache_file_name: Optional[str]
+    content: str
+    events: Optional[List[IcsEvent]]
+    file_hash: str
+    file_name: str
+    years: Dict[int, List[Tuple[int, int]]]
+
+    # Last opened calendar of each file, keyed by absolute path.
+    # Calendars are opened and expanded both in the event loop (years expanded on request) and in the worker thread
+    # where the policies are built when the configuration is reloaded (see VacationNight.ReloadConfig), so they are
+    # protected by a lock.
+    calendars: Dict[str, "IcsCalendar"] = {}
+    lock: threading.Lock = threading.Lock()
+
+    def __init__(
+        self,
+        file_name: str,
+        content: bytes,
+        cache_dir: Optional[str]
+    ) -> None:
+        """
+        Initialize the calendar, loading the cached years.
+
+        Args:
+            file_name: The file name.
+            content: The file content.
+            cache_dir: The directory of the cache files (if None, expanded years are not cached).
+        """
+        self.file_name = file_name
+        self.file_hash = hashlib.sha256(content).hexdigest()
+        self.content = content.decode("utf-8", errors="replace")
+        self.events = None
+        self.cache_file_name = os.path.join(cache_dir, f"{self.file_hash}.json") if cache_dir is not None else None
+        self.years = self.__LoadCache()
+
+    @classmethod
+    def Open(
+        cls,
+        file_name: str,
+        cache_dir: Optional[str]
+    ) -> "IcsCalendar":
+        """
+        Open a calendar file, reusing the already opened calendar if the file didn't change.
+        Only the last opened calendar of each file is kept.
+
+        Args:
+            file_name: The file name.
+            cache_dir: The directory of the cache files (if None, expanded years are not cached).
+
+        Returns:
+            The calendar.
+
+        Raises:
+            ValueError: If the file cannot be read.
+        """
+        try:
+            with open(file_name, "rb") as fin:
+                content = fin.read()
+        except OSError as ex:
+            raise ValueError(f"cannot read {file_name}: {ex}") from ex
+
+        file_path = os.path.abspath(file_name)
+        with cls.lock:
+            ics_calendar = cls.calendars.get(file_path)
+            if ics_calendar is None or ics_calendar.file_hash != hashlib.sha256(content).hexdigest():
+                ics_calendar = cls(file_name, content, cache_dir)
+                cls.calendars[file_path] = ics_calendar
+            return ics_calendar
+
+    def Events(
+        self,
+        year: int
+    ) -> List[Tuple[int, int]]:
+        """
+        Get the events that include days of a year, expanding the year if not already done.
+
+        Args:
+            year: The year.
+
+        Returns:
+            The events, as ordinals of the first day and of the day after the last one.
+
+        Raises:
+            ValueError: If the file is not valid.
+        """
+        events = self.years.get(year)
+        if events is None:
+            self.Expand([year])
+            events = self.years[year]
+        return events
+
+    def Expand(
+        self,
+        years: Iterable[int]
+    ) -> None:
+        """
+        Expand the events in the specified years, if not already done, and save them to the cache.
+
+        Args:
+            years: The years.
+
+        Raises:
+            ValueError: If the file is not valid.
+        """
+        with self.lock:
+            missing_years = [year for year in years if year not in self.years]
+            if len(missing_years) == 0:
+                return
+
+            events = self.__Events()
+            for year in missing_years:
+                self.years[year] = sorted(occurrence for event in events for occurrence in event.Occurrences(year))
+            logging.info(f"Calendar {self.file_name} expanded for years {missing_years}")
+            self.__SaveCache()
+
+    def __Events(self) -> List[IcsEvent]:
+        """
+        Get the events of the file, parsing it the first time.
+
+        Returns:
+            The events.
+
+        Raises:
+            ValueError: If the file is not valid.
+        """
+        if self.events is None:
+            try:
+                self.events = self.__ParseEvents(self.content)
+            except ValueError as ex:
+                raise ValueError(f"{self.file_name}: {ex}") from ex
+        return self.events
+
+    @staticmethod
+    def __ParseEvents(
+        content: str
+    ) -> List[IcsEvent]:
+        """
+        Parse the events of an iCalendar file.
+
+        Args:
+            content: The file content.
+
+        Returns:
+            The events.
+
+        Raises:
+            ValueError: If the content is not valid.
+        """
+        events = []
+        props: Optional[Dict[str, List[Tuple[str, str]]]] = None
+        # Long lines are folded by starting the following ones with a space or tab
+        for line in re.sub(r"\r?\n[ \t]", "", content).splitlines():
+            name_params, _, value = line.partition(":")
+            name, _, params = name_params.partition(";")
+            name = name.upper()
+            if name == "BEGIN" and value.upper() == "VEVENT":
+                props = {}
+            elif name == "END" and value.upper() == "VEVENT" and props is not None:
+                events.append(IcsEvent(props))
+                props = None
+            elif props is not None:
+                props.setdefault(name, []).append((params, value.strip()))
+        return events
+
+    def __LoadCache(self) -> Dict[int, List[Tuple[int, int]]]:
+        """
+        Load the expanded years from the cache file.
+
+        Returns:
+            The expanded years, empty if the cache file doesn't exist or it's not valid.
+        """
+        if self.cache_file_name is None or not os.path.isfile(self.cache_file_name):
+            return {}
+        try:
+            with open(self.cache_file_name, encoding="utf-8") as fin:
+                cache = json.load(fin)
+            if cache["version"] != IcsCalendarConst.CACHE_VERSION:
+                return {}
+            return {
+                int(year): [(int(begin), int(end)) for begin, end in events]
+                for year, events in cache["years"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError) as ex:
+            logging.warning(f"Invalid calendar cache file {self.cache_file_name}, ignored: {ex}")
+            return {}
+
+    def __SaveCache(self) -> None:
+        """Save the expanded years to the cache file (errors are only logged, since the cache is not mandatory)."""
+        if self.cache_file_name is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_file_name) or ".", exist_ok=True)
+            tmp_file_name = f"{self.cache_file_name}.tmp"
+            with open(tmp_file_name, "w", encoding="utf-8") as fout:
+                json.dump({"version": IcsCalendarConst.CACHE_VERSION, "years": self.years}, fout)
+            os.replace(tmp_file_name, self.cache_file_name)
+        except OSError as ex:
+            logging.warning(f"Unable to write calendar cache file {self.cache_file_name}: {ex}")
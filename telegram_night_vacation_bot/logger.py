@@ -18,25 +18,96 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import atexit
 import logging
+import logging.handlers
+import queue
+from typing import List, Optional
 
 from telegram_night_vacation_bot.bot_config import BotConfig
 
 
+class LoggerConst:
+    """Constants for logger."""
+
+    LOG_FORMAT: str = "%(asctime)-15s %(levelname)s - %(message)s"
+
+
 class Logger:
     """Logger configuration utility for the bot."""
 
+    # Handlers installed by Init, removed when initialized again or stopped
+    handlers: List[logging.Handler] = []
+    is_stop_registered: bool = False
+    listener: Optional[logging.handlers.QueueListener] = None
+
     @staticmethod
     def Init() -> None:
-        """Initialize the logging system based on bot configuration."""
+        """
+        Initialize the logging system based on bot configuration.
+        If LOG_ASYNC is True, records are only put in a queue by the caller and written by a background thread,
+        so that a slow console or disk doesn't block the event loop.
+        If called again, the handlers installed by the previous call are replaced.
+        """
+        Logger.Stop()
+        handler = Logger.__CreateHandler()
+        handler.setFormatter(logging.Formatter(LoggerConst.LOG_FORMAT))
+
+        root_logger = logging.getLogger()
+        root_logger.setLevel(BotConfig.LOG_LEVEL)
+        if BotConfig.LOG_ASYNC:
+            log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+            queue_handler = logging.handlers.QueueHandler(log_queue)
+            root_logger.addHandler(queue_handler)
+            Logger.listener = logging.handlers.QueueListener(log_queue, handler)
+            Logger.listener.start()
+            Logger.handlers = [queue_handler, handler]
+        else:
+            root_logger.addHandler(handler)
+            Logger.handlers = [handler]
+
+        if not Logger.is_stop_registered:
+            atexit.register(Logger.Stop)
+            Logger.is_stop_registered = True
+
+    @staticmethod
+    def Stop() -> None:
+        """
+        Write the queued records and stop the background thread (only if LOG_ASYNC is True),
+        then remove and close the handlers installed by Init.
+        """
+        if Logger.listener is not None:
+            Logger.listener.stop()
+            Logger.listener = None
+
+        root_logger = logging.getLogger()
+        for handler in Logger.handlers:
+            root_logger.removeHandler(handler)
+            handler.close()
+        Logger.handlers = []
+
+    @staticmethod
+    def __CreateHandler() -> logging.Handler:
+        """
+        Create the handler writing the records, rotating the log file if configured.
+
+        Returns:
+            The handler.
+        """
         if not BotConfig.LOG_USE_FILE:
-            logging.basicConfig(
-                level=BotConfig.LOG_LEVEL,
-                format="%(asctime)-15s %(levelname)s - %(message)s"
+            return logging.StreamHandler()
+        if BotConfig.LOG_FILE_ROTATE_WHEN is not None:
+            return logging.handlers.TimedRotatingFileHandler(
+                BotConfig.LOG_FILE_NAME,
+                when=BotConfig.LOG_FILE_ROTATE_WHEN,
+                backupCount=BotConfig.LOG_FILE_BACKUP_COUNT,
+                encoding="utf-8"
             )
-        else:
-            logging.basicConfig(
-                level=BotConfig.LOG_LEVEL,
-                filename=BotConfig.LOG_FILE_NAME,
-                format="%(asctime)-15s %(levelname)s - %(message)s"
+        if BotConfig.LOG_FILE_MAX_BYTES > 0:
+            return logging.handlers.RotatingFileHandler(
+                BotConfig.LOG_FILE_NAME,
+                maxBytes=BotConfig.LOG_FILE_MAX_BYTES,
+                backupCount=BotConfig.LOG_FILE_BACKUP_COUNT,
+                encoding="utf-8"
             )
+        return logging.FileHandler(BotConfig.LOG_FILE_NAME, encoding="utf-8")
@@ -0,0 +1,124 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+from telegram_night_vacation_bot.metrics import BotMetrics, Counter
+
+
+# Generic types for keys and values
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LruCache(Generic[K, V]):
+    """Bounded cache that evicts the least recently used entries, counting hits and misses."""
+
+    entries: "OrderedDict[K, V]"
+    hits_counter: Counter
+    hits_num: int
+    max_size: int
+    misses_counter: Counter
+    misses_num: int
+    name: str
+
+    def __init__(
+        self,
+        name: str,
+        max_size: int
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            name: Cache name (for metrics).
+            max_size: Maximum number of entries.
+        """
+        self.entries = OrderedDict()
+        self.hits_counter = BotMetrics.CACHE_HITS.Labels(name)
+        self.hits_num = 0
+        self.max_size = max_size
+        self.misses_counter = BotMetrics.CACHE_MISSES.Labels(name)
+        self.misses_num = 0
+        self.name = name
+
+    def Get(
+        self,
+        key: K
+    ) -> Optional[V]:
+        """
+        Get the value of a key, marking it as the most recently used.
+
+        Args:
+            key: The key.
+
+        Returns:
+            The value, None if not present (a stored None value is a hit).
+        """
+        if key not in self.entries:
+            self.misses_num += 1
+            self.misses_counter.Inc()
+            return None
+        self.entries.move_to_end(key)
+        self.hits_num += 1
+        self.hits_counter.Inc()
+        return self.entries[key]
+
+    def Set(
+        self,
+        key: K,
+        value: V
+    ) -> None:
+        """
+        Set the value of a key, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key: The key.
+            value: The value.
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def Clear(self) -> None:
+        """Remove all the entries (e.g. when the data they are computed from changes)."""
+        self.entries.clear()
+
+    def Size(self) -> int:
+        """
+        Get the number of entries.
+
+        Returns:
+            int: The number of entries.
+        """
+        return len(self.entries)
+
+    def HitRate(self) -> float:
+        """
+        Get the ratio of lookups that found the key.
+
+        Returns:
+            float: The hit rate, between 0 and 1.
+        """
+        lookups_num = self.hits_num + self.misses_num
+        return self.hits_num / lookups_num if lookups_num > 0 else 0.0
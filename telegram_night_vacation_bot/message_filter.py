@@ -0,0 +1,195 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+
+from typing import Dict, FrozenSet
+
+import pyrogram
+from pyrogram.enums import ChatType
+from pyrogram.filters import Filter
+
+from telegram_night_vacation_bot.metrics import BotMetrics
+from telegram_night_vacation_bot.night_vacation_policy import NightVacationPolicy
+from telegram_night_vacation_bot.telegram_client import TelegramClient
+
+
+class MessageFilterConst:
+    """Constants for the message filter."""
+
+    GROUP_CHAT_TYPES: FrozenSet[ChatType] = frozenset({ChatType.GROUP, ChatType.SUPERGROUP})
+
+
+class MessageFilter(Filter):
+    """
+    Pyrogram filter of the group messages to be handled, compiled from the policies of the managed chats.
+    Messages of other chats, messages sent to open topics and all messages when dropping are rejected before
+    the handler is scheduled. The ID of the first message received since the last reset and of the last message
+    of each managed chat are tracked by the filter returned by Tracker (see VacationNight).
+    Being a coroutine, it's called directly by pyrogram instead of being run in the thread pool executor.
+    """
+
+    drop_all: bool
+    first_msg_ids: Dict[int, int]
+    last_msg_ids: Dict[int, int]
+    pass_all: bool
+    policies: Dict[int, NightVacationPolicy]
+
+    def __init__(
+        self,
+        last_msg_ids: Dict[int, int],
+        pass_all: bool = False
+    ) -> None:
+        """
+        Initialize the filter.
+
+        Args:
+            last_msg_ids: Dictionary where the ID of the last message of each managed chat is tracked.
+            pass_all: True to pass all group messages when not dropping (e.g. to log them in test mode).
+        """
+        self.drop_all = True
+        self.first_msg_ids = {}
+        self.last_msg_ids = last_msg_ids
+        self.pass_all = pass_all
+        self.policies = {}
+
+    def Compile(
+        self,
+        policies: Dict[int, NightVacationPolicy]
+    ) -> None:
+        """
+        Compile the filter from the policies of the managed chats.
+
+        Args:
+            policies: The policies keyed by chat ID.
+        """
+        self.policies = dict(policies)
+
+    def SetDropAll(
+        self,
+        drop_all: bool
+    ) -> None:
+        """
+        Set if all messages shall be rejected (e.g. when the bot is stopped).
+
+        Args:
+            drop_all: True to reject all messages, False to filter them.
+        """
+        self.drop_all = drop_all
+
+    def Tracker(self) -> "MessageTracker":
+        """
+        Get the filter tracking the messages, to be checked before any other handler filter.
+
+        Returns:
+            The tracker filter.
+        """
+        return MessageTracker(self)
+
+    def Track(
+        self,
+        message: pyrogram.types.Message
+    ) -> None:
+        """
+        Track the ID of a message, if it belongs to a managed chat and messages are not dropped.
+
+        Args:
+            message: The message.
+        """
+        if self.drop_all:
+            return
+        chat = message.chat
+        if chat is None or chat.id not in self.policies or chat.type not in MessageFilterConst.GROUP_CHAT_TYPES:
+            return
+
+        self.first_msg_ids.setdefault(chat.id, message.id)
+        if message.id > self.last_msg_ids.get(chat.id, 0):
+            self.last_msg_ids[chat.id] = message.id
+
+    def ResetFirstMessageIds(self) -> None:
+        """Reset the ID of the first message received in each managed chat, tracking it again from the next one."""
+        self.first_msg_ids.clear()
+
+    async def __call__(
+        self,
+        client: pyrogram.Client,
+        message: pyrogram.types.Message
+    ) -> bool:
+        """
+        Check if a message shall be handled.
+
+        Args:
+            client: The Pyrogram client instance.
+            message: The message.
+
+        Returns:
+            True if the message shall be handled, False otherwise.
+        """
+        if self.drop_all:
+            return False
+        chat = message.chat
+        if chat is None or chat.type not in MessageFilterConst.GROUP_CHAT_TYPES:
+            return False
+        policy = self.policies.get(chat.id)
+        if policy is None:
+            return self.pass_all
+
+        BotMetrics.MESSAGES_INSPECTED.Inc()
+        return self.pass_all or policy.ShallMessageBeDeleted(TelegramClient.GetTopicIdFromMessage(message), message.date)
+
+
+class MessageTracker(Filter):
+    """
+    Pyrogram filter tracking the ID of all the messages of the managed chats (see MessageFilter.Track),
+    including the ones consumed by handlers checked before the message filter (e.g. commands).
+    It never rejects messages, so it's combined with the filter of the first handler.
+    """
+
+    message_filter: MessageFilter
+
+    def __init__(
+        self,
+        message_filter: MessageFilter
+    ) -> None:
+        """
+        Initialize the tracker.
+
+        Args:
+            message_filter: The message filter where the message IDs are tracked.
+        """
+        self.message_filter = message_filter
+
+    async def __call__(
+        self,
+        client: pyrogram.Client,
+        message: pyrogram.types.Message
+    ) -> bool:
+        """
+        Track a message.
+
+        Args:
+            client: The Pyrogram client instance.
+            message: The message.
+
+        Returns:
+            Always True.
+        """
+        self.message_filter.Track(message)
+        return True
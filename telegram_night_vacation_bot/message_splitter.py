@@ -0,0 +1,203 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Tuple
+
+
+class MessageSplitterConst:
+    """Constants for message splitter."""
+
+    # Markdown markers of the entities that shall not be split
+    ENTITY_MARKERS: Tuple[str, ...] = ("**", "__")
+    # Separators where the text is split, by priority
+    SEPARATORS: Tuple[str, ...] = ("\n", " ")
+
+
+class MessageSplitter:
+    """
+    Split a long text into parts not exceeding a maximum length.
+    The text is scanned by index, so the time is linear in its length and only the returned parts are copied.
+    Parts are split at the last new line, then at the last space, without breaking markdown entities
+    (e.g. **bold**, __italic__). If an entity is longer than a part, it's closed at the end of the part and
+    reopened at the beginning of the next one.
+    """
+
+    @classmethod
+    def Split(
+        cls,
+        text: str,
+        max_len: int
+    ) -> Iterator[str]:
+        """
+        Split a text.
+
+        Args:
+            text: The text to split.
+            max_len: Maximum length of each part.
+
+        Returns:
+            Iterator over the text parts.
+        """
+        text_len = len(text)
+        start = 0
+        # Entities opened in the previous parts and not closed yet
+        carried_markers: List[str] = []
+
+        while len(carried_markers) * 2 + text_len - start > max_len:
+            prefix = "".join(carried_markers)
+            end = start + max_len - len(prefix)
+            marker_positions = cls.__FindMarkers(text, start, end)
+
+            split_idx = cls.__FindSeparator(text, start, end, carried_markers, marker_positions)
+            if split_idx != -1:
+                yield prefix + text[start:split_idx]
+                start = split_idx + 1
+                carried_markers = []
+                continue
+
+            # No separator outside entities, split at the end of the window
+            # If entities are open, leave room for closing them
+            split_idx = cls.__AvoidMarker(text, end)
+            open_markers = cls.__OpenMarkers(split_idx, carried_markers, marker_positions)
+            if len(open_markers) > 0:
+                split_idx = cls.__AvoidMarker(text, end - sum(map(len, MessageSplitterConst.ENTITY_MARKERS)))
+                open_markers = cls.__OpenMarkers(split_idx, carried_markers, marker_positions)
+            yield prefix + text[start:split_idx] + "".join(reversed(open_markers))
+            start = split_idx
+            carried_markers = open_markers
+
+        if start < text_len:
+            yield "".join(carried_markers) + text[start:]
+
+    @classmethod
+    def __FindSeparator(
+        cls,
+        text: str,
+        start: int,
+        end: int,
+        carried_markers: List[str],
+        marker_positions: Dict[str, List[int]]
+    ) -> int:
+        """
+        Find the last separator in a window of the text that is not inside an entity.
+
+        Args:
+            text: The text.
+            start: Start index of the window.
+            end: End index of the window (excluded).
+            carried_markers: Markers of the entities open at the start of the window.
+            marker_positions: Positions of the markers in the window.
+
+        Returns:
+            The separator index, -1 if not found.
+        """
+        for separator in MessageSplitterConst.SEPARATORS:
+            idx = text.rfind(separator, start, end)
+            while idx > start:
+                open_markers = cls.__OpenMarkers(idx, carried_markers, marker_positions)
+                if len(open_markers) == 0:
+                    return idx
+                # Move before the first open entity, if it was opened in this window
+                first_marker = open_markers[0]
+                if first_marker in carried_markers:
+                    break
+                positions = marker_positions[first_marker]
+                idx = text.rfind(separator, start, positions[bisect_left(positions, idx) - 1])
+        return -1
+
+    @staticmethod
+    def __AvoidMarker(
+        text: str,
+        idx: int
+    ) -> int:
+        """
+        Move a split index back by one if it falls in the middle of a marker.
+
+        Args:
+            text: The text.
+            idx: The split index.
+
+        Returns:
+            The split index.
+        """
+        if text[idx - 1] in "*_" and text[idx - 1] == text[idx]:
+            return idx - 1
+        return idx
+
+    @staticmethod
+    def __FindMarkers(
+        text: str,
+        start: int,
+        end: int
+    ) -> Dict[str, List[int]]:
+        """
+        Find the positions of the entity markers in a window of the text.
+
+        Args:
+            text: The text.
+            start: Start index of the window.
+            end: End index of the window (excluded).
+
+        Returns:
+            Sorted positions of each marker.
+        """
+        marker_positions: Dict[str, List[int]] = {}
+        for marker in MessageSplitterConst.ENTITY_MARKERS:
+            positions = []
+            # Searching a single character is much faster, so skip the search if not present
+            idx = text.find(marker, start, end) if text.find(marker[0], start, end) != -1 else -1
+            while idx != -1:
+                positions.append(idx)
+                idx = text.find(marker, idx + len(marker), end)
+            marker_positions[marker] = positions
+        return marker_positions
+
+    @staticmethod
+    def __OpenMarkers(
+        idx: int,
+        carried_markers: List[str],
+        marker_positions: Dict[str, List[int]]
+    ) -> List[str]:
+        """
+        Get the markers of the entities open at the specified index.
+
+        Args:
+            idx: The index.
+            carried_markers: Markers of the entities open at the start of the window.
+            marker_positions: Positions of the markers in the window.
+
+        Returns:
+            The markers, sorted by opening position.
+        """
+        if len(carried_markers) == 0 and not any(marker_positions.values()):
+            return []
+
+        open_markers = []
+        for marker, positions in marker_positions.items():
+            markers_num = bisect_left(positions, idx)
+            is_open = (marker in carried_markers) != (markers_num % 2 == 1)
+            if is_open:
+                # Carried markers are before the window, in the order they were opened
+                open_pos = (positions[markers_num - 1] if markers_num > 0
+                            else carried_markers.index(marker) - len(carried_markers))
+                open_markers.append((open_pos, marker))
+        return [marker for _, marker in sorted(open_markers)]
@@ -0,0 +1,508 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import asyncio
+import logging
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+
+class MetricsConst:
+    """Constants for metrics."""
+
+    # Default buckets of latency histograms, in seconds
+    LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    # Timeout for reading an HTTP request, in seconds
+    HTTP_READ_TIMEOUT_SEC: float = 5.0
+    # Escapes of label values in the Prometheus text format
+    LABEL_VALUE_ESCAPES: Dict[int, str] = str.maketrans({"\\": "\\\\", "\"": "\\\"", "\n": "\\n"})
+
+
+class Counter:
+    """Monotonically increasing counter, optionally with labels."""
+
+    children: Dict[Tuple[str, ...], "Counter"]
+    help_text: str
+    label_names: Tuple[str, ...]
+    name: str
+    value: float
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Tuple[str, ...] = ()
+    ) -> None:
+        """
+        Initialize the counter.
+
+        Args:
+            name: Metric name.
+            help_text: Metric description.
+            label_names: Label names.
+        """
+        self.children = {}
+        self.help_text = help_text
+        self.label_names = label_names
+        self.name = name
+        self.value = 0.0
+
+    def Labels(
+        self,
+        *label_values: str
+    ) -> "Counter":
+        """
+        Get the counter for the specified label values.
+        The returned counter can be stored, so that the hot path doesn't need to look it up.
+
+        Args:
+            *label_values: Label values, in the same order of label names.
+
+        Returns:
+            The counter.
+        """
+        child = self.children.get(label_values)
+        if child is None:
+            child = Counter(self.name, self.help_text)
+            self.children[label_values] = child
+        return child
+
+    def Inc(
+        self,
+        value: float = 1.0
+    ) -> None:
+        """
+        Increment the counter.
+
+        Args:
+            value: Increment value.
+        """
+        self.value += value
+
+    def Render(self) -> List[str]:
+        """
+        Render the counter in Prometheus text format.
+
+        Returns:
+            List of lines.
+        """
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        if len(self.label_names) == 0:
+            lines.append(f"{self.name} {self.value}")
+        for label_values, child in self.children.items():
+            lines.append(f"{self.name}{{{_FormatLabels(self.label_names, label_values)}}} {child.value}")
+        return lines
+
+
+class Gauge:
+    """Gauge, i.e. a value that can go up and down, optionally computed by a function when rendered."""
+
+    help_text: str
+    name: str
+    value: float
+    value_fct: Optional[Callable[[], Union[int, float]]]
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str
+    ) -> None:
+        """
+        Initialize the gauge.
+
+        Args:
+            name: Metric name.
+            help_text: Metric description.
+        """
+        self.help_text = help_text
+        self.name = name
+        self.value = 0.0
+        self.value_fct = None
+
+    def Set(
+        self,
+        value: float
+    ) -> None:
+        """
+        Set the gauge value.
+
+        Args:
+            value: The value.
+        """
+        self.value = value
+
+    def SetFunction(
+        self,
+        value_fct: Callable[[], Union[int, float]]
+    ) -> None:
+        """
+        Set a function computing the gauge value when rendered.
+
+        Args:
+            value_fct: The function.
+        """
+        self.value_fct = value_fct
+
+    def Render(self) -> List[str]:
+        """
+        Render the gauge in Prometheus text format.
+
+        Returns:
+            List of lines.
+        """
+        value = self.value_fct() if self.value_fct is not None else self.value
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge", f"{self.name} {value}"]
+
+
+class Histogram:
+    """Histogram with fixed buckets, optionally with labels."""
+
+    bucket_counts: List[int]
+    buckets: Tuple[float, ...]
+    children: Dict[Tuple[str, ...], "Histogram"]
+    count: int
+    help_text: str
+    label_names: Tuple[str, ...]
+    name: str
+    sum: float
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = MetricsConst.LATENCY_BUCKETS
+    ) -> None:
+        """
+        Initialize the histogram.
+
+        Args:
+            name: Metric name.
+            help_text: Metric description.
+            label_names: Label names.
+            buckets: Upper bounds of the buckets, sorted.
+        """
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.buckets = buckets
+        self.children = {}
+        self.count = 0
+        self.help_text = help_text
+        self.label_names = label_names
+        self.name = name
+        self.sum = 0.0
+
+    def Labels(
+        self,
+        *label_values: str
+    ) -> "Histogram":
+        """
+        Get the histogram for the specified label values.
+        The returned histogram can be stored, so that the hot path doesn't need to look it up.
+
+        Args:
+            *label_values: Label values, in the same order of label names.
+
+        Returns:
+            The histogram.
+        """
+        child = self.children.get(label_values)
+        if child is None:
+            child = Histogram(self.name, self.help_text, buckets=self.buckets)
+            self.children[label_values] = child
+        return child
+
+    def Observe(
+        self,
+        value: float
+    ) -> None:
+        """
+        Observe a value.
+
+        Args:
+            value: The value.
+        """
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def Render(self) -> List[str]:
+        """
+        Render the histogram in Prometheus text format.
+
+        Returns:
+            List of lines.
+        """
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        if len(self.label_names) == 0:
+            lines.extend(self.__RenderSamples(""))
+        for label_values, child in self.children.items():
+            lines.extend(child.__RenderSamples(_FormatLabels(self.label_names, label_values)))
+        return lines
+
+    def __RenderSamples(
+        self,
+        labels: str
+    ) -> List[str]:
+        """
+        Render the samples of the histogram.
+
+        Args:
+            labels: Formatted labels.
+
+        Returns:
+            List of lines.
+        """
+        lines = []
+        labels_prefix = f"{labels}," if labels != "" else ""
+        cumulative_count = 0
+        for bucket, bucket_count in zip(self.buckets + (float("inf"),), self.bucket_counts):
+            cumulative_count += bucket_count
+            le = "+Inf" if bucket == float("inf") else str(bucket)
+            lines.append(f"{self.name}_bucket{{{labels_prefix}le=\"{le}\"}} {cumulative_count}")
+        labels_suffix = f"{{{labels}}}" if labels != "" else ""
+        lines.append(f"{self.name}_sum{labels_suffix} {self.sum}")
+        lines.append(f"{self.name}_count{labels_suffix} {self.count}")
+        return lines
+
+
+def _FormatLabels(
+    label_names: Tuple[str, ...],
+    label_values: Tuple[str, ...]
+) -> str:
+    """
+    Format labels in Prometheus text format.
+    Backslashes, double quotes and new lines in label values are escaped, as required by the format.
+
+    Args:
+        label_names: Label names.
+        label_values: Label values.
+
+    Returns:
+        The formatted labels.
+    """
+    return ",".join(
+        f"{name}=\"{value.translate(MetricsConst.LABEL_VALUE_ESCAPES)}\""
+        for name, value in zip(label_names, label_values)
+    )
+
+
+class MetricsRegistry:
+    """Registry of metrics."""
+
+    metrics: List[Union[Counter, Gauge, Histogram]]
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self.metrics = []
+
+    def Register(
+        self,
+        metric: Union[Counter, Gauge, Histogram]
+    ) -> None:
+        """
+        Register a metric.
+
+        Args:
+            metric: The metric.
+        """
+        self.metrics.append(metric)
+
+    def Render(self) -> str:
+        """
+        Render all the metrics in Prometheus text format.
+
+        Returns:
+            The rendered metrics.
+        """
+        return "\n".join(line for metric in self.metrics for line in metric.Render()) + "\n"
+
+
+class BotMetrics:
+    """Metrics of the bot."""
+
+    REGISTRY: MetricsRegistry = MetricsRegistry()
+
+    MESSAGES_INSPECTED: Counter = Counter(
+        "nvbot_messages_inspected_total",
+        "Group messages inspected"
+    )
+    MESSAGES_DELETED: Counter = Counter(
+        "nvbot_messages_deleted_total",
+        "Group messages deleted because of night/vacation mode"
+    )
+    MESSAGES_SKIPPED: Counter = Counter(
+        "nvbot_messages_skipped_total",
+        "Group messages in closed topics not deleted, by reason",
+        ("reason",)
+    )
+    API_CALL_LATENCY: Histogram = Histogram(
+        "nvbot_api_call_duration_seconds",
+        "Latency of Telegram API calls, by method",
+        ("method",)
+    )
+    API_CALL_ERRORS: Counter = Counter(
+        "nvbot_api_call_errors_total",
+        "Failed Telegram API calls, by method",
+        ("method",)
+    )
+    API_CALL_WAIT: Histogram = Histogram(
+        "nvbot_api_call_wait_seconds",
+        "Time Telegram API calls waited for rate limits and flood waits, by method",
+        ("method",),
+        (0.0, 0.1, 0.5, 1.0, 3.0, 10.0, 30.0, 60.0, 300.0)
+    )
+    API_CALL_FLOOD_WAITS: Counter = Counter(
+        "nvbot_api_call_flood_waits_total",
+        "Flood waits received from Telegram, by method",
+        ("method",)
+    )
+    DELETION_QUEUE_DEPTH: Gauge = Gauge(
+        "nvbot_deletion_queue_depth",
+        "Messages waiting to be deleted"
+    )
+    DELETION_QUEUE_FLUSH_LATENCY: Histogram = Histogram(
+        "nvbot_deletion_queue_flush_latency_seconds",
+        "Time between a message is queued for deletion and its deletion"
+    )
+    CACHE_HITS: Counter = Counter(
+        "nvbot_cache_hits_total",
+        "Cache lookups that found the key, by cache",
+        ("cache",)
+    )
+    CACHE_MISSES: Counter = Counter(
+        "nvbot_cache_misses_total",
+        "Cache lookups that didn't find the key, by cache",
+        ("cache",)
+    )
+    JOB_RUNS: Counter = Counter(
+        "nvbot_job_runs_total",
+        "Scheduler job runs, by job",
+        ("job",)
+    )
+    JOB_DURATION: Histogram = Histogram(
+        "nvbot_job_duration_seconds",
+        "Duration of scheduler jobs, by job",
+        ("job",)
+    )
+    COMMAND_DURATION: Histogram = Histogram(
+        "nvbot_command_duration_seconds",
+        "Duration of commands (including the replies), by command",
+        ("command",)
+    )
+    COMMANDS_DROPPED: Counter = Counter(
+        "nvbot_commands_dropped_total",
+        "Commands dropped without reply, by reason",
+        ("reason",)
+    )
+
+    # Labeled metrics of the hot paths, looked up once
+    MESSAGES_SKIPPED_ANONYMOUS: Counter = MESSAGES_SKIPPED.Labels("anonymous")
+    MESSAGES_SKIPPED_BOT: Counter = MESSAGES_SKIPPED.Labels("bot")
+    MESSAGES_SKIPPED_EXCLUDED: Counter = MESSAGES_SKIPPED.Labels("excluded")
+    COMMANDS_DROPPED_RATE_LIMITED: Counter = COMMANDS_DROPPED.Labels("rate_limited")
+    COMMANDS_DROPPED_UNAUTHORIZED: Counter = COMMANDS_DROPPED.Labels("unauthorized")
+
+    for _metric in (MESSAGES_INSPECTED, MESSAGES_DELETED, MESSAGES_SKIPPED, API_CALL_LATENCY, API_CALL_ERRORS,
+                    API_CALL_WAIT, API_CALL_FLOOD_WAITS, DELETION_QUEUE_DEPTH, DELETION_QUEUE_FLUSH_LATENCY,
+                    CACHE_HITS, CACHE_MISSES, JOB_RUNS, JOB_DURATION, COMMAND_DURATION,
+                    COMMANDS_DROPPED):
+        REGISTRY.Register(_metric)
+    del _metric
+
+
+class MetricsServer:
+    """Lightweight HTTP server exposing the metrics (asyncio based, no threads)."""
+
+    host: str
+    port: int
+    registry: MetricsRegistry
+    server: Optional[asyncio.AbstractServer]
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        registry: MetricsRegistry
+    ) -> None:
+        """
+        Initialize the server.
+
+        Args:
+            host: Host address to listen to.
+            port: Port to listen to.
+            registry: The metrics registry.
+        """
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self.server = None
+
+    async def Start(self) -> None:
+        """Start the server."""
+        self.server = await asyncio.start_server(self.__HandleClient, self.host, self.port)
+        logging.info(f"Metrics available at http://{self.host}:{self.port}/metrics")
+
+    async def Stop(self) -> None:
+        """Stop the server."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def __HandleClient(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Handle an HTTP request, only GET /metrics is supported.
+
+        Args:
+            reader: The stream reader.
+            writer: The stream writer.
+        """
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), MetricsConst.HTTP_READ_TIMEOUT_SEC)
+            # Skip headers
+            while True:
+                header_line = await asyncio.wait_for(reader.readline(), MetricsConst.HTTP_READ_TIMEOUT_SEC)
+                if header_line in (b"\r\n", b"\n", b""):
+                    break
+
+            request = request_line.decode("latin-1").split()
+            if len(request) >= 2 and request[0] == "GET" and request[1].split("?")[0] == "/metrics":
+                status = "200 OK"
+                body = self.registry.Render().encode("utf-8")
+            else:
+                status = "404 Not Found"
+                body = b"Not found\n"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,205 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+
+import bisect
+import re
+from typing import Any, FrozenSet, List, Optional, Tuple
+
+
+class NightScheduleConst:
+    """Constants for night schedules."""
+
+    MINUTES_PER_DAY: int = 24 * 60
+    MINUTES_PER_WEEK: int = 7 * 24 * 60
+    # Format of window times (e.g. 22:30)
+    TIME_REGEX: re.Pattern = re.compile(r"^(\d{1,2}):(\d{2})$")
+
+
+class NightSchedule:
+    """
+    Weekly night schedule, made of windows repeated on some days of the week.
+    The schedule is compiled to a minute-of-week bitmap, so that checking if it's night at a given minute is a
+    single lookup, and to the sorted list of its boundaries, so that the next one is found with a binary search.
+    Windows are specified as dictionaries (e.g. in the configuration):
+        {"begin": "22:00", "end": "08:00"}                          -> Every day from 22:00 to 8:00 of the next day
+        {"begin": "20:00", "end": "23:00", "week_days": [5, 6]}     -> On Saturday and Sunday from 20:00 to 23:00
+        {"begin": "00:00", "end": "00:00", "week_days": [6]}        -> All day on Sunday
+    """
+
+    bitmap: bytearray
+    boundaries: List[int]
+    boundaries_set: FrozenSet[int]
+    key: Tuple[Tuple[int, int, Tuple[int, ...]], ...]
+
+    def __init__(
+        self,
+        windows: List[Tuple[int, int, Tuple[int, ...]]]
+    ) -> None:
+        """
+        Compile the schedule.
+
+        Args:
+            windows: List of windows, as begin minute, end minute (of the day) and week days they begin on
+                     (0: Monday, ..., 6: Sunday). A window ending before its begin ends on the next day,
+                     a window ending at its begin lasts a full day (i.e. always night if every day).
+        """
+        self.key = tuple(sorted(windows))
+        self.bitmap = bytearray(NightScheduleConst.MINUTES_PER_WEEK)
+        for begin_minute, end_minute, week_days in self.key:
+            duration = (end_minute - begin_minute) % NightScheduleConst.MINUTES_PER_DAY or NightScheduleConst.MINUTES_PER_DAY
+            for week_day in week_days:
+                begin = week_day * NightScheduleConst.MINUTES_PER_DAY + begin_minute
+                for minute in range(begin, begin + duration):
+                    self.bitmap[minute % NightScheduleConst.MINUTES_PER_WEEK] = 1
+
+        self.boundaries = [
+            minute
+            for minute in range(NightScheduleConst.MINUTES_PER_WEEK)
+            if self.bitmap[minute] != self.bitmap[minute - 1]
+        ]
+        self.boundaries_set = frozenset(self.boundaries)
+
+    @classmethod
+    def FromHours(
+        cls,
+        begin_minute: int,
+        end_minute: int
+    ) -> "NightSchedule":
+        """
+        Build a schedule with the same window every day.
+
+        Args:
+            begin_minute: The begin minute of the day (e.g. 1320 for 22:00).
+            end_minute: The end minute of the day, the window ends on the next day if before the begin one
+                        (if equal to the begin one, it's always night).
+
+        Returns:
+            The schedule.
+        """
+        return cls([(begin_minute, end_minute, tuple(range(7)))])
+
+    @classmethod
+    def FromWindows(
+        cls,
+        windows: Any
+    ) -> "NightSchedule":
+        """
+        Build a schedule from a list of window dictionaries.
+
+        Args:
+            windows: The windows.
+
+        Returns:
+            The schedule.
+
+        Raises:
+            ValueError: If the windows are not valid.
+        """
+        if not isinstance(windows, list):
+            raise ValueError("list of windows expected")
+        return cls([cls.__ParseWindow(window) for window in windows])
+
+    def IsActive(
+        self,
+        minute_of_week: int
+    ) -> bool:
+        """
+        Check if it's night at the specified minute of the week.
+
+        Args:
+            minute_of_week: The minute of the week (0 is Monday at 00:00).
+
+        Returns:
+            True if it's night, False otherwise.
+        """
+        return self.bitmap[minute_of_week] == 1
+
+    def IsBoundary(
+        self,
+        minute_of_week: int
+    ) -> bool:
+        """
+        Check if the night begins or ends at the specified minute of the week.
+
+        Args:
+            minute_of_week: The minute of the week (0 is Monday at 00:00).
+
+        Returns:
+            True if it's a boundary, False otherwise.
+        """
+        return minute_of_week in self.boundaries_set
+
+    @staticmethod
+    def NextBoundary(
+        boundaries: List[int],
+        minute_of_week: int
+    ) -> Optional[int]:
+        """
+        Get the first boundary after the specified minute of the week.
+
+        Args:
+            boundaries: The sorted boundaries (e.g. of a schedule, or merged from more schedules).
+            minute_of_week: The minute of the week (0 is Monday at 00:00).
+
+        Returns:
+            The boundary, as minutes since the beginning of the week (it's in the next week, i.e. greater than
+            MINUTES_PER_WEEK, if there is no boundary until the end of the week). None if there are no boundaries.
+        """
+        if len(boundaries) == 0:
+            return None
+        i = bisect.bisect_right(boundaries, minute_of_week)
+        return boundaries[i] if i < len(boundaries) else boundaries[0] + NightScheduleConst.MINUTES_PER_WEEK
+
+    @staticmethod
+    def __ParseWindow(
+        window: Any
+    ) -> Tuple[int, int, Tuple[int, ...]]:
+        """
+        Parse a window dictionary.
+
+        Args:
+            window: The window.
+
+        Returns:
+            The begin minute, end minute and week days.
+
+        Raises:
+            ValueError: If the window is not valid.
+        """
+        if not isinstance(window, dict) or set(window) - {"begin", "end", "week_days"} or "begin" not in window or \
+                "end" not in window:
+            raise ValueError("window object with begin, end and optional week_days expected")
+
+        minutes = []
+        for name in ("begin", "end"):
+            match = NightScheduleConst.TIME_REGEX.match(window[name]) if isinstance(window[name], str) else None
+            if match is None or int(match.group(1)) > 23 or int(match.group(2)) > 59:
+                raise ValueError(f"invalid {name} time {window[name]}, HH:MM expected")
+            minutes.append(int(match.group(1)) * 60 + int(match.group(2)))
+
+        week_days = window.get("week_days", list(range(7)))
+        if not isinstance(week_days, list) or not all(
+            isinstance(week_day, int) and not isinstance(week_day, bool) and 0 <= week_day <= 6 for week_day in week_days
+        ):
+            raise ValueError("week_days shall be a list of integers between 0 and 6")
+        return minutes[0], minutes[1], tuple(sorted(set(week_days)))
+
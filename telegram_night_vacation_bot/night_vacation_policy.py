@@ -0,0 +1,558 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import bisect
+from datetime import datetime, time, timedelta, tzinfo
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from telegram_night_vacation_bot.bot_config import BotConfig
+from telegram_night_vacation_bot.clock import Clock
+from telegram_night_vacation_bot.enforcement_mode import EnforcementModes
+from telegram_night_vacation_bot.night_schedule import NightSchedule, NightScheduleConst
+from telegram_night_vacation_bot.utils import Utils
+from telegram_night_vacation_bot.vacation_calendar import VacationCalendar
+
+
+class NightVacationPolicyConst:
+    """Constants for the night/vacation policy."""
+
+    # Number of days before and after the evaluated day covered by the transition timeline
+    TIMELINE_PAST_DAYS: int = 1
+    TIMELINE_FUTURE_DAYS: int = 2
+
+
+class NightVacationPolicy:
+    """
+    Compiled night/vacation policy of a chat.
+    Configuration lists are converted to sets, night hours are compiled to night schedules (shared by the topics
+    with the same night windows) and the current mode is cached until the next transition, so that checking a
+    message only requires a clock read and a set lookup, regardless of the number of topics and windows.
+    Messages are checked at the time they were sent with a timeline of the transitions around it (built when
+    the time is out of the covered period), so that checking them only requires a binary search.
+    Times are evaluated in the chat time zone, datetimes passed to the methods are converted to it.
+    """
+
+    chat_id: int
+    clock: Clock
+    enforcement_mode: EnforcementModes
+    excluded_user_ids: FrozenSet[int]
+    excluded_usernames: FrozenSet[str]
+    night_boundaries: List[int]
+    night_schedules: List[Tuple[NightSchedule, FrozenSet[int]]]
+    night_topic_ids: FrozenSet[int]
+    timeline_end_time: float
+    timeline_times: List[float]
+    timeline_topic_ids: List[FrozenSet[int]]
+    timezone: tzinfo
+    vacation_calendar: VacationCalendar
+    vacation_topic_ids: FrozenSet[int]
+    # Current mode
+    closed_topic_ids: FrozenSet[int]
+    is_night: bool
+    is_vacation_day: bool
+    mode_expiry_time: float
+
+    def __init__(
+        self,
+        chat_id: int,
+        chat_params: Dict[str, Any],
+        clock: Clock
+    ) -> None:
+        """
+        Build the policy of a chat.
+
+        Args:
+            chat_id: The chat ID.
+            chat_params: Parameters of the chat, the global ones of the bot configuration are used for missing ones.
+            clock: The clock used to get the current time.
+
+        Raises:
+            ValueError: If a vacation rule, a topic night window or the enforcement mode is not valid.
+        """
+        excluded_users = self.__GetParam(chat_params, "EXCLUDED_USERS")
+
+        self.chat_id = chat_id
+        self.clock = clock
+        self.timezone = Utils.TimeZone(self.__GetParam(chat_params, "TIMEZONE"))
+        self.timeline_end_time = 0.0
+        self.timeline_times = []
+        self.timeline_topic_ids = []
+        self.__BuildNightSchedules(chat_params)
+        self.vacation_calendar = VacationCalendar(
+            self.__GetParam(chat_params, "VACATION_WEEK_DAYS"),
+            self.__GetParam(chat_params, "VACATION_DATES"),
+            self.__GetParam(chat_params, "VACATION_RULES"),
+            self.clock.Now(self.timezone).date()
+        )
+        self.vacation_topic_ids = frozenset(self.__GetParam(chat_params, "VACATION_TOPIC_IDS"))
+        self.excluded_user_ids = frozenset(user for user in excluded_users if isinstance(user, int))
+        self.excluded_usernames = frozenset(user for user in excluded_users if isinstance(user, str))
+        self.enforcement_mode = EnforcementModes(self.__GetParam(chat_params, "ENFORCEMENT_MODE"))
+        self.Refresh()
+
+    @classmethod
+    def FromConfig(
+        cls,
+        clock: Clock
+    ) -> Dict[int, "NightVacationPolicy"]:
+        """
+        Build the policies of all the chats in the bot configuration.
+
+        Args:
+            clock: The clock used to get the current time.
+
+        Returns:
+            Dictionary of policies keyed by chat ID.
+        """
+        return {
+            chat_id: cls(chat_id, chat_params, clock)
+            for chat_id, chat_params in BotConfig.CHATS.items()
+        }
+
+    def Refresh(
+        self,
+        now: Optional[datetime] = None
+    ) -> None:
+        """
+        Compute the mode for the current time, valid until the next night boundary or midnight.
+
+        Args:
+            now: The current date and time (if None, the current time is used).
+        """
+        now = self.clock.Now(self.timezone) if now is None else self.__LocalTime(now)
+
+        self.is_night = self.IsNightTime(now)
+        self.is_vacation_day = self.IsVacationDate(now)
+        self.closed_topic_ids = self.ClosedTopicIds(now)
+
+        next_midnight = self.__Midnight(now) + timedelta(days=1)
+        next_night_boundary = self.NextNightBoundary(now)
+        self.mode_expiry_time = (min(next_night_boundary, next_midnight) if next_night_boundary is not None
+                                 else next_midnight).timestamp()
+
+    def IsNight(self) -> bool:
+        """
+        Check if it's currently night time, i.e. if night mode is active in at least one topic.
+
+        Returns:
+            True if current time is within night hours of at least one topic, False otherwise.
+        """
+        self.__RefreshIfExpired()
+        return self.is_night
+
+    def IsVacationDay(self) -> bool:
+        """
+        Check if today is a vacation day.
+
+        Returns:
+            True if today is a vacation day, False otherwise.
+        """
+        self.__RefreshIfExpired()
+        return self.is_vacation_day
+
+    def NightTopicIds(
+        self,
+        date: datetime
+    ) -> FrozenSet[int]:
+        """
+        Get the topics whose night window includes the specified time.
+
+        Args:
+            date: The date and time.
+
+        Returns:
+            The topic IDs.
+        """
+        minute_of_week = self.__MinuteOfWeek(self.__LocalTime(date))
+        return frozenset().union(
+            *(topic_ids for schedule, topic_ids in self.night_schedules if schedule.IsActive(minute_of_week))
+        )
+
+    def ClosedTopicIds(
+        self,
+        date: datetime
+    ) -> FrozenSet[int]:
+        """
+        Get the topics that are closed at the specified time, i.e. the night topics if it's night in at least one
+        of them, the vacation topics if it's a vacation day, none otherwise.
+
+        Args:
+            date: The date and time.
+
+        Returns:
+            The topic IDs.
+        """
+        timestamp = date.timestamp()
+        if (len(self.timeline_times) == 0
+                or timestamp < self.timeline_times[0]
+                or timestamp >= self.timeline_end_time):
+            self.__BuildTimeline(date)
+        return self.timeline_topic_ids[bisect.bisect_right(self.timeline_times, timestamp) - 1]
+
+    def IsNightTime(
+        self,
+        date: datetime
+    ) -> bool:
+        """
+        Check if the specified time is within night hours of at least one topic.
+
+        Args:
+            date: The date and time.
+
+        Returns:
+            True if the time is within night hours, False otherwise.
+        """
+        return len(self.NightTopicIds(date)) > 0
+
+    def NightBoundaryTopicIds(
+        self,
+        date: datetime
+    ) -> FrozenSet[int]:
+        """
+        Get the topics whose night begins or ends at the specified time.
+
+        Args:
+            date: The date and time.
+
+        Returns:
+            The topic IDs.
+        """
+        date = self.__LocalTime(date)
+        if date.second != 0 or date.microsecond != 0:
+            return frozenset()
+        minute_of_week = self.__MinuteOfWeek(date)
+        return frozenset().union(
+            *(topic_ids for schedule, topic_ids in self.night_schedules if schedule.IsBoundary(minute_of_week))
+        )
+
+    def IsVacationBoundary(
+        self,
+        date: datetime
+    ) -> bool:
+        """
+        Check if the specified time is a vacation boundary, i.e. the midnight of a vacation day or of the day after.
+        The vacation notification is refreshed at every vacation boundary.
+
+        Args:
+            date: The date and time.
+
+        Returns:
+            True if the time is a vacation boundary, False otherwise.
+        """
+        date = self.__LocalTime(date)
+        if date != self.__Midnight(date):
+            return False
+        return self.IsVacationDate(date) or self.IsVacationDate(date - timedelta(days=1))
+
+    def NextNightBoundary(
+        self,
+        now: datetime
+    ) -> Optional[datetime]:
+        """
+        Get the next night boundary (of any topic) after the specified time.
+
+        Args:
+            now: The date and time.
+
+        Returns:
+            The next night boundary, None if there are no night windows.
+        """
+        local_now = self.__LocalTime(now)
+        week_begin = self.__Midnight(local_now) - timedelta(days=local_now.weekday())
+        minute_of_week = self.__MinuteOfWeek(local_now)
+        # More boundaries may need to be checked if wall clock times are repeated by a DST change
+        for _ in range(len(self.night_boundaries) + 1):
+            next_minute = NightSchedule.NextBoundary(self.night_boundaries, minute_of_week)
+            if next_minute is None:
+                return None
+            boundary = week_begin + timedelta(minutes=next_minute)
+            if boundary.timestamp() > now.timestamp():
+                return boundary
+            minute_of_week = next_minute
+        return None
+
+    def NextVacationBoundary(
+        self,
+        now: datetime
+    ) -> Optional[datetime]:
+        """
+        Get the next vacation boundary after the specified time.
+
+        Args:
+            now: The date and time.
+
+        Returns:
+            The next vacation boundary, None if there is no vacation day in the lookahead period.
+        """
+        today = self.__LocalTime(now).date()
+        tomorrow = today + timedelta(days=1)
+        if self.vacation_calendar.IsVacationDay(today) or self.vacation_calendar.IsVacationDay(tomorrow):
+            next_day = tomorrow
+        else:
+            vacation_start = self.vacation_calendar.NextVacationStart(tomorrow)
+            if vacation_start is None:
+                return None
+            next_day = vacation_start
+        return datetime.combine(next_day, time(), tzinfo=self.timezone)
+
+    def NextTransition(
+        self,
+        now: datetime
+    ) -> Optional[datetime]:
+        """
+        Get the next transition (night or vacation boundary) after the specified time.
+
+        Args:
+            now: The date and time.
+
+        Returns:
+            The next transition, None if there are no night windows and vacation days.
+        """
+        boundaries = [
+            boundary
+            for boundary in (self.NextNightBoundary(now), self.NextVacationBoundary(now))
+            if boundary is not None
+        ]
+        return min(boundaries) if len(boundaries) > 0 else None
+
+    def IsVacationDate(
+        self,
+        date: datetime
+    ) -> bool:
+        """
+        Check if the specified date is a vacation day.
+
+        Args:
+            date: The date.
+
+        Returns:
+            True if the date is a vacation day, False otherwise.
+        """
+        return self.vacation_calendar.IsVacationDay(self.__LocalTime(date).date())
+
+    def ScheduleKey(self) -> Tuple[Any, ...]:
+        """
+        Get the parameters the transitions depend on, to know if two policies have the same schedule.
+
+        Returns:
+            The schedule parameters.
+        """
+        return (
+            str(self.timezone),
+            tuple(sorted(schedule.key for schedule, _ in self.night_schedules)),
+            self.vacation_calendar.Key(),
+        )
+
+    def IsUserExcluded(
+        self,
+        user_id: int,
+        username: str
+    ) -> bool:
+        """
+        Check if a user is excluded from night/vacation mode.
+
+        Args:
+            user_id: The user ID.
+            username: The username.
+
+        Returns:
+            True if the user is excluded, False otherwise.
+        """
+        return user_id in self.excluded_user_ids or username in self.excluded_usernames
+
+    def ShallMessageBeDeleted(
+        self,
+        topic_id: int,
+        date: Optional[datetime] = None
+    ) -> bool:
+        """
+        Determine if a message should be deleted based on the mode at the time it was sent (and not at the time
+        it's handled, which may be later if updates are delayed).
+
+        Args:
+            topic_id: The topic ID.
+            date: The date and time the message was sent (if None, the current mode is used).
+
+        Returns:
+            True if message should be deleted, False otherwise.
+        """
+        if date is not None:
+            return topic_id in self.ClosedTopicIds(date)
+        self.__RefreshIfExpired()
+        return topic_id in self.closed_topic_ids
+
+    def __LocalTime(
+        self,
+        date: datetime
+    ) -> datetime:
+        """
+        Convert a datetime to the chat time zone (naive datetimes are considered in the system time zone).
+
+        Args:
+            date: The date and time.
+
+        Returns:
+            The date and time in the chat time zone.
+        """
+        return date.astimezone(self.timezone)
+
+    def __ComputeClosedTopicIds(
+        self,
+        date: datetime
+    ) -> FrozenSet[int]:
+        """
+        Compute the topics that are closed at the specified time (see ClosedTopicIds).
+
+        Args:
+            date: The date and time.
+
+        Returns:
+            The topic IDs.
+        """
+        night_topic_ids = self.NightTopicIds(date)
+        if len(night_topic_ids) > 0:
+            return night_topic_ids
+        if self.IsVacationDate(date):
+            return self.vacation_topic_ids
+        return frozenset()
+
+    def __BuildTimeline(
+        self,
+        date: datetime
+    ) -> None:
+        """
+        Build the timeline of the closed topics around the specified time, i.e. the sorted times when they change
+        (night boundaries and midnights) with the topics closed from each of them to the next one.
+
+        Args:
+            date: The date and time.
+        """
+        midnight = self.__Midnight(self.__LocalTime(date))
+        current = midnight - timedelta(days=NightVacationPolicyConst.TIMELINE_PAST_DAYS)
+        end_time = (midnight + timedelta(days=NightVacationPolicyConst.TIMELINE_FUTURE_DAYS + 1)).timestamp()
+
+        timeline_times: List[float] = []
+        timeline_topic_ids: List[FrozenSet[int]] = []
+        while current.timestamp() < end_time:
+            closed_topic_ids = self.__ComputeClosedTopicIds(current)
+            if len(timeline_topic_ids) == 0 or closed_topic_ids != timeline_topic_ids[-1]:
+                timeline_times.append(current.timestamp())
+                timeline_topic_ids.append(closed_topic_ids)
+
+            next_midnight = self.__Midnight(current) + timedelta(days=1)
+            next_night_boundary = self.NextNightBoundary(current)
+            current = (min(next_night_boundary, next_midnight) if next_night_boundary is not None
+                       else next_midnight)
+
+        self.timeline_times = timeline_times
+        self.timeline_topic_ids = timeline_topic_ids
+        self.timeline_end_time = end_time
+
+    def __BuildNightSchedules(
+        self,
+        chat_params: Dict[str, Any]
+    ) -> None:
+        """
+        Build the night schedules of the topics, i.e. the night hours for the night topics and their own night windows
+        for the topics having them. Topics with the same windows share the same schedule.
+
+        Args:
+            chat_params: Parameters of the chat.
+
+        Raises:
+            ValueError: If a topic night window is not valid.
+        """
+        topic_windows = self.__GetParam(chat_params, "TOPIC_NIGHT_WINDOWS")
+        night_hours = NightSchedule.FromHours(
+            self.__GetParam(chat_params, "NIGHT_BEGIN_HOUR") * 60 + self.__GetParam(chat_params, "NIGHT_BEGIN_MINUTE"),
+            self.__GetParam(chat_params, "NIGHT_END_HOUR") * 60 + self.__GetParam(chat_params, "NIGHT_END_MINUTE")
+        )
+
+        schedules = {night_hours.key: night_hours}
+        schedule_topic_ids: Dict[Any, Set[int]] = {
+            night_hours.key: set(self.__GetParam(chat_params, "NIGHT_TOPIC_IDS")) - set(topic_windows)
+        }
+        for topic_id, windows in topic_windows.items():
+            schedule = NightSchedule.FromWindows(windows)
+            schedules.setdefault(schedule.key, schedule)
+            schedule_topic_ids.setdefault(schedule.key, set()).add(topic_id)
+
+        self.night_schedules = [
+            (schedules[key], frozenset(topic_ids))
+            for key, topic_ids in schedule_topic_ids.items()
+            if len(topic_ids) > 0
+        ]
+        self.night_topic_ids = frozenset().union(*(topic_ids for _, topic_ids in self.night_schedules))
+        self.night_boundaries = sorted(
+            {boundary for schedule, _ in self.night_schedules for boundary in schedule.boundaries}
+        )
+
+    @staticmethod
+    def __MinuteOfWeek(
+        date: datetime
+    ) -> int:
+        """
+        Get the minute of the week of the specified time.
+
+        Args:
+            date: The date and time.
+
+        Returns:
+            The minute of the week (0 is Monday at 00:00).
+        """
+        return date.weekday() * NightScheduleConst.MINUTES_PER_DAY + date.hour * 60 + date.minute
+
+    @staticmethod
+    def __Midnight(
+        date: datetime
+    ) -> datetime:
+        """
+        Get the midnight of the specified day.
+
+        Args:
+            date: The date and time.
+
+        Returns:
+            The midnight of the day.
+        """
+        return date.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def __GetParam(
+        chat_params: Dict[str, Any],
+        name: str
+    ) -> Any:
+        """
+        Get a chat parameter, falling back to the global one if not specified.
+
+        Args:
+            chat_params: Parameters of the chat.
+            name: The parameter name.
+
+        Returns:
+            The parameter value.
+        """
+        return chat_params.get(name, getattr(BotConfig, name))
+
+    def __RefreshIfExpired(self) -> None:
+        """Refresh the current mode if the hour it was computed for is over."""
+        if self.clock.Time() >= self.mode_expiry_time:
+            self.Refresh()
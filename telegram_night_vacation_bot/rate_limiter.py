@@ -0,0 +1,76 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from telegram_night_vacation_bot.clock import Clock
+
+
+class RateLimiter:
+    """Token bucket rate limiter for asyncio tasks."""
+
+    capacity: float
+    clock: Clock
+    last_refill_time: float
+    rate: float
+    tokens: float
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Clock
+    ) -> None:
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Number of tokens added every second.
+            capacity: Maximum number of tokens (i.e. maximum burst).
+            clock: The clock used to measure time.
+        """
+        self.capacity = capacity
+        self.clock = clock
+        self.rate = rate
+        self.tokens = capacity
+        self.last_refill_time = clock.Monotonic()
+
+    async def Acquire(self) -> float:
+        """
+        Wait until a token is available and take it.
+
+        Returns:
+            float: The time waited in seconds.
+        """
+        waited_time = 0.0
+        while True:
+            self.__Refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return waited_time
+
+            wait_time = (1 - self.tokens) / self.rate
+            await self.clock.Sleep(wait_time)
+            waited_time += wait_time
+
+    def __Refill(self) -> None:
+        """Add the tokens accumulated since the last refill."""
+        now = self.clock.Monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill_time) * self.rate)
+        self.last_refill_time = now
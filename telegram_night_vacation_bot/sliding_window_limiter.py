@@ -0,0 +1,125 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+
+from collections import OrderedDict, deque
+from typing import Deque, Generic, Hashable, TypeVar
+
+from telegram_night_vacation_bot.clock import Clock
+
+
+# Generic type for keys
+K = TypeVar("K", bound=Hashable)
+
+
+class SlidingWindowLimiter(Generic[K]):
+    """
+    Sliding window limiter allowing at most a number of events for each key (e.g. a user) in a time window.
+    Keys are kept in access order with the times of their events in the window, so that idle keys (without events
+    in the window) are evicted from the least recently used ones, as well as the least recently used key
+    if there are too many keys.
+    """
+
+    clock: Clock
+    entries: "OrderedDict[K, Deque[float]]"
+    max_events: int
+    max_keys: int
+    window_sec: float
+
+    def __init__(
+        self,
+        max_events: int,
+        window_sec: float,
+        max_keys: int,
+        clock: Clock
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            max_events: Maximum number of events for each key in the time window.
+            window_sec: Time window in seconds.
+            max_keys: Maximum number of keys kept in memory.
+            clock: The clock used to measure time.
+        """
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.max_events = max_events
+        self.max_keys = max_keys
+        self.window_sec = window_sec
+
+    def Allow(
+        self,
+        key: K
+    ) -> bool:
+        """
+        Check if an event for a key is allowed and record it if so.
+
+        Args:
+            key: The key.
+
+        Returns:
+            True if the event is allowed, False if the key reached the maximum number of events in the window.
+        """
+        now = self.clock.Monotonic()
+        window_begin = now - self.window_sec
+        self.__EvictIdle(window_begin)
+
+        times = self.entries.get(key)
+        if times is None:
+            times = deque()
+            self.entries[key] = times
+            if len(self.entries) > self.max_keys:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(key)
+            while len(times) > 0 and times[0] <= window_begin:
+                times.popleft()
+
+        if len(times) >= self.max_events:
+            return False
+        times.append(now)
+        return True
+
+    def Size(self) -> int:
+        """
+        Get the number of keys kept in memory.
+
+        Returns:
+            int: The number of keys.
+        """
+        return len(self.entries)
+
+    def __EvictIdle(
+        self,
+        window_begin: float
+    ) -> None:
+        """
+        Evict the least recently used keys without events in the window.
+
+        Args:
+            window_begin: Begin of the time window.
+        """
+        while len(self.entries) > 0:
+            times = next(iter(self.entries.values()))
+            if len(times) > 0 and times[-1] > window_begin:
+                break
+            self.entries.popitem(last=False)
@@ -0,0 +1,286 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import json
+import sqlite3
+from enum import Enum, unique
+from typing import Any, Dict, List, Optional, Set
+
+
+@unique
+class NotificationTypes(Enum):
+    """Enumeration of notification types."""
+
+    NIGHT = "night"
+    VACATION = "vacation"
+
+
+class StateStore:
+    """Durable store for the bot state, based on SQLite."""
+
+    conn: Optional[sqlite3.Connection]
+    file_name: str
+
+    def __init__(
+        self,
+        file_name: str
+    ) -> None:
+        """
+        Initialize the state store.
+
+        Args:
+            file_name: Path of the database file.
+        """
+        self.conn = None
+        self.file_name = file_name
+
+    def Open(self) -> None:
+        """Open the database (if not already open), creating the tables if they don't exist."""
+        self.__Connection()
+
+    def Close(self) -> None:
+        """Close the database, it is opened again when used."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def GetMessageIds(
+        self,
+        notification_type: NotificationTypes,
+        chat_id: int
+    ) -> List[int]:
+        """
+        Get the IDs of the notification messages sent in a chat.
+
+        Args:
+            notification_type: The notification type.
+            chat_id: The chat ID.
+
+        Returns:
+            List of message IDs.
+        """
+        cursor = self.__Connection().execute(
+            "SELECT message_id FROM notification_msgs WHERE notification_type = ? AND chat_id = ? ORDER BY message_id",
+            (notification_type.value, chat_id)
+        )
+        return [row[0] for row in cursor]
+
+    def GetTopicMessageIds(
+        self,
+        notification_type: NotificationTypes,
+        chat_id: int
+    ) -> Dict[int, List[int]]:
+        """
+        Get the IDs of the notification messages sent in a chat, grouped by topic.
+
+        Args:
+            notification_type: The notification type.
+            chat_id: The chat ID.
+
+        Returns:
+            Message IDs for each topic ID.
+        """
+        cursor = self.__Connection().execute(
+            "SELECT topic_id, message_id FROM notification_msgs WHERE notification_type = ? AND chat_id = ? "
+            "ORDER BY message_id",
+            (notification_type.value, chat_id)
+        )
+        msg_ids: Dict[int, List[int]] = {}
+        for topic_id, msg_id in cursor:
+            msg_ids.setdefault(topic_id, []).append(msg_id)
+        return msg_ids
+
+    def SetMessageIds(
+        self,
+        notification_type: NotificationTypes,
+        chat_id: int,
+        msg_ids: Dict[int, List[int]]
+    ) -> None:
+        """
+        Replace the IDs of the notification messages sent in a chat, with a single transaction.
+
+        Args:
+            notification_type: The notification type.
+            chat_id: The chat ID.
+            msg_ids: Message IDs for each topic ID.
+        """
+        conn = self.__Connection()
+        with conn:
+            conn.execute(
+                "DELETE FROM notification_msgs WHERE notification_type = ? AND chat_id = ?",
+                (notification_type.value, chat_id)
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO notification_msgs VALUES (?, ?, ?, ?)",
+                [
+                    (notification_type.value, chat_id, topic_id, msg_id)
+                    for topic_id, topic_msg_ids in msg_ids.items()
+                    for msg_id in topic_msg_ids
+                ]
+            )
+
+    def GetClosedTopicIds(
+        self,
+        chat_id: int
+    ) -> Set[int]:
+        """
+        Get the IDs of the topics closed by the bot in a chat.
+
+        Args:
+            chat_id: The chat ID.
+
+        Returns:
+            The topic IDs.
+        """
+        cursor = self.__Connection().execute("SELECT topic_id FROM closed_topics WHERE chat_id = ?", (chat_id,))
+        return {row[0] for row in cursor}
+
+    def SetClosedTopicIds(
+        self,
+        chat_id: int,
+        topic_ids: Set[int]
+    ) -> None:
+        """
+        Replace the IDs of the topics closed by the bot in a chat, with a single transaction.
+
+        Args:
+            chat_id: The chat ID.
+            topic_ids: The topic IDs.
+        """
+        conn = self.__Connection()
+        with conn:
+            conn.execute("DELETE FROM closed_topics WHERE chat_id = ?", (chat_id,))
+            conn.executemany("INSERT INTO closed_topics VALUES (?, ?)", [(chat_id, topic_id) for topic_id in topic_ids])
+
+    def GetSavedChatPermissions(
+        self,
+        chat_id: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the permissions of a chat saved before restricting it.
+
+        Args:
+            chat_id: The chat ID.
+
+        Returns:
+            The permissions, None if the chat is not restricted by the bot.
+        """
+        row = self.__Connection().execute(
+            "SELECT permissions FROM saved_chat_permissions WHERE chat_id = ?",
+            (chat_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def SetSavedChatPermissions(
+        self,
+        chat_id: int,
+        permissions: Optional[Dict[str, Any]]
+    ) -> None:
+        """
+        Set the permissions of a chat saved before restricting it.
+
+        Args:
+            chat_id: The chat ID.
+            permissions: The permissions, None to remove them (i.e. the chat is not restricted anymore).
+        """
+        conn = self.__Connection()
+        with conn:
+            if permissions is None:
+                conn.execute("DELETE FROM saved_chat_permissions WHERE chat_id = ?", (chat_id,))
+            else:
+                conn.execute(
+                    "INSERT OR REPLACE INTO saved_chat_permissions VALUES (?, ?)",
+                    (chat_id, json.dumps(permissions))
+                )
+
+    def GetLastProcessedMessageIds(self) -> Dict[int, int]:
+        """
+        Get the ID of the last message processed in each chat.
+
+        Returns:
+            Message IDs keyed by chat ID.
+        """
+        cursor = self.__Connection().execute("SELECT chat_id, message_id FROM processed_msgs")
+        return {row[0]: row[1] for row in cursor}
+
+    def SetLastProcessedMessageIds(
+        self,
+        msg_ids: Dict[int, int]
+    ) -> None:
+        """
+        Replace the ID of the last message processed in each chat, with a single transaction.
+
+        Args:
+            msg_ids: Message IDs keyed by chat ID.
+        """
+        conn = self.__Connection()
+        with conn:
+            conn.execute("DELETE FROM processed_msgs")
+            conn.executemany("INSERT INTO processed_msgs VALUES (?, ?)", list(msg_ids.items()))
+
+    def __Connection(self) -> sqlite3.Connection:
+        """
+        Get the database connection, opening the database again if it was closed (e.g. while the bot is stopped).
+
+        Returns:
+            The database connection.
+        """
+        if self.conn is None:
+            self.conn = self.__Connect()
+        return self.conn
+
+    def __Connect(self) -> sqlite3.Connection:
+        """
+        Connect to the database, creating the tables if they don't exist.
+
+        Returns:
+            The database connection.
+        """
+        conn = sqlite3.connect(self.file_name)
+        # Write-ahead log without a sync for each commit, to keep writes fast while still atomic
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS notification_msgs ("
+                "notification_type TEXT NOT NULL, "
+                "chat_id INTEGER NOT NULL, "
+                "topic_id INTEGER NOT NULL, "
+                "message_id INTEGER NOT NULL, "
+                "PRIMARY KEY (notification_type, chat_id, message_id))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS closed_topics ("
+                "chat_id INTEGER NOT NULL, "
+                "topic_id INTEGER NOT NULL, "
+                "PRIMARY KEY (chat_id, topic_id))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS saved_chat_permissions ("
+                "chat_id INTEGER NOT NULL PRIMARY KEY, "
+                "permissions TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS processed_msgs ("
+                "chat_id INTEGER NOT NULL PRIMARY KEY, "
+                "message_id INTEGER NOT NULL)"
+            )
+        return conn
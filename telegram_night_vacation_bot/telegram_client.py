@@ -18,13 +18,27 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import functools
+import logging
 import re
-from typing import Any, Callable, List, Optional
+import time
+from typing import Any, Awaitable, Callable, Iterator, List, Optional, TypeVar
 
 import pyrogram.types
 from pyrogram import Client, idle
+from pyrogram.errors import FloodWait, TopicNotModified
 from pyrogram.types import ReplyParameters
 
+from telegram_night_vacation_bot.clock import Clock
+from telegram_night_vacation_bot.lru_cache import LruCache
+from telegram_night_vacation_bot.message_splitter import MessageSplitter
+from telegram_night_vacation_bot.metrics import BotMetrics
+from telegram_night_vacation_bot.rate_limiter import RateLimiter
+
+
+# Generic type for the result of API calls
+T = TypeVar("T")
+
 
 class TelegramClientConst:
     """Constants used by the Telegram client."""
@@ -32,20 +46,38 @@ class TelegramClientConst:
     ANONYMOUS_USERS_ID: int = -1
     MESSAGE_MAX_LEN: int = 4096
     TOPIC_NONE_ID: int = 0
+    # Thread ID of the general topic of forums (i.e. the topic of messages without topic)
+    GENERAL_TOPIC_THREAD_ID: int = 1
     TOPIC_PRIVATE_ID: int = -1
+    # Prefix of the ID of supergroups (and channels), whose messages have their own IDs
+    SUPERGROUP_ID_PREFIX: str = "-100"
+    # Maximum number of API calls per second for all chats (Telegram limit)
+    GLOBAL_MAX_CALLS_PER_SEC: int = 30
+    # Maximum number of messages that can be sent to the same group in a minute (Telegram limit)
+    CHAT_MAX_MSGS_PER_MIN: int = 20
+    # Maximum number of times an API call is retried after a flood wait
+    FLOOD_WAIT_MAX_RETRIES: int = 5
+    # Maximum number of chats whose rate limiter is kept (the least recently used ones are evicted)
+    CHAT_RATE_LIMITERS_MAX_SIZE: int = 1000
 
 
 class TelegramClient:
     """Wrapper for Telegram client to handle bot interactions."""
 
+    chat_rate_limiters: LruCache[int, RateLimiter]
     client: Client
+    clock: Clock
+    global_rate_limiter: RateLimiter
+    me: Optional[pyrogram.types.User]
 
     def __init__(
         self,
         session_name: str,
         bot_token: str,
         api_id: str,
-        api_hash: str
+        api_hash: str,
+        *,
+        clock: Optional[Clock] = None
     ) -> None:
         """
         Initialize the Telegram client.
@@ -55,6 +87,7 @@ class TelegramClient:
             bot_token: Bot token from BotFather.
             api_id: API ID from Telegram.
             api_hash: API hash from Telegram.
+            clock: The clock used for rate limiting and flood waits (the real one if not specified).
         """
         self.client = Client(
             session_name,
@@ -62,6 +95,14 @@ class TelegramClient:
             api_id=api_id,
             api_hash=api_hash
         )
+        self.clock = clock if clock is not None else Clock()
+        self.me = None
+        self.chat_rate_limiters = LruCache("chat_rate_limiters", TelegramClientConst.CHAT_RATE_LIMITERS_MAX_SIZE)
+        self.global_rate_limiter = RateLimiter(
+            TelegramClientConst.GLOBAL_MAX_CALLS_PER_SEC,
+            TelegramClientConst.GLOBAL_MAX_CALLS_PER_SEC,
+            self.clock
+        )
 
     @staticmethod
     def AnonymousUserId() -> int:
@@ -95,10 +136,21 @@ class TelegramClient:
         """
         self.client.add_handler(handler)
 
-    async def Run(self) -> None:
-        """Start the Telegram client."""
+    async def Run(
+        self,
+        on_stop: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> None:
+        """
+        Start the Telegram client.
+
+        Args:
+            on_stop: Function called when the client is stopping, while it's still connected (optional).
+        """
         async with self.client:
+            await self.RefreshMe()
             await idle()
+            if on_stop is not None:
+                await on_stop()
 
     async def SendMessage(
         self,
@@ -120,10 +172,15 @@ class TelegramClient:
         sent_msgs = []
         split_text = self.__SplitMessageText(message_text)
         for text_part in split_text:
-            msg = await self.client.send_message(
+            msg = await self.__CallApi(
+                "send_message",
                 chat_id,
-                text_part,
-                reply_parameters=ReplyParameters(message_id=topic_id or 0)
+                functools.partial(
+                    self.client.send_message,
+                    chat_id,
+                    text_part,
+                    reply_parameters=ReplyParameters(message_id=topic_id or 0)
+                )
             )
             sent_msgs.append(msg)
         return sent_msgs
@@ -167,16 +224,26 @@ class TelegramClient:
         sent_msgs = []
         first = True
         split_text = self.__SplitMessageText(message_text)
+        chat_id = original_message.chat.id
         for text_part in split_text:
             if first:
                 first = False
-                msg = await self.client.send_message(
-                    original_message.chat.id,
-                    text_part,
-                    reply_parameters=ReplyParameters(message_id=original_message.id)
+                msg = await self.__CallApi(
+                    "send_message",
+                    chat_id,
+                    functools.partial(
+                        self.client.send_message,
+                        chat_id,
+                        text_part,
+                        reply_parameters=ReplyParameters(message_id=original_message.id)
+                    )
                 )
             else:
-                msg = await self.client.send_message(original_message.chat.id, text_part)
+                msg = await self.__CallApi(
+                    "send_message",
+                    chat_id,
+                    functools.partial(self.client.send_message, chat_id, text_part)
+                )
             sent_msgs.append(msg)
         return sent_msgs
 
@@ -187,24 +254,140 @@ class TelegramClient:
     ) -> None:
         """
         Delete messages from a chat.
+        Errors are logged and not raised, since messages may be already deleted, except flood waits lasting more
+        than the maximum number of retries, so that the deletion can be rescheduled.
 
         Args:
             chat_id: The chat ID.
             message_ids: List of message IDs to delete.
+
+        Raises:
+            FloodWait: If the messages cannot be deleted because of flood waits.
         """
         try:
-            await self.client.delete_messages(chat_id, message_ids)
-        except:
-            pass
+            await self.__CallApi(
+                "delete_messages",
+                chat_id,
+                functools.partial(self.client.delete_messages, chat_id, message_ids),
+                chat_rate_limit=False
+            )
+        except FloodWait:
+            raise
+        except Exception as ex:
+            logging.error("Unable to delete messages %s (chat ID: %d): %s", message_ids, chat_id, ex)
+
+    async def GetMessages(
+        self,
+        chat_id: int,
+        message_ids: List[int]
+    ) -> List[pyrogram.types.Message]:
+        """
+        Get messages of a chat by ID (messages that don't exist or were deleted are returned as empty).
+
+        Args:
+            chat_id: The chat ID.
+            message_ids: List of message IDs.
+
+        Returns:
+            List of message objects, in the same order of the IDs.
+        """
+        return await self.__CallApi(
+            "get_messages",
+            chat_id,
+            functools.partial(self.client.get_messages, chat_id, message_ids, replies=0),
+            chat_rate_limit=False
+        )
+
+    async def CloseTopic(
+        self,
+        chat_id: int,
+        topic_id: int
+    ) -> None:
+        """
+        Close a forum topic, so that only administrators can send messages to it.
+
+        Args:
+            chat_id: The chat ID.
+            topic_id: The topic ID.
+        """
+        await self.__SetTopicClosed(chat_id, topic_id, True)
+
+    async def ReopenTopic(
+        self,
+        chat_id: int,
+        topic_id: int
+    ) -> None:
+        """
+        Reopen a forum topic.
+
+        Args:
+            chat_id: The chat ID.
+            topic_id: The topic ID.
+        """
+        await self.__SetTopicClosed(chat_id, topic_id, False)
+
+    async def GetChatPermissions(
+        self,
+        chat_id: int
+    ) -> pyrogram.types.ChatPermissions:
+        """
+        Get the default permissions of the members of a chat.
+
+        Args:
+            chat_id: The chat ID.
+
+        Returns:
+            The chat permissions.
+        """
+        chat = await self.__CallApi(
+            "get_chat",
+            chat_id,
+            functools.partial(self.client.get_chat, chat_id),
+            chat_rate_limit=False
+        )
+        return chat.permissions
+
+    async def SetChatPermissions(
+        self,
+        chat_id: int,
+        permissions: pyrogram.types.ChatPermissions
+    ) -> None:
+        """
+        Set the default permissions of the members of a chat.
+
+        Args:
+            chat_id: The chat ID.
+            permissions: The chat permissions.
+        """
+        await self.__CallApi(
+            "set_chat_permissions",
+            chat_id,
+            functools.partial(self.client.set_chat_permissions, chat_id, permissions),
+            chat_rate_limit=False
+        )
 
     async def Me(self) -> pyrogram.types.User:
         """
         Get the bot's user information.
+        It's fetched only the first time, call RefreshMe to fetch it again.
+
+        Returns:
+            The bot's user object.
+        """
+        if self.me is None:
+            return await self.RefreshMe()
+        return self.me
+
+    async def RefreshMe(self) -> pyrogram.types.User:
+        """
+        Fetch the bot's user information (e.g. if the bot username was changed).
 
         Returns:
             The bot's user object.
         """
-        return await self.client.get_me()
+        self.me = await self.client.get_me()
+        logging.info(f"Bot user: @{self.me.username} (ID: {self.me.id})")
+        return self.me
 
     async def MyUsername(self) -> str:
         """
@@ -364,6 +547,22 @@ class TelegramClient:
             return False
         return message.from_user.id == message.chat.id
 
+    @staticmethod
+    def IsSupergroupChatId(
+        chat_id: int
+    ) -> bool:
+        """
+        Check if a chat ID is the one of a supergroup.
+        Messages of basic groups share the IDs with the private chats and the other basic groups of the account.
+
+        Args:
+            chat_id: The chat ID.
+
+        Returns:
+            True if the chat is a supergroup, False otherwise.
+        """
+        return str(chat_id).startswith(TelegramClientConst.SUPERGROUP_ID_PREFIX)
+
     @staticmethod
     def AppendTextInMessage(
         message: pyrogram.types.Message,
@@ -535,10 +734,116 @@ class TelegramClient:
         except (IndexError, ValueError):
             return default_val
 
+    async def __CallApi(
+        self,
+        method: str,
+        chat_id: int,
+        api_call: Callable[[], Awaitable[T]],
+        *,
+        chat_rate_limit: bool = True
+    ) -> T:
+        """
+        Call an API method respecting the rate limits.
+        In case of flood wait, the call is retried after the time requested by Telegram.
+
+        Args:
+            method: The API method name (for logging and metrics).
+            chat_id: The chat ID.
+            api_call: Function performing the API call.
+            chat_rate_limit: True if the per-chat rate limit applies (i.e. the call sends a message).
+
+        Returns:
+            The result of the API call.
+        """
+        latency = BotMetrics.API_CALL_LATENCY.Labels(method)
+        waited_time = 0.0
+        retry_num = 0
+        while True:
+            waited_time += await self.global_rate_limiter.Acquire()
+            if chat_rate_limit:
+                waited_time += await self.__ChatRateLimiter(chat_id).Acquire()
+
+            start_time = time.perf_counter()
+            try:
+                result = await api_call()
+            except FloodWait as ex:
+                if retry_num >= TelegramClientConst.FLOOD_WAIT_MAX_RETRIES:
+                    BotMetrics.API_CALL_ERRORS.Labels(method).Inc()
+                    raise
+                flood_wait_time = float(ex.value)
+            except Exception:
+                BotMetrics.API_CALL_ERRORS.Labels(method).Inc()
+                raise
+            else:
+                BotMetrics.API_CALL_WAIT.Labels(method).Observe(waited_time)
+                if waited_time > 0:
+                    logging.info("Call to %s (chat ID: %d) delayed by %.3fs", method, chat_id, waited_time)
+                return result
+            finally:
+                latency.Observe(time.perf_counter() - start_time)
+
+            retry_num += 1
+            BotMetrics.API_CALL_FLOOD_WAITS.Labels(method).Inc()
+            logging.warning(
+                f"Flood wait of {flood_wait_time:.0f}s for {method} (chat ID: {chat_id}), "
+                f"retry {retry_num}/{TelegramClientConst.FLOOD_WAIT_MAX_RETRIES}"
+            )
+            await self.clock.Sleep(flood_wait_time)
+            waited_time += flood_wait_time
+
+    async def __SetTopicClosed(
+        self,
+        chat_id: int,
+        topic_id: int,
+        closed: bool
+    ) -> None:
+        """
+        Close or reopen a forum topic (it's not an error if it's already closed or open).
+
+        Args:
+            chat_id: The chat ID.
+            topic_id: The topic ID.
+            closed: True to close the topic, False to reopen it.
+        """
+        thread_id = TelegramClientConst.GENERAL_TOPIC_THREAD_ID if topic_id == TelegramClientConst.TOPIC_NONE_ID else topic_id
+        method = "close_forum_topic" if closed else "reopen_forum_topic"
+        try:
+            await self.__CallApi(
+                method,
+                chat_id,
+                functools.partial(getattr(self.client, method), chat_id, thread_id),
+                chat_rate_limit=False
+            )
+        except TopicNotModified:
+            pass
+
+    def __ChatRateLimiter(
+        self,
+        chat_id: int
+    ) -> RateLimiter:
+        """
+        Get the rate limiter for sending messages to a chat.
+
+        Args:
+            chat_id: The chat ID.
+
+        Returns:
+            The rate limiter.
+        """
+        rate_limiter = self.chat_rate_limiters.Get(chat_id)
+        if rate_limiter is None:
+            rate_limiter = RateLimiter(
+                TelegramClientConst.CHAT_MAX_MSGS_PER_MIN / 60,
+                TelegramClientConst.CHAT_MAX_MSGS_PER_MIN,
+                self.clock
+            )
+            self.chat_rate_limiters.Set(chat_id, rate_limiter)
+        return rate_limiter
+
     @staticmethod
     def __SplitMessageText(
         message_text: str
-    ) -> List[str]:
+    ) -> Iterator[str]:
         """
         Split a long message text into multiple parts respecting Telegram's limits.
 
@@ -546,27 +851,6 @@ class TelegramClient:
             message_text: The message text to split.
 
         Returns:
-            List of message text parts.
+            Iterator over the message text parts.
         """
-        msg_parts = []
-
-        while len(message_text) > 0:
-            # If length is less than maximum, the operation is completed
-            if len(message_text) <= TelegramClientConst.MESSAGE_MAX_LEN:
-                msg_parts.append(message_text)
-                break
-
-            # Take the current part
-            curr_part = message_text[:TelegramClientConst.MESSAGE_MAX_LEN]
-            # Get the last occurrence of a new line
-            idx = curr_part.rfind("\n")
-
-            # Split with respect to the found occurrence
-            if idx != -1:
-                msg_parts.append(curr_part[:idx])
-                message_text = message_text[idx + 1:]
-            else:
-                msg_parts.append(curr_part)
-                message_text = message_text[TelegramClientConst.MESSAGE_MAX_LEN + 1:]
-
-        return msg_parts
+        return MessageSplitter.Split(message_text, TelegramClientConst.MESSAGE_MAX_LEN)
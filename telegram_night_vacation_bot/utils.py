@@ -19,21 +19,50 @@
 # THE SOFTWARE.
 
 import time
-from datetime import datetime
+from datetime import datetime, tzinfo
+from typing import Optional
+
+import tzlocal
+
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    from backports.zoneinfo import ZoneInfo  # type: ignore
 
 
 class Utils:
     """Utility functions for date and time operations."""
 
     @staticmethod
-    def Today() -> datetime:
+    def Today(
+        tz: Optional[tzinfo] = None
+    ) -> datetime:
         """
         Get the current date and time.
 
+        Args:
+            tz: The time zone (if None, the local time is returned as a naive datetime).
+
         Returns:
             datetime: The current datetime object.
         """
-        return datetime.now()
+        return datetime.now(tz)
+
+    @staticmethod
+    def TimeZone(
+        name: Optional[str]
+    ) -> tzinfo:
+        """
+        Get a time zone from its IANA name.
+
+        Args:
+            name: The IANA time zone name (e.g. Europe/Rome), if None the system time zone is returned.
+
+        Returns:
+            tzinfo: The time zone.
+        """
+        return ZoneInfo(name) if name is not None else tzlocal.get_localzone()
 
     @staticmethod
     def CurrentDay() -> int:
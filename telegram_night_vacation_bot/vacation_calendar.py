@@ -0,0 +1,632 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+
+import bisect
+import calendar
+import re
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from telegram_night_vacation_bot.bot_config import BotConfig
+from telegram_night_vacation_bot.ics_calendar import IcsCalendar
+
+
+class VacationCalendarConst:
+    """Constants for the vacation calendar."""
+
+    # Maximum number of years looked ahead when searching for the next vacation start/end
+    MAX_LOOKAHEAD_YEARS: int = 2
+    # Format of rule dates, with year (one-off, e.g. 2026-12-24) or without year (every year, e.g. 12-24)
+    DATE_REGEX: re.Pattern = re.compile(r"^(?:(\d{4})-)?(\d{1,2})-(\d{1,2})$")
+
+
+class VacationRule(ABC):
+    """
+    Rule generating vacation days. Exclusion rules remove the days they generate instead of adding them.
+    Rules are built from dictionaries (e.g. in the configuration):
+        {"begin": "12-24", "end": "01-06"}      -> From December 24th to January 6th, every year
+        {"begin": "2026-08-03", "end": "2026-08-21"} -> Only in 2026
+        {"begin": "12-24"}                      -> Single day
+        {"easter": 1}                           -> Easter Monday
+        {"easter": -2, "days": 4}               -> From Good Friday to Easter Monday
+        {"ics": "holidays.ics"}                 -> Events of an iCalendar file
+        {"begin": "2026-12-20", "exclude": true}  -> Not a vacation day, even if generated by other rules
+    """
+
+    exclude: bool
+
+    def __init__(
+        self,
+        exclude: bool
+    ) -> None:
+        """
+        Initialize the rule.
+
+        Args:
+            exclude: True if the rule removes days, False if it adds them.
+        """
+        self.exclude = exclude
+
+    @staticmethod
+    def FromDict(
+        rule: Dict[str, Any],
+        today: Optional[date] = None
+    ) -> "VacationRule":
+        """
+        Build a rule from a dictionary.
+
+        Args:
+            rule: The rule dictionary.
+            today: The current day (used by iCalendar rules to expand the current and next year when built,
+                   if None they are expanded when requested).
+
+        Returns:
+            The rule.
+
+        Raises:
+            ValueError: If the rule is not valid.
+        """
+        keys = VacationRule.__Keys(rule)
+        exclude = rule.get("exclude", False)
+        if keys == {"ics"}:
+            return VacationIcsRule(rule["ics"], exclude, today)
+        if keys in ({"easter"}, {"easter", "days"}):
+            return VacationEasterRule(rule["easter"], rule.get("days", 1), exclude)
+        if keys in ({"begin"}, {"begin", "end"}):
+            return VacationDateRangeRule(rule["begin"], rule.get("end", rule["begin"]), exclude)
+        raise ValueError(f"invalid rule keys {sorted(rule)}")
+
+    @staticmethod
+    def Validate(
+        rule: Any
+    ) -> None:
+        """
+        Validate a rule dictionary without reading files, i.e. the file of iCalendar rules is only read
+        when the rule is built.
+
+        Args:
+            rule: The rule dictionary.
+
+        Raises:
+            ValueError: If the rule is not valid.
+        """
+        if VacationRule.__Keys(rule) == {"ics"}:
+            VacationIcsRule.ValidateFileName(rule["ics"])
+        else:
+            VacationRule.FromDict(rule)
+
+    @staticmethod
+    def __Keys(
+        rule: Any
+    ) -> Set[str]:
+        """
+        Check that a rule is a dictionary with a valid exclude flag and get its keys.
+
+        Args:
+            rule: The rule dictionary.
+
+        Returns:
+            The rule keys, except the exclude flag.
+
+        Raises:
+            ValueError: If the rule is not a dictionary or the exclude flag is not valid.
+        """
+        if not isinstance(rule, dict):
+            raise ValueError("rule shall be a dictionary")
+        if not isinstance(rule.get("exclude", False), bool):
+            raise ValueError("exclude shall be a boolean")
+        return set(rule) - {"exclude"}
+
+    @abstractmethod
+    def Days(
+        self,
+        year: int
+    ) -> Iterable[int]:
+        """
+        Get the days generated by the rule in a year.
+
+        Args:
+            year: The year.
+
+        Returns:
+            The day ordinals.
+        """
+
+    @abstractmethod
+    def Key(self) -> Tuple[Any, ...]:
+        """
+        Get the parameters of the rule, to know if two rules generate the same days.
+
+        Returns:
+            The rule parameters.
+        """
+
+    @staticmethod
+    def YearDays(
+        begin: date,
+        end: date,
+        year: int
+    ) -> range:
+        """
+        Get the ordinals of the days between two dates that belong to a year.
+
+        Args:
+            begin: The first day.
+            end: The day after the last one.
+            year: The year.
+
+        Returns:
+            The day ordinals.
+        """
+        return range(max(begin.toordinal(), date(year, 1, 1).toordinal()),
+                     min(end.toordinal(), date(year + 1, 1, 1).toordinal()))
+
+    @staticmethod
+    def Date(
+        year: int,
+        month: int,
+        day: int
+    ) -> date:
+        """
+        Get a date, using the last day of the month if the day doesn't exist in the year (i.e. February 29th).
+
+        Args:
+            year: The year.
+            month: The month.
+            day: The day.
+
+        Returns:
+            The date.
+        """
+        return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+class VacationDateRangeRule(VacationRule):
+    """Rule generating a range of days, one-off or repeated every year."""
+
+    begin: Tuple[Optional[int], int, int]
+    end: Tuple[Optional[int], int, int]
+
+    def __init__(
+        self,
+        begin: Any,
+        end: Any,
+        exclude: bool
+    ) -> None:
+        """
+        Initialize the rule.
+
+        Args:
+            begin: The first day (YYYY-MM-DD or MM-DD).
+            end: The last day, with the same format of the first one.
+            exclude: True if the rule removes days, False if it adds them.
+
+        Raises:
+            ValueError: If the dates are not valid.
+        """
+        super().__init__(exclude)
+        self.begin = self.__ParseDate(begin)
+        self.end = self.__ParseDate(end)
+        if (self.begin[0] is None) != (self.end[0] is None):
+            raise ValueError("begin and end shall both have the year or not")
+        if self.begin[0] is not None and self.begin > self.end:
+            raise ValueError("begin shall not be after end")
+
+    def Days(
+        self,
+        year: int
+    ) -> Iterable[int]:
+        """
+        Get the days generated by the rule in a year.
+
+        Args:
+            year: The year.
+
+        Returns:
+            The day ordinals.
+        """
+        begin_year, begin_month, begin_day = self.begin
+        end_year, end_month, end_day = self.end
+        if begin_year is not None and end_year is not None:
+            return self.YearDays(date(begin_year, begin_month, begin_day),
+                                 date(end_year, end_month, end_day) + timedelta(days=1),
+                                 year)
+
+        # Recurring ranges can go across the year end (e.g. from December to January)
+        days: List[int] = []
+        for range_year in (year - 1, year):
+            end_range_year = range_year + 1 if (end_month, end_day) < (begin_month, begin_day) else range_year
+            days.extend(self.YearDays(self.Date(range_year, begin_month, begin_day),
+                                      self.Date(end_range_year, end_month, end_day) + timedelta(days=1),
+                                      year))
+        return days
+
+    def Key(self) -> Tuple[Any, ...]:
+        """
+        Get the parameters of the rule, to know if two rules generate the same days.
+
+        Returns:
+            The rule parameters.
+        """
+        return "range", self.exclude, self.begin, self.end
+
+    @staticmethod
+    def __ParseDate(
+        value: Any
+    ) -> Tuple[Optional[int], int, int]:
+        """
+        Parse a date.
+
+        Args:
+            value: The date (YYYY-MM-DD or MM-DD).
+
+        Returns:
+            The year (None if not specified), month and day.
+
+        Raises:
+            ValueError: If the date is not valid.
+        """
+        match = VacationCalendarConst.DATE_REGEX.match(value) if isinstance(value, str) else None
+        if match is None:
+            raise ValueError(f"invalid date {value}, YYYY-MM-DD or MM-DD expected")
+        year = int(match.group(1)) if match.group(1) is not None else None
+        month, day = int(match.group(2)), int(match.group(3))
+        try:
+            # Leap year if not specified, so that February 29th is valid
+            date(year if year is not None else 2000, month, day)
+        except ValueError as ex:
+            raise ValueError(f"invalid date {value}: {ex}") from ex
+        return year, month, day
+
+
+class VacationEasterRule(VacationRule):
+    """Rule generating days relative to Easter Sunday (Gregorian calendar)."""
+
+    days_num: int
+    offset: int
+
+    def __init__(
+        self,
+        offset: Any,
+        days_num: Any,
+        exclude: bool
+    ) -> None:
+        """
+        Initialize the rule.
+
+        Args:
+            offset: The offset of the first day from Easter Sunday, in days (e.g. 1 for Easter Monday).
+            days_num: The number of days.
+            exclude: True if the rule removes days, False if it adds them.
+
+        Raises:
+            ValueError: If the parameters are not valid.
+        """
+        super().__init__(exclude)
+        if not isinstance(offset, int) or isinstance(offset, bool) or abs(offset) > 200:
+            raise ValueError("easter shall be an integer between -200 and 200")
+        if not isinstance(days_num, int) or isinstance(days_num, bool) or not 1 <= days_num <= 100:
+            raise ValueError("days shall be an integer between 1 and 100")
+        self.offset = offset
+        self.days_num = days_num
+
+    def Days(
+        self,
+        year: int
+    ) -> Iterable[int]:
+        """
+        Get the days generated by the rule in a year.
+
+        Args:
+            year: The year.
+
+        Returns:
+            The day ordinals.
+        """
+        begin = self.Easter(year) + timedelta(days=self.offset)
+        return self.YearDays(begin, begin + timedelta(days=self.days_num), year)
+
+    def Key(self) -> Tuple[Any, ...]:
+        """
+        Get the parameters of the rule, to know if two rules generate the same days.
+
+        Returns:
+            The rule parameters.
+        """
+        return "easter", self.exclude, self.offset, self.days_num
+
+    @staticmethod
+    def Easter(
+        year: int
+    ) -> date:
+        """
+        Get the Easter Sunday of a year (anonymous Gregorian algorithm).
+
+        Args:
+            year: The year.
+
+        Returns:
+            The Easter Sunday date.
+        """
+        a = year % 19
+        b, c = divmod(year, 100)
+        d, e = divmod(b, 4)
+        f = (b + 8) // 25
+        g = (b - f + 1) // 3
+        h = (19 * a + b - d - g + 15) % 30
+        i, k = divmod(c, 4)
+        n = (32 + 2 * e + 2 * i - h - k) % 7
+        m = (a + 11 * h + 22 * n) // 451
+        month, day = divmod(h + n - 7 * m + 114, 31)
+        return date(year, month, day + 1)
+
+
+class VacationIcsRule(VacationRule):
+    """
+    Rule generating the days of the events of an iCalendar (.ics) file, with recurring events expanded.
+    The current and next year are expanded when the rule is built (if the current day is known),
+    other years when they are requested.
+    """
+
+    file_name: str
+    ics_calendar: IcsCalendar
+
+    def __init__(
+        self,
+        file_name: Any,
+        exclude: bool,
+        today: Optional[date] = None
+    ) -> None:
+        """
+        Initialize the rule, reading the events from the file.
+
+        Args:
+            file_name: The iCalendar file name.
+            exclude: True if the rule removes days, False if it adds them.
+            today: The current day (if None, no year is expanded when the rule is built).
+
+        Raises:
+            ValueError: If the file cannot be read or it's not valid.
+        """
+        super().__init__(exclude)
+        self.file_name = self.ValidateFileName(file_name)
+        self.ics_calendar = IcsCalendar.Open(file_name, BotConfig.ICS_CACHE_DIR)
+        if today is not None:
+            self.ics_calendar.Expand(range(today.year, today.year + 2))
+
+    @staticmethod
+    def ValidateFileName(
+        file_name: Any
+    ) -> str:
+        """
+        Validate the file name of the rule.
+
+        Args:
+            file_name: The iCalendar file name.
+
+        Returns:
+            The file name.
+
+        Raises:
+            ValueError: If the file name is not valid.
+        """
+        if not isinstance(file_name, str):
+            raise ValueError("ics shall be a file name")
+        return file_name
+
+    def Days(
+        self,
+        year: int
+    ) -> Iterable[int]:
+        """
+        Get the days generated by the rule in a year.
+
+        Args:
+            year: The year.
+
+        Returns:
+            The day ordinals.
+        """
+        return [
+            day
+            for begin, end in self.ics_calendar.Events(year)
+            for day in self.YearDays(date.fromordinal(begin), date.fromordinal(end), year)
+        ]
+
+    def Key(self) -> Tuple[Any, ...]:
+        """
+        Get the parameters of the rule, to know if two rules generate the same days.
+
+        Returns:
+            The rule parameters.
+        """
+        return "ics", self.exclude, self.file_name, self.ics_calendar.file_hash
+
+
+class VacationCalendar:
+    """
+    Vacation calendar, combining week days, dates and rules.
+    Vacation days are computed once per year as a set of day ordinals, so that checking a day is a set lookup,
+    and vacation starts/ends are searched with a binary search in the sorted days.
+    """
+
+    dates: FrozenSet[Tuple[int, int]]
+    rules: Tuple[VacationRule, ...]
+    week_days: FrozenSet[int]
+    years: Dict[int, Tuple[FrozenSet[int], List[int]]]
+
+    def __init__(
+        self,
+        week_days: Iterable[int],
+        dates: Dict[int, List[int]],
+        rules: Iterable[Dict[str, Any]],
+        today: date
+    ) -> None:
+        """
+        Build the calendar.
+
+        Args:
+            week_days: Vacation days of the week (0: Monday, ..., 6: Sunday).
+            dates: Vacation dates repeated every year, as a dictionary from months to lists of days.
+            rules: Vacation rules (see VacationRule).
+            today: The current day.
+
+        Raises:
+            ValueError: If a rule is not valid.
+        """
+        self.week_days = frozenset(week_days)
+        self.dates = frozenset((month, day) for month, days in dates.items() for day in days)
+        # Exclusion rules are applied last
+        self.rules = tuple(
+            sorted((VacationRule.FromDict(rule, today) for rule in rules), key=lambda rule: rule.exclude)
+        )
+        self.years = {}
+
+    def IsVacationDay(
+        self,
+        day: date
+    ) -> bool:
+        """
+        Check if a day is a vacation day.
+
+        Args:
+            day: The day.
+
+        Returns:
+            True if the day is a vacation day, False otherwise.
+        """
+        return day.toordinal() in self.__YearDays(day.year)[0]
+
+    def NextVacationStart(
+        self,
+        day: date
+    ) -> Optional[date]:
+        """
+        Get the first day of the next vacation period starting after the specified day.
+
+        Args:
+            day: The day.
+
+        Returns:
+            The first vacation day, None if there is no vacation period in the lookahead period.
+        """
+        ordinal = day.toordinal()
+        for year in range(day.year, day.year + VacationCalendarConst.MAX_LOOKAHEAD_YEARS + 1):
+            _, sorted_days = self.__YearDays(year)
+            for i in range(bisect.bisect_right(sorted_days, ordinal), len(sorted_days)):
+                if not self.__IsVacationOrdinal(sorted_days[i] - 1):
+                    return date.fromordinal(sorted_days[i])
+        return None
+
+    def NextVacationEnd(
+        self,
+        day: date
+    ) -> Optional[date]:
+        """
+        Get the day after the last one of the next vacation period ending after the specified day.
+
+        Args:
+            day: The day.
+
+        Returns:
+            The first day after the vacation period, None if there is no vacation period in the lookahead period.
+        """
+        ordinal = day.toordinal()
+        for year in range(day.year, day.year + VacationCalendarConst.MAX_LOOKAHEAD_YEARS + 1):
+            _, sorted_days = self.__YearDays(year)
+            for i in range(bisect.bisect_left(sorted_days, ordinal), len(sorted_days)):
+                if not self.__IsVacationOrdinal(sorted_days[i] + 1):
+                    return date.fromordinal(sorted_days[i] + 1)
+        return None
+
+    def Key(self) -> Tuple[Any, ...]:
+        """
+        Get the parameters of the calendar, to know if two calendars have the same vacation days.
+
+        Returns:
+            The calendar parameters.
+        """
+        return self.week_days, self.dates, tuple(rule.Key() for rule in self.rules)
+
+    def __IsVacationOrdinal(
+        self,
+        ordinal: int
+    ) -> bool:
+        """
+        Check if a day is a vacation day.
+
+        Args:
+            ordinal: The day ordinal.
+
+        Returns:
+            True if the day is a vacation day, False otherwise.
+        """
+        return ordinal in self.__YearDays(date.fromordinal(ordinal).year)[0]
+
+    def __YearDays(
+        self,
+        year: int
+    ) -> Tuple[FrozenSet[int], List[int]]:
+        """
+        Get the vacation days of a year, computing them the first time.
+
+        Args:
+            year: The year.
+
+        Returns:
+            The vacation day ordinals, as set and sorted list.
+        """
+        year_days = self.years.get(year)
+        if year_days is None:
+            year_days = self.__ComputeYearDays(year)
+            self.years[year] = year_days
+        return year_days
+
+    def __ComputeYearDays(
+        self,
+        year: int
+    ) -> Tuple[FrozenSet[int], List[int]]:
+        """
+        Compute the vacation days of a year.
+
+        Args:
+            year: The year.
+
+        Returns:
+            The vacation day ordinals, as set and sorted list.
+        """
+        first_day = date(year, 1, 1)
+        last_ordinal = date(year, 12, 31).toordinal()
+
+        days: Set[int] = set()
+        for week_day in self.week_days:
+            days.update(range(first_day.toordinal() + (week_day - first_day.weekday()) % 7, last_ordinal + 1, 7))
+        for month, day in self.dates:
+            if day <= calendar.monthrange(year, month)[1]:
+                days.add(date(year, month, day).toordinal())
+        for rule in self.rules:
+            if rule.exclude:
+                days.difference_update(rule.Days(year))
+            else:
+                days.update(rule.Days(year))
+        return frozenset(days), sorted(days)
@@ -18,40 +18,76 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import asyncio
 import logging
-from typing import List
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
 import pyrogram
-from apscheduler.jobstores.base import ConflictingIdError, JobLookupError
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from pyrogram.errors import FloodWait
 
 from telegram_night_vacation_bot.bot_config import BotConfig
 from telegram_night_vacation_bot.bot_msg import BotMessages
 from telegram_night_vacation_bot.bot_type import BotTypes
+from telegram_night_vacation_bot.clock import Clock
+from telegram_night_vacation_bot.deletion_queue import DeletionQueue
+from telegram_night_vacation_bot.enforcer import Enforcer
+from telegram_night_vacation_bot.message_filter import MessageFilter
+from telegram_night_vacation_bot.metrics import BotMetrics
+from telegram_night_vacation_bot.night_vacation_policy import NightVacationPolicy
+from telegram_night_vacation_bot.state_store import NotificationTypes, StateStore
 from telegram_night_vacation_bot.telegram_client import TelegramClient
-from telegram_night_vacation_bot.utils import Utils
 
 
 class VacationNightConst:
     """Constants for vacation and night mode job scheduling."""
 
-    NOTIFY_NIGHT_JOB_ID: str = "notify_night_job"
-    NOTIFY_VACATION_JOB_ID: str = "notify_vacation_job"
+    TRANSITION_JOB_ID: str = "transition_job"
+    SAVE_PROCESSED_MSG_IDS_JOB_ID: str = "save_processed_msg_ids_job"
+    # Maximum number of notifications sent at the same time
+    NOTIFY_MAX_CONCURRENCY: int = 10
+    # Number of messages got with a single API call during catch-up (Telegram limit)
+    CATCH_UP_BATCH_SIZE: int = 200
+    # Maximum number of messages checked in each chat during catch-up
+    CATCH_UP_MAX_MSGS: int = 10000
+    # Maximum number of consecutive batches without messages before stopping, if no message was received live
+    CATCH_UP_MAX_EMPTY_BATCHES: int = 5
+    # Time (in seconds) to wait after a disconnection before catching up, and between retries
+    CATCH_UP_RETRY_DELAY_SEC: float = 5.0
+    CATCH_UP_MAX_RETRIES: int = 5
+    # Period (in seconds) for saving the ID of the last processed messages
+    PROCESSED_MSG_IDS_SAVE_PERIOD_SEC: float = 30.0
 
 
 class VacationNight:
     """Manages vacation and night mode functionality."""
 
     bot_type: BotTypes
-    last_night_msg_ids: List[int]
-    last_vacation_msg_ids: List[int]
+    catch_up_task: Optional["asyncio.Task[None]"]
+    clock: Clock
+    deletion_queue: DeletionQueue
+    enforce_tasks: Set["asyncio.Task[None]"]
+    enforcer: Enforcer
+    is_running: bool
+    last_night_msg_ids: Dict[int, Dict[int, List[int]]]
+    last_processed_msg_ids: Dict[int, int]
+    last_vacation_msg_ids: Dict[int, List[int]]
+    message_filter: MessageFilter
+    policies: Dict[int, NightVacationPolicy]
+    reload_lock: asyncio.Lock
+    saved_processed_msg_ids: Dict[int, int]
     scheduler: AsyncIOScheduler
+    state_store: StateStore
     tg_client: TelegramClient
 
     def __init__(
         self,
         bot_type: BotTypes,
-        tg_client: TelegramClient
+        tg_client: TelegramClient,
+        clock: Optional[Clock] = None
     ) -> None:
         """
         Initialize the vacation/night mode manager.
@@ -59,15 +95,40 @@ class VacationNight:
         Args:
             bot_type: The type of bot (TEST or NORMAL).
             tg_client: The Telegram client instance.
+            clock: The clock used to get the current time (if None, the system time is used).
         """
         self.bot_type = bot_type
+        self.catch_up_task = None
+        self.clock = clock if clock is not None else Clock()
         self.tg_client = tg_client
-        self.last_night_msg_ids = []
-        self.last_vacation_msg_ids = []
+        self.deletion_queue = DeletionQueue(tg_client, self.clock)
+        self.enforce_tasks = set()
+        self.is_running = False
+        self.last_night_msg_ids = {}
+        self.last_processed_msg_ids = {}
+        self.last_vacation_msg_ids = {}
+        self.policies = NightVacationPolicy.FromConfig(self.clock)
+        self.reload_lock = asyncio.Lock()
+        self.saved_processed_msg_ids = {}
+        # In test mode, all group messages are handled to be logged
+        self.message_filter = MessageFilter(self.last_processed_msg_ids, bot_type.IsTest())
+        self.message_filter.Compile(self.policies)
+        self.message_filter.SetDropAll(not bot_type.IsTest())
         self.scheduler = AsyncIOScheduler()
+        self.state_store = StateStore(BotConfig.STATE_FILE_NAME)
+        self.enforcer = Enforcer(tg_client, self.state_store)
 
     async def Init(self) -> None:
-        """Initialize and start the scheduler."""
+        """
+        Load the notification messages sent and the last messages processed before the last restart,
+        and start the scheduler.
+        """
+        self.state_store.Open()
+        for chat_id in self.policies:
+            self.last_night_msg_ids[chat_id] = self.state_store.GetTopicMessageIds(NotificationTypes.NIGHT, chat_id)
+            self.last_vacation_msg_ids[chat_id] = self.state_store.GetMessageIds(NotificationTypes.VACATION, chat_id)
+        self.saved_processed_msg_ids = self.state_store.GetLastProcessedMessageIds()
+        self.last_processed_msg_ids.update(self.saved_processed_msg_ids)
         self.scheduler.start()
 
     async def Start(
@@ -76,28 +137,29 @@ class VacationNight:
     ) -> None:
         """
         Start the vacation/night mode monitoring.
+        If the bot was restarted while running, the messages sent in the meantime are checked in background.
 
         Args:
             message: The message that triggered the start command.
         """
-        try:
-            self.scheduler.add_job(
-                self.__NotifyNight,
-                "cron",
-                args=(BotConfig.CHAT_ID,),
-                hour="*",
-                id=VacationNightConst.NOTIFY_NIGHT_JOB_ID
-            )
-            self.scheduler.add_job(
-                self.__NotifyVacation,
-                "cron",
-                args=(BotConfig.CHAT_ID,),
-                hour=0,
-                id=VacationNightConst.NOTIFY_VACATION_JOB_ID
-            )
-            await self.tg_client.SendMessageQuick(message, BotMessages.BOT_STARTED)
-        except ConflictingIdError:
+        if self.is_running:
             await self.tg_client.SendMessageQuick(message, BotMessages.BOT_ALREADY_STARTED)
+            return
+
+        self.is_running = True
+        self.message_filter.SetDropAll(False)
+        now = self.clock.Now(timezone.utc)
+        self.__ScheduleNextTransition(now)
+        self.scheduler.add_job(
+            self.__SaveProcessedMessageIds,
+            "interval",
+            seconds=VacationNightConst.PROCESSED_MSG_IDS_SAVE_PERIOD_SEC,
+            id=VacationNightConst.SAVE_PROCESSED_MSG_IDS_JOB_ID,
+            replace_existing=True
+        )
+        await self.tg_client.SendMessageQuick(message, BotMessages.BOT_STARTED)
+        self.__StartCatchUp(0.0)
+        await self.__Enforce(now)
 
     async def Stop(
         self,
@@ -109,12 +171,49 @@ class VacationNight:
         Args:
             message: The message that triggered the stop command.
         """
-        try:
-            self.scheduler.remove_job(VacationNightConst.NOTIFY_NIGHT_JOB_ID)
-            self.scheduler.remove_job(VacationNightConst.NOTIFY_VACATION_JOB_ID)
-            await self.tg_client.SendMessageQuick(message, BotMessages.BOT_STOPPED)
-        except JobLookupError:
+        if not self.is_running:
             await self.tg_client.SendMessageQuick(message, BotMessages.BOT_ALREADY_STOPPED)
+            return
+
+        self.is_running = False
+        self.message_filter.SetDropAll(not self.bot_type.IsTest())
+        for job_id in (VacationNightConst.TRANSITION_JOB_ID, VacationNightConst.SAVE_PROCESSED_MSG_IDS_JOB_ID):
+            try:
+                self.scheduler.remove_job(job_id)
+            except JobLookupError:
+                pass
+        if self.catch_up_task is not None:
+            self.catch_up_task.cancel()
+            self.catch_up_task = None
+        # Messages sent while stopped shall not be caught up when started again
+        self.last_processed_msg_ids.clear()
+        self.__SaveProcessedMessageIds()
+        await self.deletion_queue.FlushAll()
+        await self.tg_client.SendMessageQuick(message, BotMessages.BOT_STOPPED)
+        if not self.bot_type.IsTest():
+            await self.enforcer.Release(self.policies.keys())
+        # Closed after the last writes, it is opened again when used (e.g. when started again)
+        self.state_store.Close()
+
+    async def Shutdown(self) -> None:
+        """Delete the messages still pending in the deletion queue and close the state store, before the bot is stopped."""
+        await self.deletion_queue.FlushAll()
+        self.state_store.Close()
+
+    async def ReloadConfig(self) -> None:
+        """
+        Rebuild the policies from the bot configuration and swap them with the current ones.
+        The policies are built in a worker thread (e.g. iCalendar files are read), so that messages are still
+        handled in the meantime, and only swapped in the event loop.
+        The next transition is rescheduled only if the schedule changed, topics and chats are closed or reopened
+        in background according to the new policies.
+        """
+        # Reloads are serialized, so that policies built from an older configuration never replace newer ones
+        async with self.reload_lock:
+            policies = await asyncio.get_event_loop().run_in_executor(
+                None, NightVacationPolicy.FromConfig, self.clock
+            )
+            self.__SwapPolicies(policies)
 
     async def Status(
         self,
@@ -126,7 +225,7 @@ class VacationNight:
         Args:
             message: The message that triggered the status command.
         """
-        if self.__IsRunning():
+        if self.is_running:
             await self.tg_client.SendMessageQuick(message, BotMessages.BOT_STATUS_RUNNING)
         else:
             await self.tg_client.SendMessageQuick(message, BotMessages.BOT_STATUS_STOPPED)
@@ -141,10 +240,16 @@ class VacationNight:
         Args:
             message: The message that triggered the night status command.
         """
-        if self.__IsNight():
-            await self.tg_client.SendMessageQuick(message, BotMessages.NIGHT_MODE_ACTIVE)
-        else:
-            await self.tg_client.SendMessageQuick(message, BotMessages.NIGHT_MODE_NOT_ACTIVE)
+        await self.tg_client.SendMessageQuick(
+            message,
+            "\n".join(
+                self.__ChatStatus(
+                    policy,
+                    BotMessages.NIGHT_MODE_ACTIVE if policy.IsNight() else BotMessages.NIGHT_MODE_NOT_ACTIVE
+                )
+                for policy in self.__PoliciesForMessage(message)
+            )
+        )
 
     async def VacationStatus(
         self,
@@ -156,10 +261,16 @@ class VacationNight:
         Args:
             message: The message that triggered the vacation status command.
         """
-        if self.__IsVacationDay():
-            await self.tg_client.SendMessageQuick(message, BotMessages.VACATION_MODE_ACTIVE)
-        else:
-            await self.tg_client.SendMessageQuick(message, BotMessages.VACATION_MODE_NOT_ACTIVE)
+        await self.tg_client.SendMessageQuick(
+            message,
+            "\n".join(
+                self.__ChatStatus(
+                    policy,
+                    BotMessages.VACATION_MODE_ACTIVE if policy.IsVacationDay() else BotMessages.VACATION_MODE_NOT_ACTIVE
+                )
+                for policy in self.__PoliciesForMessage(message)
+            )
+        )
 
     async def TestVacation(
         self,
@@ -171,7 +282,10 @@ class VacationNight:
         Args:
             message: The message that triggered the test command.
         """
-        await self.__NotifyVacation(BotConfig.CHAT_ID, True)
+        now = self.clock.Now(timezone.utc)
+        await asyncio.gather(
+            *[self.__NotifyVacation(policy, now, True) for policy in self.__PoliciesForMessage(message)]
+        )
 
     async def TestNight(
         self,
@@ -183,52 +297,195 @@ class VacationNight:
         Args:
             message: The message that triggered the test command.
         """
-        await self.__NotifyNight(BotConfig.CHAT_ID, True)
+        now = self.clock.Now(timezone.utc)
+        await asyncio.gather(
+            *[self.__NotifyNight(policy, now) for policy in self.__PoliciesForMessage(message)]
+        )
 
     async def OnMessage(
         self,
         message: pyrogram.types.Message
     ) -> None:
         """
-        Handle incoming messages and delete if necessary.
+        Handle incoming messages and queue them for deletion if necessary.
+        Messages are prefiltered by the message filter, after being tracked by its tracker (see MessageFilter).
 
         Args:
             message: The incoming message.
         """
-        if not self.__IsRunning():
+        if not self.is_running:
             return
-        if not self.__IsNight() and not self.__IsVacationDay():
+
+        policy = self.policies.get(self.tg_client.GetChatIdFromMessage(message))
+        if policy is not None:
+            self.__ProcessMessage(message, policy)
+
+    def OnDisconnect(self) -> None:
+        """Handle a disconnection, checking in background the messages sent until the connection is restored."""
+        if self.is_running and self.catch_up_task is None:
+            logging.warning("Disconnected, catching up when reconnected")
+            self.__StartCatchUp(VacationNightConst.CATCH_UP_RETRY_DELAY_SEC)
+
+    def __ProcessMessage(
+        self,
+        message: pyrogram.types.Message,
+        policy: NightVacationPolicy,
+        caught_up: bool = False
+    ) -> None:
+        """
+        Queue a message for deletion if it was sent while its topic was closed.
+
+        Args:
+            message: The message.
+            policy: The policy of the message chat.
+            caught_up: True if the message is checked during catch-up (for logging).
+        """
+        chat_id = policy.chat_id
+        topic_id = self.tg_client.GetTopicIdFromMessage(message)
+        if not policy.ShallMessageBeDeleted(topic_id, message.date):
             return
-        if not self.__IsUserValid(message):
+        if not self.__IsUserValid(message, policy):
             return
 
-        chat_id = self.tg_client.GetChatIdFromMessage(message)
-        topic_id = self.tg_client.GetTopicIdFromMessage(message)
-        if self.__ShallMessageBeDeleted(chat_id, topic_id):
-            user_id = self.tg_client.GetUserIdFromMessage(message)
-            logging.info(f"Deleted message {message.id} from user: {user_id}, chat ID: {chat_id}, topic ID: {topic_id}")
-            if not self.bot_type.IsTest():
-                await self.tg_client.DeleteMessages(message.chat.id, [message.id])
+        user_id = self.tg_client.GetUserIdFromMessage(message)
+        BotMetrics.MESSAGES_DELETED.Inc()
+        logging.info(
+            "Deleted %smessage %d from user: %d, chat ID: %d, topic ID: %d",
+            "caught up " if caught_up else "", message.id, user_id, chat_id, topic_id
+        )
+        if not self.bot_type.IsTest():
+            self.deletion_queue.Add(chat_id, message.id)
+
+    def __SaveProcessedMessageIds(self) -> None:
+        """Save the ID of the last processed messages, if changed since the last time."""
+        if self.last_processed_msg_ids != self.saved_processed_msg_ids:
+            self.saved_processed_msg_ids = dict(self.last_processed_msg_ids)
+            self.state_store.SetLastProcessedMessageIds(self.saved_processed_msg_ids)
+
+    def __StartCatchUp(
+        self,
+        delay: float
+    ) -> None:
+        """
+        Start checking in background the messages sent after the last processed ones, if not already doing it.
 
-    def __IsRunning(self) -> bool:
+        Args:
+            delay: Time (in seconds) to wait before starting.
         """
-        Check if the scheduler jobs are running.
+        if self.catch_up_task is not None or len(self.last_processed_msg_ids) == 0:
+            return
+        # Messages received from now on are handled live, so they limit the ones to be caught up
+        self.message_filter.ResetFirstMessageIds()
+        self.catch_up_task = asyncio.ensure_future(self.__CatchUp(dict(self.last_processed_msg_ids), delay))
 
-        Returns:
-            True if both jobs are running, False otherwise.
+    async def __CatchUp(
+        self,
+        from_msg_ids: Dict[int, int],
+        delay: float
+    ) -> None:
         """
-        return (self.scheduler.get_job(VacationNightConst.NOTIFY_NIGHT_JOB_ID) is not None and
-                self.scheduler.get_job(VacationNightConst.NOTIFY_VACATION_JOB_ID) is not None)
+        Check the messages sent after the specified ones in each chat, deleting them if they were sent while
+        their topics were closed. In case of errors (e.g. still disconnected), it's retried after a delay.
+
+        Args:
+            from_msg_ids: ID of the last processed message keyed by chat ID.
+            delay: Time (in seconds) to wait before starting.
+        """
+        try:
+            for retry_num in range(VacationNightConst.CATCH_UP_MAX_RETRIES + 1):
+                await self.clock.Sleep(delay)
+                try:
+                    for chat_id in list(from_msg_ids):
+                        await self.__CatchUpChat(chat_id, from_msg_ids)
+                    break
+                except Exception as ex:
+                    logging.error(
+                        "Unable to catch up messages (retry %d/%d): %s", retry_num, VacationNightConst.CATCH_UP_MAX_RETRIES, ex
+                    )
+                delay = VacationNightConst.CATCH_UP_RETRY_DELAY_SEC
+            self.__SaveProcessedMessageIds()
+        finally:
+            self.catch_up_task = None
+
+    async def __CatchUpChat(
+        self,
+        chat_id: int,
+        from_msg_ids: Dict[int, int]
+    ) -> None:
+        """
+        Check the messages of a chat sent after the last processed one, in batches, until the first message received
+        live (which is handled by OnMessage). If no message was received live yet, it stops after some consecutive
+        batches without messages. The last processed message ID is updated after each batch, so that a retry
+        continues from it.
+        Only supergroups are caught up, since messages of basic groups cannot be got by chat.
+
+        Args:
+            chat_id: The chat ID.
+            from_msg_ids: ID of the last processed message keyed by chat ID.
+        """
+        policy = self.policies.get(chat_id)
+        if policy is None:
+            del from_msg_ids[chat_id]
+            return
+        if not self.tg_client.IsSupergroupChatId(chat_id):
+            logging.warning("Chat %d is not a supergroup, messages cannot be caught up", chat_id)
+            del from_msg_ids[chat_id]
+            return
+
+        start_time = time.monotonic()
+        first_msg_id = from_msg_ids[chat_id] + 1
+        checked_msgs_num = 0
+        empty_batches_num = 0
+        while (from_msg_ids[chat_id] - first_msg_id < VacationNightConst.CATCH_UP_MAX_MSGS
+               and empty_batches_num < VacationNightConst.CATCH_UP_MAX_EMPTY_BATCHES):
+            batch_first_msg_id = from_msg_ids[chat_id] + 1
+            end_msg_id = self.message_filter.first_msg_ids.get(chat_id)
+            if end_msg_id is not None and batch_first_msg_id >= end_msg_id:
+                break
+            batch_msgs = await self.tg_client.GetMessages(
+                chat_id,
+                list(range(batch_first_msg_id, batch_first_msg_id + VacationNightConst.CATCH_UP_BATCH_SIZE))
+            )
+            # Read again the first live message, since it may have been received in the meantime
+            end_msg_id = self.message_filter.first_msg_ids.get(chat_id)
+            messages = [
+                msg
+                for msg in batch_msgs
+                if not msg.empty and (end_msg_id is None or msg.id < end_msg_id)
+            ]
+            # Gaps (e.g. deleted messages) are skipped if messages were received live after them
+            empty_batches_num = empty_batches_num + 1 if len(messages) == 0 and end_msg_id is None else 0
+
+            for msg in messages:
+                msg_chat_id = self.tg_client.GetChatIdFromMessage(msg)
+                if msg_chat_id != chat_id:
+                    logging.warning(
+                        "Skipped caught up message %d of chat ID %d, expected chat ID: %d", msg.id, msg_chat_id, chat_id
+                    )
+                    continue
+                self.__ProcessMessage(msg, policy, True)
+            checked_msgs_num += len(messages)
+            from_msg_ids[chat_id] = batch_first_msg_id + VacationNightConst.CATCH_UP_BATCH_SIZE - 1
+            if len(messages) != 0:
+                self.last_processed_msg_ids[chat_id] = max(
+                    self.last_processed_msg_ids.get(chat_id, 0), messages[-1].id
+                )
+        del from_msg_ids[chat_id]
+        logging.info(
+            "Caught up %d message(s) in chat %d in %.3fs", checked_msgs_num, chat_id, time.monotonic() - start_time
+        )
 
     def __IsUserValid(
         self,
-        message: pyrogram.types.Message
+        message: pyrogram.types.Message,
+        policy: NightVacationPolicy
     ) -> bool:
         """
         Check if the user should be subject to night/vacation mode.
 
         Args:
             message: The message to check.
+            policy: The policy of the message chat.
 
         Returns:
             True if user is valid for deletion, False if excluded.
@@ -237,153 +494,374 @@ class VacationNight:
         topic_id = self.tg_client.GetTopicIdFromMessage(message)
 
         if self.tg_client.IsUserAnonymous(message):
-            logging.info(f"Anonymous user (chat ID: {chat_id}, topic ID: {topic_id}), skipped")
+            BotMetrics.MESSAGES_SKIPPED_ANONYMOUS.Inc()
+            logging.info("Anonymous user (chat ID: %d, topic ID: %d), skipped", chat_id, topic_id)
             return False
         if self.tg_client.IsUserBot(message):
-            logging.info(f"Bot user (chat ID: {chat_id}, topic ID: {topic_id}), skipped")
+            BotMetrics.MESSAGES_SKIPPED_BOT.Inc()
+            logging.info("Bot user (chat ID: %d, topic ID: %d), skipped", chat_id, topic_id)
             return False
 
         user = self.tg_client.GetUserFromMessage(message)
         user_id = self.tg_client.GetUserIdFromUser(user)
         username = self.tg_client.GetUsernameFromUser(user)
-        if user_id in BotConfig.EXCLUDED_USERS or username in BotConfig.EXCLUDED_USERS:
-            logging.info(f"Excluded user {user_id} (chat ID: {chat_id}, topic ID: {topic_id}), skipped")
+        if policy.IsUserExcluded(user_id, username):
+            BotMetrics.MESSAGES_SKIPPED_EXCLUDED.Inc()
+            logging.info("Excluded user %d (chat ID: %d, topic ID: %d), skipped", user_id, chat_id, topic_id)
             return False
         return True
 
-    @staticmethod
-    def __IsNight() -> bool:
+    def __SwapPolicies(
+        self,
+        policies: Dict[int, NightVacationPolicy]
+    ) -> None:
         """
-        Check if it's currently night time.
+        Swap the current policies with new ones.
 
-        Returns:
-            True if current hour is within night hours, False otherwise.
+        Args:
+            policies: The new policies keyed by chat ID.
+        """
+        schedule_changed = self.__ScheduleKeys(policies) != self.__ScheduleKeys(self.policies)
+        for chat_id in policies.keys() - self.policies.keys():
+            self.last_night_msg_ids[chat_id] = self.state_store.GetTopicMessageIds(NotificationTypes.NIGHT, chat_id)
+            self.last_vacation_msg_ids[chat_id] = self.state_store.GetMessageIds(NotificationTypes.VACATION, chat_id)
+
+        removed_chat_ids = self.policies.keys() - policies.keys()
+        self.policies = policies
+        self.message_filter.Compile(policies)
+        if self.is_running:
+            now = self.clock.Now(timezone.utc)
+            if schedule_changed:
+                self.__ScheduleNextTransition(now)
+            enforce_task = asyncio.ensure_future(self.__Enforce(now, removed_chat_ids))
+            self.enforce_tasks.add(enforce_task)
+            enforce_task.add_done_callback(self.__OnEnforceDone)
+        logging.info("Policies reloaded (schedule changed: %s)", schedule_changed)
+
+    def __OnEnforceDone(
+        self,
+        task: "asyncio.Task[None]"
+    ) -> None:
         """
-        hour = Utils.CurrentHour()
-        return hour >= BotConfig.NIGHT_BEGIN_HOUR or hour < BotConfig.NIGHT_END_HOUR
+        Handle the completion of an enforcement started in background, logging its errors.
+
+        Args:
+            task: The enforcement task.
+        """
+        self.enforce_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logging.error("Unable to enforce the reloaded policies: %s", task.exception())
 
     @staticmethod
-    def __IsNightHour() -> bool:
+    def __ScheduleKeys(
+        policies: Dict[int, NightVacationPolicy]
+    ) -> Dict[int, Tuple[Any, ...]]:
         """
-        Check if current hour is a night boundary hour.
+        Get the schedule parameters of the policies.
+
+        Args:
+            policies: The policies.
 
         Returns:
-            True if current hour is night begin or end hour, False otherwise.
+            Schedule parameters keyed by chat ID.
         """
-        hour = Utils.CurrentHour()
-        return hour in [BotConfig.NIGHT_BEGIN_HOUR, BotConfig.NIGHT_END_HOUR]
+        return {chat_id: policy.ScheduleKey() for chat_id, policy in policies.items()}
 
-    @staticmethod
-    def __IsVacationDay() -> bool:
+    def __PoliciesForMessage(
+        self,
+        message: pyrogram.types.Message
+    ) -> List[NightVacationPolicy]:
         """
-        Check if today is a vacation day.
+        Get the policies a command refers to, i.e. the one of the command chat if managed, all of them otherwise.
+
+        Args:
+            message: The message that triggered the command.
 
         Returns:
-            True if today is a vacation day, False otherwise.
-        """
-        today = Utils.Today()
-        if today.weekday() in BotConfig.VACATION_WEEK_DAYS:
-            return True
-        vacation_dates = BotConfig.VACATION_DATES
-        if today.month in vacation_dates:
-            return today.day in vacation_dates[today.month]
-        return False
-
-    @classmethod
-    def __ShallMessageBeDeleted(
-        cls,
-        chat_id: int,
-        topic_id: int
-    ) -> bool:
+            List of policies.
         """
-        Determine if a message should be deleted based on current mode.
+        policy = self.policies.get(self.tg_client.GetChatIdFromMessage(message))
+        return [policy] if policy is not None else list(self.policies.values())
+
+    def __ChatStatus(
+        self,
+        policy: NightVacationPolicy,
+        status: str
+    ) -> str:
+        """
+        Format the status of a chat, adding the chat ID if more chats are managed.
 
         Args:
-            chat_id: The chat ID.
-            topic_id: The topic ID.
+            policy: The policy of the chat.
+            status: The status message.
 
         Returns:
-            True if message should be deleted, False otherwise.
+            The formatted status.
         """
-        if chat_id != BotConfig.CHAT_ID:
-            return False
-        if cls.__IsNight():
-            return topic_id in BotConfig.NIGHT_TOPIC_IDS
-        if cls.__IsVacationDay():
-            return topic_id in BotConfig.VACATION_TOPIC_IDS
-        return False
+        if len(self.policies) == 1:
+            return status
+        return BotMessages.CHAT_STATUS.format(chat_id=policy.chat_id, status=status)
 
-    async def __NotifyNight(
+    def __ScheduleNextTransition(
         self,
-        chat_id: int,
-        force: bool = False
-    ) -> bool:
+        now: datetime
+    ) -> None:
         """
-        Send night mode notifications to configured topics.
+        Schedule a job for the first night/vacation transition of all chats after the specified time.
 
         Args:
-            chat_id: The chat ID to send notifications to.
-            force: Force notification regardless of time.
+            now: The date and time.
+        """
+        transitions = [
+            transition
+            for transition in (policy.NextTransition(now) for policy in self.policies.values())
+            if transition is not None
+        ]
+        if len(transitions) == 0:
+            return
 
-        Returns:
-            True if notification was sent, False otherwise.
+        next_transition = min(transitions)
+        self.scheduler.add_job(
+            self.__OnTransition,
+            "date",
+            args=(next_transition,),
+            run_date=next_transition,
+            id=VacationNightConst.TRANSITION_JOB_ID,
+            misfire_grace_time=None,
+            replace_existing=True
+        )
+        logging.info("Next transition scheduled at %s", next_transition)
+
+    async def __OnTransition(
+        self,
+        transition_time: datetime
+    ) -> None:
         """
-        if not force and not self.__IsNightHour():
-            return False
+        Send the notifications of all the chats having a transition at the specified time, then schedule the next one.
+        Topics are reopened before the notifications and closed after them, so that they can be read in the topics.
 
-        if len(self.last_night_msg_ids) > 0:
-            logging.info(f"Deleted old night messages {self.last_night_msg_ids}")
-            await self.tg_client.DeleteMessages(chat_id, self.last_night_msg_ids)
-            self.last_night_msg_ids.clear()
-
-        is_begin_hour = Utils.CurrentHour() == BotConfig.NIGHT_BEGIN_HOUR
-        night_topic_ids = BotConfig.NIGHT_TOPIC_IDS
-        for topic_id in night_topic_ids:
-            if is_begin_hour:
-                logging.info(f"Notified begin of night mode in topic {topic_id}")
-                night_msg = BotMessages.NIGHT_BEGIN
-            else:
-                logging.info(f"Notified end of night mode in topic {topic_id}")
-                night_msg = BotMessages.NIGHT_END
+        Args:
+            transition_time: The transition date and time.
+        """
+        start_time = time.perf_counter()
+        self.__ScheduleNextTransition(transition_time)
+        await self.__Enforce(transition_time, close=False)
+        await asyncio.gather(
+            *[self.__NotifyTransition(policy, transition_time) for policy in self.policies.values()]
+        )
+        await self.__Enforce(transition_time, reopen=False)
+        BotMetrics.JOB_RUNS.Labels(VacationNightConst.TRANSITION_JOB_ID).Inc()
+        BotMetrics.JOB_DURATION.Labels(VacationNightConst.TRANSITION_JOB_ID).Observe(time.perf_counter() - start_time)
+
+    async def __Enforce(
+        self,
+        now: datetime,
+        removed_chat_ids: Optional[Set[int]] = None,
+        *,
+        close: bool = True,
+        reopen: bool = True
+    ) -> None:
+        """
+        Close or reopen the topics of all the chats according to their mode at the specified time (not in test mode).
+
+        Args:
+            now: The date and time.
+            removed_chat_ids: Chats that are not managed anymore, whose topics are reopened.
+            close: True to close topics or restrict chats, if needed.
+            reopen: True to reopen topics or unrestrict chats, if needed.
+        """
+        if self.bot_type.IsTest():
+            return
+
+        if removed_chat_ids:
+            await self.enforcer.Release(removed_chat_ids)
+        for policy in self.policies.values():
+            policy.Refresh(now)
+        await asyncio.gather(
+            *[self.enforcer.Enforce(policy, close=close, reopen=reopen) for policy in self.policies.values()]
+        )
+
+    async def __NotifyTransition(
+        self,
+        policy: NightVacationPolicy,
+        transition_time: datetime
+    ) -> None:
+        """
+        Send the notifications of a chat if it has a transition at the specified time.
+
+        Args:
+            policy: The policy of the chat.
+            transition_time: The transition date and time.
+        """
+        topic_ids = policy.NightBoundaryTopicIds(transition_time)
+        if len(topic_ids) > 0:
+            await self.__NotifyNight(policy, transition_time, topic_ids)
+        if policy.IsVacationBoundary(transition_time):
+            await self.__NotifyVacation(policy, transition_time)
+
+    async def __NotifyNight(
+        self,
+        policy: NightVacationPolicy,
+        now: datetime,
+        topic_ids: Optional[FrozenSet[int]] = None
+    ) -> None:
+        """
+        Send night mode notifications to topics.
+        The begin notification is sent to the topics where it's night at the specified time, the end one to the others.
 
-            sent_msgs = await self.tg_client.SendMessage(
+        Args:
+            policy: The policy of the chat to send notifications to.
+            now: The date and time.
+            topic_ids: The topics to notify (if None, all the night topics).
+        """
+        policy.Refresh(now)
+
+        chat_id = policy.chat_id
+        topic_ids = policy.night_topic_ids if topic_ids is None else topic_ids
+        night_topic_ids = policy.NightTopicIds(now)
+        last_msg_ids = self.last_night_msg_ids.setdefault(chat_id, {})
+        for notified_topic_ids, night_msg in (
+            (topic_ids & night_topic_ids, BotMessages.NIGHT_BEGIN),
+            (topic_ids - night_topic_ids, BotMessages.NIGHT_END),
+        ):
+            if len(notified_topic_ids) == 0:
+                continue
+            logging.info(
+                "Notifying %s of night mode in chat %d, topics %s",
+                "begin" if night_msg == BotMessages.NIGHT_BEGIN else "end", chat_id, sorted(notified_topic_ids)
+            )
+            sent_msg_ids = await self.__Notify(
                 chat_id,
-                topic_id,
+                [msg_id for topic_id in notified_topic_ids for msg_id in last_msg_ids.pop(topic_id, [])],
+                notified_topic_ids,
                 night_msg
             )
-            self.last_night_msg_ids.extend([msg.id for msg in sent_msgs])
-        return True
+            last_msg_ids.update(sent_msg_ids)
+        self.state_store.SetMessageIds(NotificationTypes.NIGHT, chat_id, last_msg_ids)
 
     async def __NotifyVacation(
         self,
-        chat_id: int,
+        policy: NightVacationPolicy,
+        now: datetime,
         force: bool = False
     ) -> bool:
         """
         Send vacation mode notifications to configured topics.
 
         Args:
-            chat_id: The chat ID to send notifications to.
+            policy: The policy of the chat to send notifications to.
+            now: The date and time.
             force: Force notification regardless of vacation day.
 
         Returns:
             True if notification was sent, False otherwise.
         """
-        if len(self.last_vacation_msg_ids) > 0:
-            logging.info(f"Deleted old vacation messages {self.last_vacation_msg_ids}")
-            await self.tg_client.DeleteMessages(chat_id, self.last_vacation_msg_ids)
-            self.last_vacation_msg_ids.clear()
+        chat_id = policy.chat_id
+        last_msg_ids = self.last_vacation_msg_ids.get(chat_id, [])
 
-        if not force and not self.__IsVacationDay():
+        policy.Refresh(now)
+        if not force and not policy.IsVacationDate(now):
+            if len(last_msg_ids) > 0:
+                await self.__DeleteNotifications(chat_id, last_msg_ids)
+                self.last_vacation_msg_ids[chat_id] = []
+                self.state_store.SetMessageIds(NotificationTypes.VACATION, chat_id, {})
             return False
 
-        vacation_topic_ids = BotConfig.VACATION_TOPIC_IDS
-        for topic_id in vacation_topic_ids:
-            logging.info(f"Notified vacation mode in topic {topic_id}")
-            sent_msgs = await self.tg_client.SendMessage(
-                chat_id,
-                topic_id if topic_id > 0 else None,
-                BotMessages.VACATION_DAY
-            )
-            self.last_vacation_msg_ids.extend([msg.id for msg in sent_msgs])
+        logging.info("Notifying vacation mode in chat %d, topics %s", chat_id, sorted(policy.vacation_topic_ids))
+        sent_msg_ids = await self.__Notify(
+            chat_id,
+            last_msg_ids,
+            policy.vacation_topic_ids,
+            BotMessages.VACATION_DAY
+        )
+        self.last_vacation_msg_ids[chat_id] = [msg_id for topic_msg_ids in sent_msg_ids.values() for msg_id in topic_msg_ids]
+        self.state_store.SetMessageIds(NotificationTypes.VACATION, chat_id, sent_msg_ids)
         return True
+
+    async def __Notify(
+        self,
+        chat_id: int,
+        old_msg_ids: List[int],
+        topic_ids: FrozenSet[int],
+        message_text: str
+    ) -> Dict[int, List[int]]:
+        """
+        Delete the old notification messages and send the new one to the topics, concurrently.
+
+        Args:
+            chat_id: The chat ID.
+            old_msg_ids: IDs of the old notification messages.
+            topic_ids: The topic IDs to send the notification to.
+            message_text: The notification text.
+
+        Returns:
+            Message IDs of the sent notifications for each topic ID.
+        """
+        start_time = time.monotonic()
+        semaphore = asyncio.Semaphore(VacationNightConst.NOTIFY_MAX_CONCURRENCY)
+        sorted_topic_ids = sorted(topic_ids)
+
+        delete_task = asyncio.ensure_future(self.__DeleteNotifications(chat_id, old_msg_ids))
+        results = await asyncio.gather(
+            *[
+                self.__NotifyTopic(chat_id, topic_id, message_text, semaphore)
+                for topic_id in sorted_topic_ids
+            ],
+            return_exceptions=True
+        )
+        await delete_task
+
+        sent_msg_ids: Dict[int, List[int]] = {}
+        for topic_id, result in zip(sorted_topic_ids, results):
+            if isinstance(result, BaseException):
+                logging.error("Unable to notify topic %d (chat ID: %d): %s", topic_id, chat_id, result)
+            else:
+                sent_msg_ids[topic_id] = result
+        logging.info(
+            "Notified %d/%d topic(s) in chat %d in %.3fs",
+            len(sent_msg_ids), len(sorted_topic_ids), chat_id, time.monotonic() - start_time
+        )
+        return sent_msg_ids
+
+    async def __NotifyTopic(
+        self,
+        chat_id: int,
+        topic_id: int,
+        message_text: str,
+        semaphore: asyncio.Semaphore
+    ) -> List[int]:
+        """
+        Send a notification to a topic, respecting the concurrency limit (rate limits are applied by the client).
+
+        Args:
+            chat_id: The chat ID.
+            topic_id: The topic ID.
+            message_text: The notification text.
+            semaphore: Semaphore limiting the concurrent notifications.
+
+        Returns:
+            List of sent message IDs.
+        """
+        async with semaphore:
+            sent_msgs = await self.tg_client.SendMessage(chat_id, topic_id, message_text)
+        return [msg.id for msg in sent_msgs]
+
+    async def __DeleteNotifications(
+        self,
+        chat_id: int,
+        msg_ids: List[int]
+    ) -> None:
+        """
+        Delete old notification messages (they are queued for deletion in case of flood waits).
+
+        Args:
+            chat_id: The chat ID.
+            msg_ids: The message IDs.
+        """
+        if len(msg_ids) > 0:
+            logging.info("Deleted old notification messages %s", msg_ids)
+            try:
+                await self.tg_client.DeleteMessages(chat_id, msg_ids)
+            except FloodWait:
+                for msg_id in msg_ids:
+                    self.deletion_queue.Add(chat_id, msg_id)
@@ -0,0 +1,171 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timezone
+from typing import List, Tuple
+
+from telegram_night_vacation_bot.bot_config import BotConfig
+from telegram_night_vacation_bot.clock import VirtualClock
+from telegram_night_vacation_bot.ics_calendar import IcsCalendar
+from telegram_night_vacation_bot.night_vacation_policy import NightVacationPolicy
+from telegram_night_vacation_bot.vacation_calendar import VacationIcsRule
+
+
+def ics_content(
+    *events: str
+) -> str:
+    """Get the content of an iCalendar file with the specified events (as lines of properties)."""
+    return "".join(
+        ["BEGIN:VCALENDAR\r\nVERSION:2.0\r\n"]
+        + [f"BEGIN:VEVENT\r\n{event}\r\nEND:VEVENT\r\n" for event in events]
+        + ["END:VCALENDAR\r\n"]
+    )
+
+
+def days(
+    events: List[Tuple[int, int]]
+) -> List[date]:
+    """Get the days of the events, as dates."""
+    return [date.fromordinal(ordinal) for begin, end in events for ordinal in range(begin, end)]
+
+
+class IcsCalendarTests(unittest.TestCase):
+    """Tests for the expansion of iCalendar files."""
+
+    def setUp(self) -> None:
+        """Set up the directory of the calendar files, disabling the cache of the expanded years."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "test.ics")
+        self.cache_dir = BotConfig.ICS_CACHE_DIR
+        BotConfig.ICS_CACHE_DIR = None  # type: ignore[assignment]
+
+    def tearDown(self) -> None:
+        """Remove the directory of the calendar files and restore the cache."""
+        BotConfig.ICS_CACHE_DIR = self.cache_dir
+        self.tmp_dir.cleanup()
+
+    def __Write(
+        self,
+        *events: str
+    ) -> None:
+        """Write the calendar file with the specified events."""
+        with open(self.file_name, "w", encoding="utf-8", newline="") as fout:
+            fout.write(ics_content(*events))
+
+    def __Open(
+        self,
+        *events: str
+    ) -> IcsCalendar:
+        """Write the calendar file with the specified events and open it."""
+        self.__Write(*events)
+        return IcsCalendar.Open(self.file_name, None)
+
+    def test_count(self) -> None:
+        """Test a recurrence limited by COUNT."""
+        ics_calendar = self.__Open("DTSTART;VALUE=DATE:20260105\r\nRRULE:FREQ=WEEKLY;COUNT=3")
+
+        self.assertEqual(days(ics_calendar.Events(2026)), [date(2026, 1, 5), date(2026, 1, 12), date(2026, 1, 19)])
+
+    def test_count_across_years(self) -> None:
+        """Test that COUNT includes the occurrences of the previous years."""
+        ics_calendar = self.__Open("DTSTART;VALUE=DATE:20251225\r\nRRULE:FREQ=YEARLY;COUNT=2")
+
+        self.assertEqual(days(ics_calendar.Events(2025)), [date(2025, 12, 25)])
+        self.assertEqual(days(ics_calendar.Events(2026)), [date(2026, 12, 25)])
+        self.assertEqual(days(ics_calendar.Events(2027)), [])
+
+    def test_count_begin_not_generated_by_rule(self) -> None:
+        """Test that the event begin is counted as the first occurrence, even if not generated by the rule."""
+        # 2026-01-04 is a Sunday
+        ics_calendar = self.__Open("DTSTART;VALUE=DATE:20260104\r\nRRULE:FREQ=WEEKLY;BYDAY=MO;COUNT=3")
+
+        self.assertEqual(days(ics_calendar.Events(2026)), [date(2026, 1, 4), date(2026, 1, 5), date(2026, 1, 12)])
+
+    def test_until(self) -> None:
+        """Test a recurrence limited by UNTIL (included), as date and as date-time."""
+        ics_calendar = self.__Open(
+            "DTSTART;VALUE=DATE:20260101\r\nRRULE:FREQ=DAILY;UNTIL=20260103",
+            "DTSTART:20260301T090000Z\r\nRRULE:FREQ=MONTHLY;UNTIL=20260501T090000Z",
+        )
+
+        self.assertEqual(
+            days(ics_calendar.Events(2026)),
+            [date(2026, 1, 1), date(2026, 1, 2), date(2026, 1, 3), date(2026, 3, 1), date(2026, 4, 1),
+             date(2026, 5, 1)]
+        )
+
+    def test_exdate(self) -> None:
+        """Test that EXDATE removes occurrences, which are still counted by COUNT."""
+        ics_calendar = self.__Open(
+            "DTSTART;VALUE=DATE:20260105\r\nRRULE:FREQ=WEEKLY;COUNT=4\r\nEXDATE;VALUE=DATE:20260112,20260126"
+        )
+
+        self.assertEqual(days(ics_calendar.Events(2026)), [date(2026, 1, 5), date(2026, 1, 19)])
+
+    def test_multi_day_events(self) -> None:
+        """Test recurring events lasting more days, also across the year end."""
+        ics_calendar = self.__Open(
+            "DTSTART;VALUE=DATE:20251231\r\nDTEND;VALUE=DATE:20260102\r\nRRULE:FREQ=YEARLY;UNTIL=20261231"
+        )
+
+        self.assertEqual(days(ics_calendar.Events(2026)), [date(2025, 12, 31), date(2026, 1, 1), date(2026, 12, 31),
+                                                           date(2027, 1, 1)])
+
+    def test_last_opened_calendar(self) -> None:
+        """Test that only the last opened calendar of a file is kept, and it's reused while the file doesn't change."""
+        old_calendar = self.__Open("DTSTART;VALUE=DATE:20260101")
+        self.assertIs(IcsCalendar.Open(self.file_name, None), old_calendar)
+
+        new_calendar = self.__Open("DTSTART;VALUE=DATE:20260102")
+        # Relative and absolute paths of the same file share the calendar
+        same_calendar = IcsCalendar.Open(os.path.relpath(self.file_name), None)
+
+        self.assertIsNot(new_calendar, old_calendar)
+        self.assertIs(same_calendar, new_calendar)
+        self.assertEqual(days(new_calendar.Events(2026)), [date(2026, 1, 2)])
+        self.assertEqual(
+            [ics_calendar for ics_calendar in IcsCalendar.calendars.values() if ics_calendar.file_name == self.file_name],
+            [new_calendar]
+        )
+
+    def test_rule_expanded_years(self) -> None:
+        """Test that a rule expands the current and next year only if the current day is known."""
+        self.__Write("DTSTART;VALUE=DATE:20260101\r\nRRULE:FREQ=YEARLY")
+
+        self.assertEqual(set(VacationIcsRule(self.file_name, False).ics_calendar.years), set())
+        self.assertEqual(set(VacationIcsRule(self.file_name, False, date(2026, 6, 1)).ics_calendar.years), {2026, 2027})
+
+    def test_policy_expanded_years(self) -> None:
+        """Test that the policy expands the years of the current day in the chat time zone."""
+        self.__Write("DTSTART;VALUE=DATE:20260101\r\nRRULE:FREQ=YEARLY")
+        # Still 2026 in UTC, already 2027 in Tokyo
+        clock = VirtualClock(datetime(2026, 12, 31, 20, tzinfo=timezone.utc))
+        policy = NightVacationPolicy(
+            -1000000000000, {"TIMEZONE": "Asia/Tokyo", "VACATION_RULES": [{"ics": self.file_name}]}, clock
+        )
+
+        rule = policy.vacation_calendar.rules[0]
+        assert isinstance(rule, VacationIcsRule)
+        # Other years can be expanded on request (e.g. to build the timeline around the current time)
+        self.assertLessEqual({2027, 2028}, set(rule.ics_calendar.years))
@@ -0,0 +1,60 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import unittest
+
+from telegram_night_vacation_bot.lru_cache import LruCache
+
+
+class LruCacheTests(unittest.TestCase):
+    """Tests for the LRU cache."""
+
+    def test_get_set(self) -> None:
+        """Test that stored values are hits and missing keys are misses."""
+        cache: LruCache[int, str] = LruCache("test", 2)
+        cache.Set(1, "a")
+
+        self.assertEqual(cache.Get(1), "a")
+        self.assertIsNone(cache.Get(2))
+        self.assertEqual(cache.hits_num, 1)
+        self.assertEqual(cache.misses_num, 1)
+
+    def test_none_value(self) -> None:
+        """Test that a stored None value is a hit."""
+        cache: LruCache[int, None] = LruCache("test", 2)
+        cache.Set(1, None)
+
+        self.assertIsNone(cache.Get(1))
+        self.assertEqual(cache.hits_num, 1)
+        self.assertEqual(cache.misses_num, 0)
+
+    def test_eviction(self) -> None:
+        """Test that the least recently used entry is evicted."""
+        cache: LruCache[int, str] = LruCache("test", 2)
+        cache.Set(1, "a")
+        cache.Set(2, "b")
+        cache.Get(1)
+        cache.Set(3, "c")
+
+        self.assertEqual(cache.Get(1), "a")
+        self.assertIsNone(cache.Get(2))
+        self.assertEqual(cache.Get(3), "c")
+        self.assertEqual(cache.Size(), 2)
@@ -0,0 +1,182 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import random
+import unittest
+from typing import List, Optional, Tuple
+
+from telegram_night_vacation_bot.message_splitter import MessageSplitter, MessageSplitterConst
+
+
+# Seed of the random texts, fixed so that failures can be reproduced
+TEST_SEED = 0
+TEST_TEXTS_NUM = 500
+
+
+def open_markers(
+    text: str,
+    end: int
+) -> List[str]:
+    """Get the markers of the entities open at the specified index, sorted by opening position."""
+    markers: List[str] = []
+    idx = 0
+    while idx < end:
+        marker = text[idx:idx + 2]
+        if marker in MessageSplitterConst.ENTITY_MARKERS and idx + 2 <= end:
+            if marker in markers:
+                markers.remove(marker)
+            else:
+                markers.append(marker)
+            idx += 2
+        else:
+            idx += 1
+    return markers
+
+
+def next_states(
+    text: str,
+    part: str,
+    pos: int,
+    carried: List[str]
+) -> List[Tuple[int, List[str], List[int]]]:
+    """
+    Match a part with the text at the specified position, removing the markers added to close and reopen entities.
+
+    Returns:
+        The possible positions of the next part, with the markers carried to it and the indexes of the text
+        characters not included in the part.
+    """
+    prefix = "".join(carried)
+    if not part.startswith(prefix):
+        return []
+
+    states: List[Tuple[int, List[str], List[int]]] = []
+    body = part[len(prefix):]
+    for suffix_len in range(0, min(len(body), 4) + 1, 2):
+        content = body[:len(body) - suffix_len]
+        if not text.startswith(content, pos):
+            continue
+        end = pos + len(content)
+        if suffix_len == 0:
+            # Split at the end of the window, or at a separator that is not included in the parts
+            states.append((end, [], []))
+            if end < len(text):
+                states.append((end + 1, [], [end]))
+        else:
+            markers = open_markers(text, end)
+            if body[len(content):] == "".join(reversed(markers)):
+                states.append((end, markers, []))
+    return states
+
+
+def rejoin(
+    text: str,
+    parts: List[str],
+    part_idx: int = 0,
+    pos: int = 0,
+    carried: Optional[List[str]] = None
+) -> Optional[List[int]]:
+    """
+    Match the parts with the text.
+
+    Returns:
+        The indexes of the text characters not included in the parts, None if the parts don't match the text.
+    """
+    if part_idx == len(parts):
+        return [] if pos == len(text) else None
+    for next_pos, next_carried, skipped_idx in next_states(text, parts[part_idx], pos, carried or []):
+        result = rejoin(text, parts, part_idx + 1, next_pos, next_carried)
+        if result is not None:
+            return skipped_idx + result
+    return None
+
+
+class MessageSplitterTests(unittest.TestCase):
+    """Tests for the message splitter."""
+
+    def setUp(self) -> None:
+        """Set up the random generator."""
+        self.rnd = random.Random(TEST_SEED)
+
+    def __RandomWord(self) -> str:
+        """Get a random word, sometimes longer than a part."""
+        word_len = self.rnd.randint(50, 300) if self.rnd.random() < 0.05 else self.rnd.randint(1, 12)
+        return "".join(self.rnd.choice("abcdefghij") for _ in range(word_len))
+
+    def __RandomText(self) -> str:
+        """Get a random text with words, separators and (possibly nested and long) entities."""
+        tokens: List[str] = []
+        markers: List[str] = []
+        for _ in range(self.rnd.randint(0, 200)):
+            choice = self.rnd.random()
+            if choice < 0.05 and len(markers) < 2:
+                marker = self.rnd.choice([m for m in MessageSplitterConst.ENTITY_MARKERS if m not in markers])
+                markers.append(marker)
+                tokens.append(marker)
+            elif choice < 0.1 and len(markers) > 0 and tokens[-1] not in MessageSplitterConst.ENTITY_MARKERS:
+                tokens.append(markers.pop())
+            else:
+                tokens.append(self.__RandomWord())
+            tokens.append(self.rnd.choice(MessageSplitterConst.SEPARATORS))
+        if len(markers) > 0:
+            tokens.append(self.__RandomWord())
+        tokens.extend(reversed(markers))
+        return "".join(tokens)
+
+    def __RandomCases(self) -> List[Tuple[str, int]]:
+        """Get random texts with a random maximum length."""
+        return [(self.__RandomText(), self.rnd.randint(20, 400)) for _ in range(TEST_TEXTS_NUM)]
+
+    def test_short_text(self) -> None:
+        """Test that texts not exceeding the maximum length are not split."""
+        self.assertEqual(list(MessageSplitter.Split("", 10)), [])
+        self.assertEqual(list(MessageSplitter.Split("**hello**", 10)), ["**hello**"])
+
+    def test_max_len(self) -> None:
+        """Test that no part exceeds the maximum length."""
+        for text, max_len in self.__RandomCases():
+            for part in MessageSplitter.Split(text, max_len):
+                self.assertLessEqual(len(part), max_len)
+
+    def test_no_separators(self) -> None:
+        """Test that a text without separators and entities is split without dropping characters."""
+        for _ in range(TEST_TEXTS_NUM):
+            text = "".join(self.rnd.choice("abcdefghij") for _ in range(self.rnd.randint(0, 2000)))
+            self.assertEqual("".join(MessageSplitter.Split(text, self.rnd.randint(1, 400))), text)
+
+    def test_rejoin(self) -> None:
+        """Test that the parts give back the text and only separators at the split points are dropped."""
+        for text, max_len in self.__RandomCases():
+            parts = list(MessageSplitter.Split(text, max_len))
+
+            skipped_idx = rejoin(text, parts)
+            self.assertIsNotNone(skipped_idx, f"Parts don't match the text (max_len: {max_len})")
+            assert skipped_idx is not None
+            self.assertLessEqual(len(skipped_idx), max(len(parts) - 1, 0))
+            for idx in skipped_idx:
+                self.assertIn(text[idx], MessageSplitterConst.SEPARATORS)
+
+    def test_balanced_markers(self) -> None:
+        """Test that entities are closed in each part."""
+        for text, max_len in self.__RandomCases():
+            for part in MessageSplitter.Split(text, max_len):
+                for marker in MessageSplitterConst.ENTITY_MARKERS:
+                    self.assertEqual(part.count(marker) % 2, 0, f"Unbalanced {marker} in part: {part!r}")
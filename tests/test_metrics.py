@@ -0,0 +1,51 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import unittest
+
+from telegram_night_vacation_bot.metrics import Counter, Histogram
+
+
+class MetricsTests(unittest.TestCase):
+    """Tests for the rendering of metrics."""
+
+    def test_counter_labels(self) -> None:
+        """Test the rendering of counter labels."""
+        counter = Counter("test_total", "Test counter", ("kind",))
+        counter.Labels("a").Inc()
+
+        self.assertIn("test_total{kind=\"a\"} 1.0", counter.Render())
+
+    def test_label_values_escaped(self) -> None:
+        """Test that backslashes, double quotes and new lines in label values are escaped."""
+        counter = Counter("test_total", "Test counter", ("kind",))
+        counter.Labels("a\\b\"c\nd").Inc()
+
+        self.assertIn("test_total{kind=\"a\\\\b\\\"c\\nd\"} 1.0", counter.Render())
+
+    def test_histogram_label_values_escaped(self) -> None:
+        """Test that label values of histograms are escaped in all the samples."""
+        histogram = Histogram("test_seconds", "Test histogram", ("kind",), buckets=(1.0,))
+        histogram.Labels("\"a\"").Observe(0.5)
+
+        lines = histogram.Render()
+        self.assertIn("test_seconds_bucket{kind=\"\\\"a\\\"\",le=\"1.0\"} 1", lines)
+        self.assertIn("test_seconds_count{kind=\"\\\"a\\\"\"} 1", lines)
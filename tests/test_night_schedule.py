@@ -0,0 +1,58 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import unittest
+
+from telegram_night_vacation_bot.night_schedule import NightSchedule, NightScheduleConst
+
+
+class NightScheduleTests(unittest.TestCase):
+    """Tests for the compilation of night schedules."""
+
+    def test_from_hours(self) -> None:
+        """Test a window going across midnight every day."""
+        schedule = NightSchedule.FromHours(22 * 60, 8 * 60)
+
+        self.assertTrue(schedule.IsActive(22 * 60))
+        self.assertTrue(schedule.IsActive(NightScheduleConst.MINUTES_PER_WEEK - 1))
+        self.assertTrue(schedule.IsActive(8 * 60 - 1))
+        self.assertFalse(schedule.IsActive(8 * 60))
+        self.assertEqual(len(schedule.boundaries), 14)
+
+    def test_from_hours_same_begin_end(self) -> None:
+        """Test that a window ending at its begin means always night."""
+        schedule = NightSchedule.FromHours(22 * 60, 22 * 60)
+
+        self.assertTrue(all(schedule.IsActive(minute) for minute in range(NightScheduleConst.MINUTES_PER_WEEK)))
+        self.assertEqual(schedule.boundaries, [])
+        self.assertIsNone(NightSchedule.NextBoundary(schedule.boundaries, 0))
+
+    def test_window_same_begin_end(self) -> None:
+        """Test that a window ending at its begin lasts a full day on its week days."""
+        schedule = NightSchedule.FromWindows([{"begin": "12:00", "end": "12:00", "week_days": [6]}])
+
+        sunday_noon = 6 * NightScheduleConst.MINUTES_PER_DAY + 12 * 60
+        self.assertFalse(schedule.IsActive(sunday_noon - 1))
+        self.assertTrue(schedule.IsActive(sunday_noon))
+        # Monday at 11:59 of the next week
+        self.assertTrue(schedule.IsActive(12 * 60 - 1))
+        self.assertFalse(schedule.IsActive(12 * 60))
+        self.assertEqual(schedule.boundaries, [12 * 60, sunday_noon])
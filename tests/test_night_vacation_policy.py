@@ -0,0 +1,270 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import unittest
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from telegram_night_vacation_bot.clock import Clock, VirtualClock
+from telegram_night_vacation_bot.night_vacation_policy import NightVacationPolicy
+
+
+# Chat parameters: topic 1 is closed from 02:30 to 08:00, topic 2 from 22:00 to 02:30, no vacation days
+TEST_CHAT_ID = -1000000000000
+TEST_CHAT_PARAMS: Dict[str, Any] = {
+    "TIMEZONE": "Europe/Rome",
+    "NIGHT_BEGIN_HOUR": 2,
+    "NIGHT_BEGIN_MINUTE": 30,
+    "NIGHT_END_HOUR": 8,
+    "NIGHT_END_MINUTE": 0,
+    "VACATION_WEEK_DAYS": [],
+    "VACATION_DATES": {},
+    "VACATION_RULES": [],
+    "NIGHT_TOPIC_IDS": [1],
+    "TOPIC_NIGHT_WINDOWS": {2: [{"begin": "22:00", "end": "02:30"}]},
+    "VACATION_TOPIC_IDS": [1],
+    "ENFORCEMENT_MODE": "delete",
+    "EXCLUDED_USERS": [],
+}
+
+
+# Chat parameters with only the night hours and the time zone: topic 1 is closed from 02:30 to 08:00 and on Wednesdays
+TEST_TIMEZONE_CHAT_PARAMS: Dict[str, Any] = {
+    "TIMEZONE": "Europe/Rome",
+    "NIGHT_BEGIN_HOUR": 2,
+    "NIGHT_BEGIN_MINUTE": 30,
+    "NIGHT_END_HOUR": 8,
+    "NIGHT_END_MINUTE": 0,
+    "VACATION_WEEK_DAYS": [2],
+    "VACATION_DATES": {},
+    "NIGHT_TOPIC_IDS": [1],
+    "VACATION_TOPIC_IDS": [1],
+    "EXCLUDED_USERS": [],
+}
+
+
+def utc(
+    month: int,
+    day: int,
+    hour: int,
+    minute: int = 0,
+    second: int = 0
+) -> datetime:
+    """Get a UTC datetime in 2026."""
+    return datetime(2026, month, day, hour, minute, second, tzinfo=timezone.utc)
+
+
+class NightVacationPolicyTimeZoneTests(unittest.TestCase):
+    """Tests for the evaluation of night hours and vacation days in the chat time zone."""
+
+    def __Policy(
+        self,
+        time_zone: str = "Europe/Rome"
+    ) -> NightVacationPolicy:
+        """Build the policy with the specified time zone."""
+        return NightVacationPolicy(TEST_CHAT_ID, {**TEST_TIMEZONE_CHAT_PARAMS, "TIMEZONE": time_zone}, Clock())
+
+    def test_night_time(self) -> None:
+        """Test that night hours are evaluated in the chat time zone."""
+        policy = self.__Policy()
+        policy_new_york = self.__Policy("America/New_York")
+
+        # 02:30 CET is 01:30 UTC, 02:30 EST is 07:30 UTC
+        self.assertFalse(policy.IsNightTime(utc(1, 15, 1, 29)))
+        self.assertTrue(policy.IsNightTime(utc(1, 15, 1, 30)))
+        self.assertTrue(policy.IsNightTime(utc(1, 15, 6, 59)))
+        self.assertFalse(policy.IsNightTime(utc(1, 15, 7)))
+        self.assertFalse(policy_new_york.IsNightTime(utc(1, 15, 7, 29)))
+        self.assertTrue(policy_new_york.IsNightTime(utc(1, 15, 7, 30)))
+        # Summer time, 02:30 CEST is 00:30 UTC
+        self.assertTrue(policy.IsNightTime(utc(7, 15, 0, 30)))
+        self.assertFalse(policy.IsNightTime(utc(7, 15, 6)))
+
+    def test_vacation_date(self) -> None:
+        """Test that vacation days are evaluated in the chat time zone."""
+        policy = self.__Policy()
+
+        # 2026-01-13 is a Tuesday, 23:30 UTC is already Wednesday in Rome but not in New York
+        self.assertFalse(policy.IsVacationDate(utc(1, 13, 22, 59)))
+        self.assertTrue(policy.IsVacationDate(utc(1, 13, 23, 30)))
+        self.assertFalse(self.__Policy("America/New_York").IsVacationDate(utc(1, 13, 23, 30)))
+
+    def test_next_transition_dst(self) -> None:
+        """Test the night boundaries across the DST changes, in the skipped and in the repeated hour."""
+        policy = self.__Policy()
+
+        for now, transition in (
+            # 2026-03-29, 02:00 CET -> 03:00 CEST: 02:30 is skipped and the boundary is shifted by the gap
+            (utc(3, 28, 12), utc(3, 29, 1, 30)),
+            (utc(3, 29, 1, 30), utc(3, 29, 6)),
+            (utc(3, 29, 6), utc(3, 30, 0, 30)),
+            # 2026-10-25, 03:00 CEST -> 02:00 CET: 02:30 is repeated and the boundary only happens the first time
+            (utc(10, 24, 12), utc(10, 25, 0, 30)),
+            (utc(10, 25, 0, 30), utc(10, 25, 7)),
+            (utc(10, 25, 7), utc(10, 26, 1, 30)),
+        ):
+            next_transition = policy.NextTransition(now)
+            assert next_transition is not None
+            self.assertEqual(next_transition.timestamp(), transition.timestamp())
+
+
+class NightVacationPolicyDstTests(unittest.TestCase):
+    """Tests for the night/vacation policy across the DST changes of Europe/Rome."""
+
+    def setUp(self) -> None:
+        """Set up the clock."""
+        self.clock = VirtualClock(utc(3, 28, 12))
+
+    def __Policy(self) -> NightVacationPolicy:
+        """Build the policy for the current time of the clock."""
+        return NightVacationPolicy(TEST_CHAT_ID, TEST_CHAT_PARAMS, self.clock)
+
+    def __Transitions(
+        self,
+        policy: NightVacationPolicy,
+        now: datetime,
+        count: int
+    ) -> List[datetime]:
+        """Get the next transitions after the specified time."""
+        transitions: List[datetime] = []
+        for _ in range(count):
+            transition = policy.NextTransition(now)
+            assert transition is not None
+            transitions.append(transition)
+            now = transition
+        return transitions
+
+    # 2026-03-29, 02:00 CET -> 03:00 CEST: 02:30 is skipped and the boundary is shifted by the gap (i.e. 03:30 CEST)
+    def test_next_transition_skipped_hour(self) -> None:
+        """Test the transitions when a boundary falls in the skipped hour."""
+        policy = self.__Policy()
+
+        transitions = self.__Transitions(policy, utc(3, 28, 12), 5)
+
+        self.assertEqual(
+            [transition.timestamp() for transition in transitions],
+            [
+                utc(3, 28, 21).timestamp(),     # 22:00 CET
+                utc(3, 29, 1, 30).timestamp(),  # 02:30 CET, i.e. 03:30 CEST
+                utc(3, 29, 6).timestamp(),      # 08:00 CEST
+                utc(3, 29, 20).timestamp(),     # 22:00 CEST
+                utc(3, 30, 0, 30).timestamp(),  # 02:30 CEST
+            ]
+        )
+
+    def test_night_boundary_topics_skipped_hour(self) -> None:
+        """Test the topics notified when a boundary falls in the skipped hour."""
+        policy = self.__Policy()
+
+        # The transition job is scheduled with the transitions got from the policy
+        transitions = self.__Transitions(policy, utc(3, 29, 0), 2)
+
+        self.assertEqual(policy.NightBoundaryTopicIds(transitions[0]), {1, 2})
+        self.assertEqual(policy.NightBoundaryTopicIds(transitions[1]), {1})
+        self.assertEqual(policy.NightBoundaryTopicIds(utc(3, 29, 1)), frozenset())
+
+    def test_closed_topics_skipped_hour(self) -> None:
+        """Test the closed topics around a boundary in the skipped hour."""
+        policy = self.__Policy()
+
+        self.assertEqual(policy.ClosedTopicIds(utc(3, 28, 20, 59, 59)), frozenset())
+        self.assertEqual(policy.ClosedTopicIds(utc(3, 28, 21)), {2})
+        self.assertEqual(policy.ClosedTopicIds(utc(3, 29, 0, 59, 59)), {2})
+        self.assertEqual(policy.ClosedTopicIds(utc(3, 29, 1, 29, 59)), {2})
+        self.assertEqual(policy.ClosedTopicIds(utc(3, 29, 1, 30)), {1})
+        self.assertEqual(policy.ClosedTopicIds(utc(3, 29, 5, 59, 59)), {1})
+        self.assertEqual(policy.ClosedTopicIds(utc(3, 29, 6)), frozenset())
+
+    def test_current_mode_skipped_hour(self) -> None:
+        """Test the current mode while the clock moves across the skipped hour."""
+        policy = self.__Policy()
+
+        for now, is_night, closed_topic_ids in (
+            (utc(3, 28, 22), True, {2}),
+            (utc(3, 29, 1, 45), True, {1}),
+            (utc(3, 29, 5, 59), True, {1}),
+            (utc(3, 29, 6), False, set()),
+        ):
+            self.clock.SetNow(now)
+            self.assertEqual(policy.IsNight(), is_night)
+            for topic_id in (1, 2):
+                self.assertEqual(policy.ShallMessageBeDeleted(topic_id), topic_id in closed_topic_ids)
+
+    # 2026-10-25, 03:00 CEST -> 02:00 CET: 02:30 is repeated and the boundary only happens the first time
+    def test_next_transition_repeated_hour(self) -> None:
+        """Test the transitions when a boundary falls in the repeated hour."""
+        self.clock.SetNow(utc(10, 24, 12))
+        policy = self.__Policy()
+
+        transitions = self.__Transitions(policy, utc(10, 24, 12), 5)
+
+        self.assertEqual(
+            [transition.timestamp() for transition in transitions],
+            [
+                utc(10, 24, 20).timestamp(),     # 22:00 CEST
+                utc(10, 25, 0, 30).timestamp(),  # 02:30 CEST
+                utc(10, 25, 7).timestamp(),      # 08:00 CET
+                utc(10, 25, 21).timestamp(),     # 22:00 CET
+                utc(10, 26, 1, 30).timestamp(),  # 02:30 CET
+            ]
+        )
+
+    def test_night_boundary_topics_repeated_hour(self) -> None:
+        """Test the topics notified when a boundary falls in the repeated hour."""
+        self.clock.SetNow(utc(10, 24, 12))
+        policy = self.__Policy()
+
+        transitions = self.__Transitions(policy, utc(10, 25, 0), 2)
+
+        self.assertEqual(policy.NightBoundaryTopicIds(transitions[0]), {1, 2})
+        self.assertEqual(policy.NightBoundaryTopicIds(transitions[1]), {1})
+        self.assertEqual(policy.NightBoundaryTopicIds(utc(10, 25, 0, 30, 1)), frozenset())
+
+    def test_closed_topics_repeated_hour(self) -> None:
+        """Test the closed topics around a boundary in the repeated hour (topics are not reopened when repeated)."""
+        self.clock.SetNow(utc(10, 24, 12))
+        policy = self.__Policy()
+
+        self.assertEqual(policy.ClosedTopicIds(utc(10, 24, 19, 59, 59)), frozenset())
+        self.assertEqual(policy.ClosedTopicIds(utc(10, 24, 20)), {2})
+        self.assertEqual(policy.ClosedTopicIds(utc(10, 25, 0, 29, 59)), {2})
+        self.assertEqual(policy.ClosedTopicIds(utc(10, 25, 0, 30)), {1})
+        self.assertEqual(policy.ClosedTopicIds(utc(10, 25, 1, 15)), {1})
+        self.assertEqual(policy.ClosedTopicIds(utc(10, 25, 1, 30)), {1})
+        self.assertEqual(policy.ClosedTopicIds(utc(10, 25, 6, 59, 59)), {1})
+        self.assertEqual(policy.ClosedTopicIds(utc(10, 25, 7)), frozenset())
+
+    def test_current_mode_repeated_hour(self) -> None:
+        """Test the current mode while the clock moves across the repeated hour."""
+        self.clock.SetNow(utc(10, 24, 12))
+        policy = self.__Policy()
+
+        for now, is_night, closed_topic_ids in (
+            (utc(10, 24, 21), True, {2}),
+            (utc(10, 25, 0, 45), True, {1}),
+            (utc(10, 25, 1, 15), True, {1}),
+            (utc(10, 25, 6, 59), True, {1}),
+            (utc(10, 25, 7), False, set()),
+        ):
+            self.clock.SetNow(now)
+            self.assertEqual(policy.IsNight(), is_night)
+            for topic_id in (1, 2):
+                self.assertEqual(policy.ShallMessageBeDeleted(topic_id), topic_id in closed_topic_ids)
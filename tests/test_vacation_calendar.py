@@ -0,0 +1,154 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import unittest
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from telegram_night_vacation_bot.vacation_calendar import VacationCalendar, VacationRule
+
+
+# Day used to build the calendars
+TEST_TODAY = date(2026, 6, 1)
+
+
+def calendar(
+    rules: List[Dict[str, Any]],
+    week_days: Optional[List[int]] = None,
+    dates: Optional[Dict[int, List[int]]] = None
+) -> VacationCalendar:
+    """Build a vacation calendar."""
+    return VacationCalendar(week_days or [], dates or {}, rules, TEST_TODAY)
+
+
+def vacation_days(
+    vacation_calendar: VacationCalendar,
+    begin: date,
+    end: date
+) -> List[date]:
+    """Get the vacation days between two dates (both included)."""
+    return [
+        date.fromordinal(ordinal)
+        for ordinal in range(begin.toordinal(), end.toordinal() + 1)
+        if vacation_calendar.IsVacationDay(date.fromordinal(ordinal))
+    ]
+
+
+class VacationCalendarTests(unittest.TestCase):
+    """Tests for the vacation calendar and its rules."""
+
+    def test_range_across_year_end(self) -> None:
+        """Test a recurring range going across the year end."""
+        vacation_calendar = calendar([{"begin": "12-30", "end": "01-02"}])
+
+        self.assertEqual(
+            vacation_days(vacation_calendar, date(2025, 12, 1), date(2027, 1, 31)),
+            [date(2025, 12, 30), date(2025, 12, 31), date(2026, 1, 1), date(2026, 1, 2),
+             date(2026, 12, 30), date(2026, 12, 31), date(2027, 1, 1), date(2027, 1, 2)]
+        )
+
+    def test_one_off_range_across_year_end(self) -> None:
+        """Test a one-off range going across the year end."""
+        vacation_calendar = calendar([{"begin": "2026-12-31", "end": "2027-01-01"}])
+
+        self.assertEqual(
+            vacation_days(vacation_calendar, date(2025, 12, 1), date(2028, 1, 31)),
+            [date(2026, 12, 31), date(2027, 1, 1)]
+        )
+
+    def test_easter_rules(self) -> None:
+        """Test rules relative to Easter (April 5th in 2026, March 28th in 2027)."""
+        vacation_calendar = calendar([{"easter": -2, "days": 4}, {"easter": 49}])
+
+        self.assertEqual(
+            vacation_days(vacation_calendar, date(2026, 1, 1), date(2027, 12, 31)),
+            [date(2026, 4, 3), date(2026, 4, 4), date(2026, 4, 5), date(2026, 4, 6), date(2026, 5, 24),
+             date(2027, 3, 26), date(2027, 3, 27), date(2027, 3, 28), date(2027, 3, 29), date(2027, 5, 16)]
+        )
+
+    def test_easter_dates(self) -> None:
+        """Test the computation of the Easter date."""
+        for year, easter in ((2024, date(2024, 3, 31)), (2025, date(2025, 4, 20)), (2038, date(2038, 4, 25))):
+            vacation_calendar = calendar([{"easter": 0}])
+            self.assertEqual(vacation_days(vacation_calendar, date(year, 1, 1), date(year, 12, 31)), [easter])
+
+    def test_exclusions(self) -> None:
+        """Test that exclusion rules remove days generated by any rule, whatever their order."""
+        vacation_calendar = calendar(
+            [
+                {"begin": "2026-12-24", "exclude": True},
+                {"begin": "12-20", "end": "12-26"},
+                {"easter": 1, "exclude": True},
+            ],
+            week_days=[0],
+            dates={12: [24, 31]}
+        )
+
+        self.assertEqual(
+            vacation_days(vacation_calendar, date(2026, 12, 19), date(2027, 1, 1)),
+            [date(2026, 12, 20), date(2026, 12, 21), date(2026, 12, 22), date(2026, 12, 23), date(2026, 12, 25),
+             date(2026, 12, 26), date(2026, 12, 28), date(2026, 12, 31)]
+        )
+        # Easter Monday is excluded, even if it's a Monday
+        self.assertFalse(vacation_calendar.IsVacationDay(date(2026, 4, 6)))
+        self.assertTrue(vacation_calendar.IsVacationDay(date(2026, 4, 13)))
+        # The one-off exclusion only applies to its year
+        self.assertTrue(vacation_calendar.IsVacationDay(date(2027, 12, 24)))
+
+    def test_february_29(self) -> None:
+        """Test that February 29th is clamped to February 28th in non-leap years."""
+        vacation_calendar = calendar([{"begin": "02-29"}, {"begin": "02-20", "end": "02-29"}])
+
+        self.assertEqual(
+            vacation_days(vacation_calendar, date(2027, 2, 27), date(2027, 3, 1)),
+            [date(2027, 2, 27), date(2027, 2, 28)]
+        )
+        self.assertEqual(
+            vacation_days(vacation_calendar, date(2028, 2, 27), date(2028, 3, 1)),
+            [date(2028, 2, 27), date(2028, 2, 28), date(2028, 2, 29)]
+        )
+        self.assertEqual(VacationRule.Date(2027, 2, 29), date(2027, 2, 28))
+        self.assertEqual(VacationRule.Date(2028, 2, 29), date(2028, 2, 29))
+
+    def test_next_vacation_start_end(self) -> None:
+        """Test the start and end of the next vacation periods, also across the year end."""
+        vacation_calendar = calendar([{"begin": "12-24", "end": "01-06"}, {"begin": "2026-08-10", "end": "2026-08-14"}])
+
+        self.assertEqual(vacation_calendar.NextVacationStart(date(2026, 6, 1)), date(2026, 8, 10))
+        self.assertEqual(vacation_calendar.NextVacationEnd(date(2026, 6, 1)), date(2026, 8, 15))
+        self.assertEqual(vacation_calendar.NextVacationEnd(date(2026, 1, 3)), date(2026, 1, 7))
+        self.assertEqual(vacation_calendar.NextVacationEnd(date(2026, 8, 12)), date(2026, 8, 15))
+        # Inside a period, the next start is the one of the following period
+        self.assertEqual(vacation_calendar.NextVacationStart(date(2026, 8, 12)), date(2026, 12, 24))
+        self.assertEqual(vacation_calendar.NextVacationStart(date(2026, 12, 24)), date(2027, 12, 24))
+        self.assertEqual(vacation_calendar.NextVacationEnd(date(2026, 12, 24)), date(2027, 1, 7))
+
+    def test_next_vacation_none(self) -> None:
+        """Test the next vacation start and end without vacation days."""
+        vacation_calendar = calendar([{"begin": "2020-01-01"}])
+
+        self.assertIsNone(vacation_calendar.NextVacationStart(date(2026, 6, 1)))
+        self.assertIsNone(vacation_calendar.NextVacationEnd(date(2026, 6, 1)))
+
+    def test_abstract_rule(self) -> None:
+        """Test that the base rule cannot be instantiated."""
+        with self.assertRaises(TypeError):
+            VacationRule(False)  # type: ignore[abstract]